@@ -3,14 +3,41 @@
 Maps application names and window titles to Work_Categories using
 configurable regex-based rules. Rules are evaluated in order; the
 first matching rule wins. Returns "Other" when no rule matches.
+
+Patterns are compiled once when rules are assigned, so classification
+on the tracker hot path only runs ``Pattern.search`` calls.  Results are
+memoized per ``(app_name, window_title)`` until the rules change.
+
+App names that exactly equal a literal (metacharacter-free) app pattern
+are looked up in a dict, so only the rules before that one need their
+regexes evaluated.
 """
 
+import functools
 import json
+import logging
 import re
 from pathlib import Path
 
 from flowtrack.core.models import ClassificationRule
 
+logger = logging.getLogger(__name__)
+
+# Leading global inline flags such as "(?i)" — these must be rewritten as
+# scoped groups before a pattern can be embedded in an alternation.
+_LEADING_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+# Numbered/named backreferences change meaning once patterns are unioned.
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Any regex metacharacter; app patterns without one are plain literals.
+_REGEX_META_RE = re.compile(r"[.^$*+?{}\[\]|()\\]")
+
+# Maximum number of distinct (app_name, window_title) pairs memoized.
+_CLASSIFY_CACHE_SIZE = 2048
+
+_CompiledRule = tuple[tuple[re.Pattern[str], ...], tuple[re.Pattern[str], ...], str]
+
 
 class Classifier:
     """Classifies window activity into Work_Categories using regex rules."""
@@ -18,6 +45,37 @@ class Classifier:
     def __init__(self, rules: list[ClassificationRule]) -> None:
         self.rules = rules
 
+    @property
+    def rules(self) -> list[ClassificationRule]:
+        """The classification rules, in evaluation order."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: list[ClassificationRule]) -> None:
+        """Replace the rules and recompile their patterns."""
+        self._rules = rules
+        self._compiled: list[_CompiledRule] = [
+            (
+                _compile_patterns(rule.app_patterns),
+                _compile_patterns(rule.title_patterns),
+                rule.category,
+            )
+            for rule in rules
+        ]
+        # Exact app name -> index of the first rule listing it as a literal.
+        self._literal_app_index: dict[str, int] = {}
+        for index, rule in enumerate(rules):
+            for pattern in rule.app_patterns:
+                if not _REGEX_META_RE.search(pattern):
+                    self._literal_app_index.setdefault(pattern, index)
+        self._classify_cached = functools.lru_cache(maxsize=_CLASSIFY_CACHE_SIZE)(
+            self._classify_uncached
+        )
+
+    def cache_clear(self) -> None:
+        """Discard all memoized classification results."""
+        self._classify_cached.cache_clear()
+
     def classify(self, app_name: str, window_title: str) -> str:
         """Return the Work_Category for the given app and title.
 
@@ -25,11 +83,22 @@ class Classifier:
         app_patterns match the app_name OR ANY of its title_patterns
         match the window_title (using ``re.search``).
 
-        Returns ``"Other"`` if no rule matches.
+        Returns ``"Other"`` if no rule matches.  Results are memoized
+        until the rules are reassigned.
         """
-        for rule in self.rules:
-            if _rule_matches(rule, app_name, window_title):
-                return rule.category
+        return self._classify_cached(app_name, window_title)
+
+    def _classify_uncached(self, app_name: str, window_title: str) -> str:
+        """Evaluate the compiled rules without consulting the cache."""
+        # A rule with a literal app pattern equal to app_name is certain to
+        # match, so only the rules ahead of it can change the outcome.
+        hit = self._literal_app_index.get(app_name)
+        rules = self._compiled if hit is None else self._compiled[:hit]
+        for app_res, title_res, category in rules:
+            if _rule_matches(app_res, title_res, app_name, window_title):
+                return category
+        if hit is not None:
+            return self._compiled[hit][2]
         return "Other"
 
     @staticmethod
@@ -69,19 +138,52 @@ class Classifier:
 
 
 def _rule_matches(
-    rule: ClassificationRule, app_name: str, window_title: str
+    app_res: tuple[re.Pattern[str], ...],
+    title_res: tuple[re.Pattern[str], ...],
+    app_name: str,
+    window_title: str,
 ) -> bool:
-    """Return True if the rule matches the given app name or window title."""
-    for pattern in rule.app_patterns:
-        try:
-            if re.search(pattern, app_name):
-                return True
-        except re.error:
-            continue
-    for pattern in rule.title_patterns:
+    """Return True if any compiled pattern matches the app name or window title."""
+    for pattern in app_res:
+        if pattern.search(app_name):
+            return True
+    for pattern in title_res:
+        if pattern.search(window_title):
+            return True
+    return False
+
+
+def _compile_patterns(patterns: list[str]) -> tuple[re.Pattern[str], ...]:
+    """Compile *patterns* into as few ``re.Pattern`` objects as possible.
+
+    Invalid patterns are logged and skipped.  The remaining patterns are
+    joined into a single alternation so that a rule costs one ``search``
+    per field; if the union cannot be built (e.g. duplicate group names
+    or backreferences), the individually compiled patterns are returned.
+    """
+    valid: list[str] = []
+    compiled: list[re.Pattern[str]] = []
+    for pattern in patterns:
         try:
-            if re.search(pattern, window_title):
-                return True
-        except re.error:
+            compiled.append(re.compile(pattern))
+        except re.error as exc:
+            logger.warning("Skipping invalid classification pattern %r: %s", pattern, exc)
             continue
-    return False
+        valid.append(pattern)
+
+    if len(compiled) <= 1 or any(_BACKREF_RE.search(p) for p in valid):
+        return tuple(compiled)
+
+    try:
+        union = re.compile("|".join(f"(?:{_scope_flags(p)})" for p in valid))
+    except re.error:
+        return tuple(compiled)
+    return (union,)
+
+
+def _scope_flags(pattern: str) -> str:
+    """Rewrite a leading ``(?i)``-style flag group as a scoped ``(?i:...)``."""
+    m = _LEADING_FLAGS_RE.match(pattern)
+    if m is None:
+        return pattern
+    return f"(?{m.group(1)}:{pattern[m.end():]})"
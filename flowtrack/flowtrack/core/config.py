@@ -4,9 +4,12 @@ Handles loading, saving, and default creation of config.json.
 Resolves platform-appropriate data directories:
   - macOS:   ~/Library/Application Support/CarrotSummary
   - Windows: %APPDATA%/CarrotSummary
-  - Other:   ~/.carrotsummary
+  - Other:   $XDG_DATA_HOME/CarrotSummary (default ~/.local/share), or
+             ~/.carrotsummary if that legacy directory already exists
 """
 
+import copy
+import functools
 import json
 import logging
 import os
@@ -14,19 +17,52 @@ import sys
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Parsed config files keyed by path, alongside the mtime they were read at.
+_CONFIG_CACHE: dict[Path, tuple[int, dict[str, Any]]] = {}
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Both parsers raise a ``ValueError`` subclass on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
 
+
+def _dumps(config: dict[str, Any]) -> bytes:
+    """Serialize *config* as indented UTF-8 JSON with a trailing newline."""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(config, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+@functools.lru_cache(maxsize=1)
 def get_data_directory() -> Path:
-    """Return the platform-appropriate data directory for CarrotSummary."""
+    """Return the platform-appropriate data directory for CarrotSummary.
+
+    The result depends only on the platform and environment, so it is
+    computed once per process.
+    """
     if sys.platform == "darwin":
         base = Path.home() / "Library" / "Application Support"
     elif sys.platform == "win32":
         appdata = os.environ.get("APPDATA")
         base = Path(appdata) if appdata else Path.home() / "AppData" / "Roaming"
     else:
-        base = Path.home()
-        return base / ".carrotsummary"
+        legacy = Path.home() / ".carrotsummary"
+        if legacy.is_dir():
+            return legacy
+        xdg_data = os.environ.get("XDG_DATA_HOME")
+        base = Path(xdg_data) if xdg_data else Path.home() / ".local" / "share"
     return base / "CarrotSummary"
 
 
@@ -132,6 +168,7 @@ def get_default_config() -> dict[str, Any]:
     }
 
 
+@functools.lru_cache(maxsize=1)
 def get_default_config_path() -> Path:
     """Return the default path for config.json."""
     return get_data_directory() / "config.json"
@@ -144,35 +181,63 @@ def load_config(path: str | Path | None = None) -> dict[str, Any]:
     When the file does not exist, a default configuration is created,
     written to disk, and returned.  If the file exists but is invalid
     JSON, the error is logged and defaults are returned.
+
+    Parsed files are cached for the life of the process and re-read only
+    when their modification time changes or :func:`save_config` writes
+    them, so repeated calls from different subsystems skip the parse.
+    Each call returns its own deep copy, so in-place edits that are never
+    saved do not leak into later loads.
     """
     config_path = Path(path) if path is not None else get_default_config_path()
 
-    if not config_path.exists():
+    try:
+        mtime = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
         logger.info("Config file not found at %s — creating defaults.", config_path)
         defaults = get_default_config()
         save_config(defaults, config_path)
         return defaults
+    except OSError as exc:
+        logger.error("Failed to load config from %s: %s — using defaults.", config_path, exc)
+        return get_default_config()
+
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached is not None and cached[0] == mtime:
+        return copy.deepcopy(cached[1])
 
     try:
-        with open(config_path, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        with open(config_path, "rb") as fh:
+            data = _loads(fh.read())
         if not isinstance(data, dict):
             raise ValueError("Top-level JSON value must be an object")
-        return data
-    except (json.JSONDecodeError, ValueError, OSError) as exc:
+    except (ValueError, OSError) as exc:
         logger.error("Failed to load config from %s: %s — using defaults.", config_path, exc)
         return get_default_config()
 
+    _CONFIG_CACHE[config_path] = (mtime, data)
+    return copy.deepcopy(data)
+
 
 def save_config(config: dict[str, Any], path: str | Path | None = None) -> None:
     """Write *config* to a JSON file.
 
     If *path* is ``None``, the platform default location is used.
-    Parent directories are created automatically.
+    Parent directories are created automatically.  The file is replaced
+    atomically via a temporary sibling, and left untouched when its
+    contents would not change.
     """
     config_path = Path(path) if path is not None else get_default_config_path()
     config_path.parent.mkdir(parents=True, exist_ok=True)
+    _CONFIG_CACHE.pop(config_path, None)
 
-    with open(config_path, "w", encoding="utf-8") as fh:
-        json.dump(config, fh, indent=2, ensure_ascii=False)
-        fh.write("\n")
+    payload = _dumps(config)
+    try:
+        if config_path.read_bytes() == payload:
+            return
+    except OSError:
+        pass
+
+    tmp_path = config_path.with_name(config_path.name + ".tmp")
+    with open(tmp_path, "wb") as fh:
+        fh.write(payload)
+    os.replace(tmp_path, config_path)
@@ -6,37 +6,56 @@ Refines a Work_Category into a specific sub-category by:
    project names, etc. from common window title patterns
 
 Falls back to the Work_Category as the sub_category when nothing matches.
+Results are memoized per ``(app_name, window_title, category)`` until the
+rules change, since the active window rarely changes between polls.
+Rule patterns are compiled when the rules are assigned and the built-in
+patterns at import time.
 """
 
+import functools
+import logging
 import re
+from dataclasses import replace
 from typing import Optional
 
 from flowtrack.core.models import ContextResult, ContextRule
 
-
-# Common suffixes/noise to strip from window titles
-_STRIP_SUFFIXES = [
-    r"\s*[-–—]\s*(Google Chrome|Firefox|Safari|Microsoft Edge|Brave|Arc|Opera)$",
-    r"\s*[-–—]\s*(Microsoft Word|Microsoft Excel|Microsoft PowerPoint)$",
-    r"\s*[-–—]\s*(Google Docs|Google Sheets|Google Slides)$",
-    r"\s*[-–—]\s*(Pages|Numbers|Keynote)$",
-    r"\s*[-–—]\s*(Visual Studio Code|VS Code|Code)$",
-    r"\s*[-–—]\s*(Sublime Text|Atom|Vim|Neovim|Emacs)$",
-    r"\s*[-–—]\s*(Slack|Discord|Microsoft Teams)$",
-    r"\s*[-–—]\s*(Outlook|Mail|Thunderbird)$",
-    r"\s*[-–—]\s*(Figma|Sketch|Adobe \w+)$",
-    r"\s*[-–—]\s*(Notion|Obsidian|Bear|Evernote)$",
-    r"\s*[-–—]\s*(Terminal|iTerm2?|Warp|Alacritty|Hyper)$",
-    r"\s*[-–—]\s*(Quip|Confluence|Coda)$",
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of distinct (app_name, window_title, category) results memoized.
+_ANALYZE_CACHE_SIZE = 1024
+
+# Common app-name suffixes/noise to strip from window titles, grouped by kind
+_STRIP_SUFFIX_APPS = [
+    r"Google Chrome|Firefox|Safari|Microsoft Edge|Brave|Arc|Opera",
+    r"Microsoft Word|Microsoft Excel|Microsoft PowerPoint",
+    r"Google Docs|Google Sheets|Google Slides",
+    r"Pages|Numbers|Keynote",
+    r"Visual Studio Code|VS Code|Code",
+    r"Sublime Text|Atom|Vim|Neovim|Emacs",
+    r"Slack|Discord|Microsoft Teams",
+    r"Outlook|Mail|Thunderbird",
+    r"Figma|Sketch|Adobe \w+",
+    r"Notion|Obsidian|Bear|Evernote",
+    r"Terminal|iTerm2?|Warp|Alacritty|Hyper",
+    r"Quip|Confluence|Coda",
 ]
+# One anchored alternation, so stripping a suffix is a single regex pass.
+_STRIP_SUFFIXES_RE = re.compile(
+    r"\s*[-–—]\s*(?:" + "|".join(_STRIP_SUFFIX_APPS) + r")$", re.IGNORECASE
+)
+
+# Separator characters trimmed from the ends of titles and extracted values
+_STRIP_CHARS = " -–—"
 
-# Labels that are too generic to be useful as task names
-_GENERIC_LABELS = {
+# Labels that are too generic to be useful as task names (lowercase)
+_GENERIC_LABELS = frozenset({
     "new tab", "untitled", "google", "search", "home", "about:blank",
     "loading", "gmail", "inbox", "mail", "outlook", "calendar",
     "google chrome", "firefox", "safari", "edge", "brave", "arc",
     "electron", "code", "terminal", "finder", "desktop",
-}
+})
 
 # Patterns for extracting granular context from window titles
 _SMART_PATTERNS: list[tuple[str, str, list[str]]] = [
@@ -97,12 +116,101 @@ _SMART_PATTERNS: list[tuple[str, str, list[str]]] = [
 ]
 
 
+def _group_smart_patterns(
+    entries: list[tuple[str, str, list[str]]],
+) -> dict[str, list[tuple[str, list[re.Pattern[str]]]]]:
+    """Compile smart patterns and group them by category, keeping their order."""
+    grouped: dict[str, list[tuple[str, list[re.Pattern[str]]]]] = {}
+    for pat_category, label_template, patterns in entries:
+        grouped.setdefault(pat_category, []).append(
+            (label_template, [re.compile(p) for p in patterns])
+        )
+    return grouped
+
+
+_SMART_BY_CATEGORY = _group_smart_patterns(_SMART_PATTERNS)
+
+_NAMED_GROUP_RE = re.compile(r"\(\?P<\w+>")
+
+
+def _fuse_patterns(patterns: list[str]) -> re.Pattern[str]:
+    """Combine *patterns* into one regex that matches wherever any of them does.
+
+    Named groups become plain groups (names repeat across patterns) and a
+    leading ``(?i)`` becomes a scoped ``(?i:...)`` flag group.
+    """
+    alternatives = []
+    for pattern in patterns:
+        body = _NAMED_GROUP_RE.sub("(?:", pattern)
+        if body.startswith("(?i)"):
+            alternatives.append(f"(?i:{body[4:]})")
+        else:
+            alternatives.append(f"(?:{body})")
+    return re.compile("|".join(alternatives))
+
+
+def _fuse_by_category(
+    entries: list[tuple[str, str, list[str]]],
+) -> dict[str, re.Pattern[str]]:
+    """Fuse every smart pattern of each category into a single regex."""
+    by_category: dict[str, list[str]] = {}
+    for pat_category, _label_template, patterns in entries:
+        by_category.setdefault(pat_category, []).extend(patterns)
+    return {cat: _fuse_patterns(patterns) for cat, patterns in by_category.items()}
+
+
+# A single scan with the fused regex rules out every smart pattern of the
+# category for titles that match none of them, which is the common case.
+_SMART_ANY_BY_CATEGORY = _fuse_by_category(_SMART_PATTERNS)
+
+
+class _SafeDict(dict):
+    """Mapping for ``str.format_map`` that renders missing keys as ""."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def _fill_template(template: str, match: "re.Match[str]") -> str:
+    """Fill *template*'s ``{group}`` placeholders from *match* in one pass.
+
+    Groups that did not participate in the match render as empty strings.
+    """
+    return template.format_map(_SafeDict(
+        (key, val.strip().rstrip(_STRIP_CHARS))
+        for key, val in match.groupdict().items() if val
+    ))
+
+
 class ContextAnalyzer:
     """Analyzes window titles to infer specific work context within a category."""
 
     def __init__(self, rules: list[ContextRule]) -> None:
         self.rules = rules
 
+    @property
+    def rules(self) -> list[ContextRule]:
+        """The user-configured context rules."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: list[ContextRule]) -> None:
+        """Replace the rules, recompile their patterns and discard memoized results."""
+        self._rules = rules
+        # Compiled rules grouped by category, keeping their relative order
+        self._rules_by_category: dict[str, list[tuple[list[re.Pattern[str]], str]]] = {}
+        for rule in rules:
+            self._rules_by_category.setdefault(rule.category, []).append(
+                (_compile_patterns(rule.title_patterns), rule.sub_category)
+            )
+        self._analyze_cached = functools.lru_cache(maxsize=_ANALYZE_CACHE_SIZE)(
+            self._analyze_uncached
+        )
+
+    def cache_clear(self) -> None:
+        """Discard all memoized analysis results."""
+        self._analyze_cached.cache_clear()
+
     def analyze(
         self, app_name: str, window_title: str, category: str
     ) -> ContextResult:
@@ -115,31 +223,42 @@ class ContextAnalyzer:
         4. Fall back to category name
 
         Also generates an activity_summary describing what the user is doing.
+
+        Results are memoized and shared between calls; ``ContextResult`` is
+        frozen, so derive modified copies with ``dataclasses.replace``.
         """
+        return self._analyze_cached(app_name, window_title, category)
+
+    def _analyze_uncached(
+        self, app_name: str, window_title: str, category: str
+    ) -> ContextResult:
+        """Run the full analysis without consulting the cache."""
         # 1. Try user-configured rules first
-        for rule in self.rules:
-            if rule.category != category:
-                continue
-            match = _match_title(rule.title_patterns, window_title)
+        for patterns, sub_category in self._rules_by_category.get(category, ()):
+            match = _match_title(patterns, window_title)
             if match is not None:
-                label = _build_label(rule.sub_category, match)
-                summary = _generate_activity_summary(app_name, window_title, category, rule.sub_category)
+                label = _build_label(sub_category, match)
+                summary = _generate_activity_summary(app_name, window_title, category, sub_category)
                 return ContextResult(
                     category=category,
-                    sub_category=rule.sub_category,
+                    sub_category=sub_category,
                     context_label=label,
                     activity_summary=summary,
                 )
 
+        # Blank titles (desktop, lock screen) have nothing left to parse
+        blank = not window_title.strip()
+
         # 2. Try smart title parsing
-        result = _smart_parse(window_title, category)
+        result = None if blank else _smart_parse(window_title, category)
         if result is not None:
-            result.activity_summary = _generate_activity_summary(app_name, window_title, category, result.sub_category)
-            return result
+            summary = _generate_activity_summary(app_name, window_title, category, result.sub_category)
+            return replace(result, activity_summary=summary)
 
         # 3. Try to extract a clean title by stripping app name
-        clean = _clean_title(window_title)
-        if clean and clean.lower() not in _GENERIC_LABELS and clean.lower() != category.lower() and len(clean) > 4:
+        clean = "" if blank else _clean_title(window_title)
+        clean_lower = clean.lower()
+        if clean and clean_lower not in _GENERIC_LABELS and clean_lower != category.lower() and len(clean) > 4:
             summary = _generate_activity_summary(app_name, window_title, category, clean)
             return ContextResult(
                 category=category,
@@ -158,24 +277,41 @@ class ContextAnalyzer:
         )
 
 
+def _compile_patterns(patterns: list[str]) -> list[re.Pattern[str]]:
+    """Compile *patterns*, skipping any that are not valid regexes."""
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern))
+        except re.error as exc:
+            logger.warning("Skipping invalid context pattern %r: %s", pattern, exc)
+    return compiled
+
+
 def _match_title(
-    patterns: list[str], window_title: str
+    patterns: list[re.Pattern[str]], window_title: str
 ) -> "re.Match[str] | None":
     """Return the first successful match against *window_title*, or None."""
     for pattern in patterns:
-        try:
-            m = re.search(pattern, window_title)
-            if m is not None:
-                return m
-        except re.error:
-            continue
+        m = pattern.search(window_title)
+        if m is not None:
+            return m
     return None
 
 
 def _build_label(sub_category: str, match: "re.Match[str]") -> str:
-    """Build a human-readable context label from the sub-category and match."""
-    named = match.groupdict()
-    parts = [v.strip() for v in named.values() if v and v.strip()]
+    """Build a human-readable context label from the sub-category and match.
+
+    Only named groups contribute; unnamed groups are ignored.
+    """
+    groupindex = match.re.groupindex
+    if not groupindex:
+        return sub_category
+    if len(groupindex) == 1:
+        value = match.group(next(iter(groupindex)))
+        value = value.strip() if value else ""
+        return f"{sub_category}: {value}" if value else sub_category
+    parts = [v.strip() for v in match.groupdict().values() if v and v.strip()]
     if parts:
         return f"{sub_category}: {' '.join(parts)}"
     return sub_category
@@ -183,54 +319,43 @@ def _build_label(sub_category: str, match: "re.Match[str]") -> str:
 
 def _smart_parse(window_title: str, category: str) -> Optional[ContextResult]:
     """Try built-in smart patterns to extract granular context."""
-    for pat_category, label_template, patterns in _SMART_PATTERNS:
-        if pat_category != category:
-            continue
+    fused = _SMART_ANY_BY_CATEGORY.get(category)
+    if fused is None or fused.search(window_title) is None:
+        return None
+    for label_template, patterns in _SMART_BY_CATEGORY[category]:
         for pattern in patterns:
-            try:
-                m = re.search(pattern, window_title)
-                if m is None:
-                    continue
-                groups = m.groupdict()
-                # Build the sub_category from the template
-                sub = label_template
-                for key, val in groups.items():
-                    if val:
-                        val = val.strip().rstrip(" -–—")
-                        sub = sub.replace(f"{{{key}}}", val)
-                # Remove unfilled placeholders
-                sub = re.sub(r"\{[^}]+\}", "", sub).strip(": ")
-                if not sub or len(sub) < 3:
-                    continue
-                # Skip generic/unhelpful labels
-                if sub.lower().strip() in _GENERIC_LABELS:
-                    continue
-                # Truncate very long labels
-                if len(sub) > 80:
-                    sub = sub[:77] + "..."
-                return ContextResult(
-                    category=category,
-                    sub_category=sub,
-                    context_label=sub,
-                )
-            except re.error:
+            m = pattern.search(window_title)
+            if m is None:
+                continue
+            sub = _fill_template(label_template, m).strip(": ")
+            if not sub or len(sub) < 3:
                 continue
+            # Skip generic/unhelpful labels
+            if sub.lower() in _GENERIC_LABELS:
+                continue
+            # Truncate very long labels
+            if len(sub) > 80:
+                sub = sub[:77] + "..."
+            return ContextResult(
+                category=category,
+                sub_category=sub,
+                context_label=sub,
+            )
     return None
 
 
 def _clean_title(window_title: str) -> str:
-    """Strip common app name suffixes from a window title."""
-    cleaned = window_title
-    for pattern in _STRIP_SUFFIXES:
-        try:
-            cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
-        except re.error:
-            continue
-    return cleaned.strip(" -–—")
+    """Strip common app name suffixes from a window title.
+
+    Two passes handle a nested suffix such as ``"Doc - Notion - Arc"``.
+    """
+    cleaned = _STRIP_SUFFIXES_RE.sub("", window_title, count=1)
+    cleaned = _STRIP_SUFFIXES_RE.sub("", cleaned, count=1)
+    return cleaned.strip(_STRIP_CHARS)
 
 # Smart summary patterns: (title_regex, summary_template)
 # Templates use {group_name} placeholders filled from regex named groups.
-_SUMMARY_PATTERNS: list[tuple[str, str]] = [
+_SUMMARY_PATTERN_SOURCES: list[tuple[str, str]] = [
     # Pull / merge request review
     (r"(?i)(?:pull request|merge request|PR)\s*#?(?P<num>\d+)", "reviewed pull request #{num}"),
     # Code review (CR-style, requires CR- prefix with digits)
@@ -283,6 +408,26 @@ _SUMMARY_PATTERNS: list[tuple[str, str]] = [
 ]
 
 
+# Compiled once at import so the per-poll summary loop never compiles.
+_SUMMARY_PATTERNS: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(pattern), template) for pattern, template in _SUMMARY_PATTERN_SOURCES
+]
+
+
+def _match_summary(window_title: str) -> Optional[str]:
+    """Return the first usable summary from ``_SUMMARY_PATTERNS``, or None."""
+    for pattern, template in _SUMMARY_PATTERNS:
+        m = pattern.search(window_title)
+        if m is None:
+            continue
+        summary = _fill_template(template, m).strip(", ")
+        if summary and len(summary) >= 3:
+            if len(summary) > 100:
+                summary = summary[:97] + "..."
+            return summary
+    return None
+
+
 def _generate_activity_summary(
     app_name: str, window_title: str, category: str, sub_category: str
 ) -> str:
@@ -298,34 +443,20 @@ def _generate_activity_summary(
     if not app_name and not window_title:
         return category
 
-    # Try smart patterns against the raw window title
-    for pattern, template in _SUMMARY_PATTERNS:
-        try:
-            m = re.search(pattern, window_title)
-            if m is None:
-                continue
-            groups = m.groupdict()
-            summary = template
-            for key, val in groups.items():
-                if val:
-                    val = val.strip().rstrip(" -–—")
-                    summary = summary.replace(f"{{{key}}}", val)
-            # Remove unfilled placeholders
-            summary = re.sub(r"\{[^}]+\}", "", summary).strip(", ")
-            if summary and len(summary) >= 3:
-                if len(summary) > 100:
-                    summary = summary[:97] + "..."
-                return summary
-        except re.error:
-            continue
+    # Try smart patterns against the raw window title; blank titles never match
+    if window_title.strip():
+        summary = _match_summary(window_title)
+        if summary is not None:
+            return summary
 
     # Fallback: "{app_name}: {cleaned_title}"
     clean = _clean_title(window_title)
     app_short = app_name.split(".")[0] if app_name else ""
 
-    if clean and clean.lower() not in _GENERIC_LABELS and app_short:
+    useful = bool(clean) and clean.lower() not in _GENERIC_LABELS
+    if useful and app_short:
         fallback = f"{app_short}: {clean}"
-    elif clean and clean.lower() not in _GENERIC_LABELS:
+    elif useful:
         fallback = clean
     elif app_short:
         fallback = app_short
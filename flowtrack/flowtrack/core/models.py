@@ -19,9 +19,9 @@ from typing import Optional
 # Window polling
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WindowInfo:
-    """Information about the currently active window."""
+    """Information about the currently active window (immutable, hashable)."""
     app_name: str
     window_title: str
 
@@ -30,7 +30,7 @@ class WindowInfo:
 # Classification
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ClassificationRule:
     """A rule that maps application/title patterns to a Work_Category."""
     app_patterns: list[str]    # regex patterns for app name
@@ -38,7 +38,7 @@ class ClassificationRule:
     category: str              # target Work_Category
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextRule:
     """A rule that refines a Work_Category into a Sub_Category."""
     category: str              # applies to this Work_Category
@@ -46,9 +46,9 @@ class ContextRule:
     sub_category: str          # resulting sub-category
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ContextResult:
-    """Result of context analysis for a window observation."""
+    """Result of context analysis for a window observation (immutable, hashable)."""
     category: str        # Work_Category from Classifier
     sub_category: str    # refined sub-category (e.g., "Contract Draft")
     context_label: str   # human-readable label (e.g., "Contract Draft: Smith v. Jones")
@@ -67,7 +67,7 @@ class SessionStatus(Enum):
     BREAK = "break"
 
 
-@dataclass
+@dataclass(slots=True)
 class PomodoroSession:
     """A Pomodoro work/break session tied to a Work_Category."""
     id: str
@@ -84,7 +84,7 @@ class PomodoroSession:
 # Persistence
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ActivityRecord:
     """A single activity observation persisted to the database."""
     id: int
@@ -96,13 +96,14 @@ class ActivityRecord:
     session_id: Optional[str]
     active_task_id: Optional[int] = None  # FK to focus_tasks Low_Level_Task
     activity_summary: str = ""  # human-readable summary from Context_Analyzer
+    duration_seconds: Optional[float] = None  # tracked time; None = one poll interval
 
 
 # ---------------------------------------------------------------------------
 # Reporting
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class CategorySummary:
     """Aggregated time and session data for a single Work_Category."""
     category: str
@@ -111,7 +112,7 @@ class CategorySummary:
     completed_sessions: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class DailySummary:
     """Summary of activities for a single day."""
     date: date
@@ -120,7 +121,7 @@ class DailySummary:
     total_sessions: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class WeeklySummary:
     """Summary of activities for a 7-day period."""
     start_date: date
@@ -135,7 +136,7 @@ class WeeklySummary:
 # Email
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class SmtpConfig:
     """SMTP configuration for email delivery."""
     server: str
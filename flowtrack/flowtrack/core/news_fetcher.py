@@ -1,9 +1,11 @@
 """AI news fetcher using web search and RSS feeds.
 
-Fetches top AI news from reliable sources, caches results for 1 hour.
+Fetches top AI news from reliable sources and caches results for an
+adaptive TTL (1 hour to start, longer while feeds are quiet).
 Two modes: business-focused (non-technical) and technical (open source, new tech).
 """
 
+import heapq
 import json
 import logging
 import re
@@ -11,15 +13,118 @@ import time
 import urllib.request
 import urllib.error
 import urllib.parse
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Optional
-from xml.etree import ElementTree
+
+try:
+    from lxml import etree as ElementTree
+    _HAVE_LXML = True
+except ImportError:  # optional accelerator; the stdlib API is compatible
+    from xml.etree import ElementTree
+    _HAVE_LXML = False
 
 logger = logging.getLogger(__name__)
 
-# Cache: {news_type: (timestamp, items)}
-_cache: dict[str, tuple[float, list[dict]]] = {}
-_CACHE_TTL = 3600  # 1 hour
+# Cache: {news_type: (timestamp, items, ttl)}
+_cache: dict[str, tuple[float, list[dict], float]] = {}
+_CACHE_TTL = 3600  # 1 hour, starting TTL for each news type
+_CACHE_TTL_MIN = 600  # 10 minutes
+_CACHE_TTL_MAX = 6 * 3600  # 6 hours
+_FETCH_WORKERS = 8  # concurrent feed downloads per refresh
+_TS_MIN = float("-inf")  # sort sentinel for undated items
+_RECENT_WINDOW_S = 7 * 86400  # only keep news from the last 7 days
+
+# Conditional-GET state per feed URL: (etag, last_modified, parsed items)
+_feed_meta: dict[str, tuple[Optional[str], Optional[str], list[dict]]] = {}
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS_ITEM = "item"
+_ATOM_ENTRY = _ATOM + "entry"
+_ATOM_TITLE = _ATOM + "title"
+_ATOM_LINK = _ATOM + "link"
+_ATOM_SUMMARY = _ATOM + "summary"
+_ATOM_CONTENT = _ATOM + "content"
+_ATOM_UPDATED = _ATOM + "updated"
+_ATOM_PUBLISHED = _ATOM + "published"
+
+# Text-cleanup patterns, compiled once at import
+_RE_WS = re.compile(r'\s+')
+_RE_MULTI_SPACE = re.compile(r'\s{2,}')
+_RE_HTML = re.compile(r'<[^>]+>')
+_RE_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+# Source attribution suffix ("Title - TechCrunch") or leading "AI:" label,
+# both removed from every headline in a single pass
+_RE_HEADLINE_AFFIXES = re.compile(
+    r'\s*[-–—|]\s*(?:TechCrunch|The Verge|Reuters|WSJ|Ars Technica|'
+    r'VentureBeat|MIT Technology Review|Wired|CNBC|Bloomberg|'
+    r'The New York Times|BBC|CNN|Google News|Hacker News|'
+    r'The Guardian|Forbes|Business Insider|ZDNet|Engadget|'
+    r'The Information|Axios|Protocol|Semafor|Rest of World)\s*$'
+    r'|^\s*(?:AI|Artificial Intelligence)\s*[:–—]\s*',
+    re.IGNORECASE,
+)
+_AFFIX_CHARS = "-–—|:"  # every headline affix contains one of these
+# Filler phrases removed when compressing long headlines
+_RE_FILLERS = re.compile(
+    r'\baccording to\b.*?(?=,|$)|\breport says\b|\breports say\b'
+    r'|\bin a move that\b|\bin what could be\b|\bit was announced that\b'
+    r'|\bthe company (?:said|announced)\b',
+    re.IGNORECASE,
+)
+
+
+def _keywords(*words: str) -> re.Pattern:
+    """Compile a case-insensitive substring match for any of *words*."""
+    return re.compile("|".join(re.escape(w) for w in words), re.IGNORECASE)
+
+
+# Feed date parsing: regex fast paths, then strptime for anything else
+_RE_ISO_DATE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(?:Z|[+-]\d{2}:?\d{2})?)?$'
+)
+_RE_RFC822_DATE = re.compile(
+    r'(?:[A-Z][a-z]{2}, )?(\d{1,2}) ([A-Z][a-z]{2}) (\d{4}) (\d{2}):(\d{2}):(\d{2})'
+    r' (?:[+-]\d{4}|[A-Z]{1,5})$'
+)
+_MONTHS = {
+    name: number for number, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+         "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)
+}
+_DATE_FORMATS = (
+    "%a, %d %b %Y %H:%M:%S %z",      # RFC 822
+    "%a, %d %b %Y %H:%M:%S %Z",
+    "%Y-%m-%dT%H:%M:%S%z",            # ISO 8601
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+)
+
+# Relevance notes keyed by keyword bucket, checked in order
+_BUSINESS_BUCKETS = (
+    (_keywords("enterprise", "business", "company", "revenue", "market"),
+     "Directly impacts enterprise AI adoption and business strategy."),
+    (_keywords("regulation", "policy", "government", "law"),
+     "May affect AI governance and compliance requirements at work."),
+    (_keywords("productivity", "automation", "workflow", "tool"),
+     "Could change how teams work and automate daily tasks."),
+    (_keywords("launch", "release", "announce", "new"),
+     "New capability that could be relevant to your team's projects."),
+)
+
+_TECHNICAL_BUCKETS = (
+    (_keywords("open source", "github", "repository", "library"),
+     "Open source project worth evaluating for your tech stack."),
+    (_keywords("benchmark", "performance", "faster", "efficient"),
+     "Performance improvement that could benefit your infrastructure."),
+    (_keywords("model", "llm", "transformer", "training"),
+     "Advances in model architecture relevant to ML engineering."),
+    (_keywords("api", "sdk", "framework", "tool"),
+     "New developer tooling that could accelerate your workflow."),
+)
 
 # RSS feeds for AI news
 _BUSINESS_FEEDS = [
@@ -42,59 +147,104 @@ _TECHNICAL_FEEDS = [
 def fetch_ai_news(news_type: str = "business", max_items: int = 10) -> list[dict]:
     """Fetch AI news items. Returns cached results if available."""
     # Check cache
-    if news_type in _cache:
-        cached_time, cached_items = _cache[news_type]
-        if time.time() - cached_time < _CACHE_TTL:
+    cached = _cache.get(news_type)
+    if cached is not None:
+        cached_time, cached_items, ttl = cached
+        if time.time() - cached_time < ttl:
             return cached_items
 
-    all_items = []
-
-    # Primary: web search for recent AI news
-    search_items = _search_web_news(news_type)
-    all_items.extend(search_items)
-
-    # Secondary: RSS feeds
+    # Primary: web search for recent AI news; secondary: RSS feeds.
+    # Every source is an independent network round trip, so fetch them
+    # concurrently and keep the results in source order.
     feeds = _BUSINESS_FEEDS if news_type == "business" else _TECHNICAL_FEEDS
-    for source_name, feed_url in feeds:
-        try:
-            items = _parse_feed(feed_url, source_name)
-            all_items.extend(items)
-        except Exception:
-            logger.debug("Failed to fetch feed: %s", source_name, exc_info=True)
+    sources = [("Google News", url, True) for url in _search_urls(news_type)]
+    sources += [(source_name, feed_url, False) for source_name, feed_url in feeds]
+
+    all_items = []
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as pool:
+        futures = [pool.submit(_fetch_source, *source) for source in sources]
+        for future in futures:
+            all_items.extend(future.result())
 
     # Strictly filter to last 7 days only
-    cutoff = datetime.now() - timedelta(days=7)
-    recent = [i for i in all_items if i.get("published_dt") and i["published_dt"] > cutoff]
+    cutoff_ts = time.time() - _RECENT_WINDOW_S
+    recent = [i for i in all_items if i.get("published_ts") and i["published_ts"] > cutoff_ts]
 
     # For items without a parsed date, include them if they came from web search
     # (web search results are inherently recent)
     no_date = [i for i in all_items if not i.get("published_dt") and i.get("from_search")]
     recent.extend(no_date)
 
-    # Sort by date descending (undated items go to the end)
-    recent.sort(key=lambda x: x.get("published_dt") or datetime.min, reverse=True)
+    # Newest first (undated items go to the end). Only the newest few
+    # candidates can make the cut, so select them in O(N log K); fall back
+    # to the full ordering if deduplication discards too many of them.
+    candidates = heapq.nlargest(max_items * 4, recent, key=_published_key)
+    result = _top_unique(candidates, news_type, max_items)
+    if len(result) < max_items and len(candidates) < len(recent):
+        recent.sort(key=_published_key, reverse=True)
+        result = _top_unique(recent, news_type, max_items)
+
+    if not result:
+        # Nothing fetched (offline, every source failing): keep serving the
+        # previous items and retry soon rather than caching the empty list
+        # and backing off as if the feeds were quiet
+        stale = cached[1] if cached is not None else []
+        _cache[news_type] = (time.time(), stale, _CACHE_TTL_MIN)
+        return stale
+
+    # Cache results
+    if cached is not None:
+        ttl = _next_ttl(ttl, cached_items, result)
+    else:
+        ttl = _CACHE_TTL
+    _cache[news_type] = (time.time(), result, ttl)
+    return result
+
 
-    # Take top N and format, deduplicating
+def _published_key(item: dict) -> float:
+    """Sort key: publication POSIX time, with undated items oldest."""
+    return item.get("published_ts") or _TS_MIN
+
+
+def _top_unique(items: list[dict], news_type: str, max_items: int) -> list[dict]:
+    """Format the first *max_items* items, skipping near-duplicate titles."""
     result = []
-    seen_titles = set()
-    for item in recent:
-        norm = re.sub(r'\s+', ' ', item.get("title", "").lower().strip())
-        if norm in seen_titles or len(norm) < 10:
+    seen_titles: set[int] = set()
+    for item in items:
+        norm = item.get("title_norm")
+        if norm is None:
+            norm = _normalize_title(item.get("title", ""))
+        if len(norm) < 10:
             continue
-        seen_titles.add(norm)
+        key = hash(norm)
+        if key in seen_titles:
+            continue
+        seen_titles.add(key)
 
-        formatted = _format_item(item, news_type)
-        result.append(formatted)
+        result.append(_format_item(item, news_type))
         if len(result) >= max_items:
             break
-
-    # Cache results
-    _cache[news_type] = (time.time(), result)
     return result
 
 
-def _search_web_news(news_type: str) -> list[dict]:
-    """Use web search to find recent AI news."""
+def _next_ttl(ttl: float, previous: list[dict], current: list[dict]) -> float:
+    """Adapt the cache TTL to how much a refresh actually changed.
+
+    A refresh with no new headlines doubles the TTL; one where more than
+    30% of the headlines are new halves it, within the min/max bounds.
+    """
+    seen = {item["headline"] for item in previous}
+    new = sum(1 for item in current if item["headline"] not in seen)
+    novelty = new / max(1, len(current))
+    if novelty == 0:
+        return min(ttl * 2, _CACHE_TTL_MAX)
+    if novelty > 0.3:
+        return max(ttl / 2, _CACHE_TTL_MIN)
+    return ttl
+
+
+def _search_urls(news_type: str) -> list[str]:
+    """Return Google News search feed URLs for recent AI news."""
     if news_type == "business":
         queries = [
             "top AI news this week 2026",
@@ -105,63 +255,132 @@ def _search_web_news(news_type: str) -> list[dict]:
             "new AI open source projects this week 2026",
             "latest AI ML technical news last 7 days",
         ]
+    return [
+        f"https://news.google.com/rss/search?q={urllib.parse.quote(query)}&hl=en-US&gl=US&ceid=US:en"
+        for query in queries
+    ]
 
-    items = []
-    for query in queries:
-        try:
-            url = f"https://news.google.com/rss/search?q={urllib.parse.quote(query)}&hl=en-US&gl=US&ceid=US:en"
-            parsed = _parse_feed(url, "Google News")
-            for item in parsed:
-                item["from_search"] = True
-            items.extend(parsed)
-        except Exception:
-            logger.debug("Web search failed for: %s", query, exc_info=True)
 
+def _fetch_source(source_name: str, url: str, from_search: bool) -> list[dict]:
+    """Fetch one feed; failures are logged and yield no items."""
+    try:
+        items = _parse_feed(url, source_name)
+    except Exception:
+        if from_search:
+            logger.debug("Web search failed for: %s", url, exc_info=True)
+        else:
+            logger.debug("Failed to fetch feed: %s", source_name, exc_info=True)
+        return []
+    if from_search:
+        # Web search results are inherently recent
+        for item in items:
+            item["from_search"] = True
     return items
 
 
 def _parse_feed(url: str, source_name: str) -> list[dict]:
-    """Parse an RSS/Atom feed and return raw items."""
+    """Parse an RSS/Atom feed and return raw items.
+
+    Validators (``ETag``/``Last-Modified``) from the previous response are
+    sent back, and a ``304 Not Modified`` reuses the items parsed then.
+    The response is parsed incrementally: each ``<item>``/``<entry>`` is
+    converted as soon as it is complete and then discarded, so parsing
+    overlaps the download and memory stays flat regardless of feed size.
+    """
     req = urllib.request.Request(url, headers={"User-Agent": "CarrotSummary/2.0"})
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        data = resp.read()
+    meta = _feed_meta.get(url)
+    if meta is not None:
+        etag, last_modified, _items = meta
+        if etag:
+            req.add_header("If-None-Match", etag)
+        if last_modified:
+            req.add_header("If-Modified-Since", last_modified)
 
-    root = ElementTree.fromstring(data)
     items = []
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            for elem in _iter_feed_entries(resp):
+                if elem.tag == _RSS_ITEM:
+                    items.append(_rss_item(elem, source_name))
+                else:
+                    items.append(_atom_entry(elem, source_name))
+                _release(elem)
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304 and meta is not None:
+            # Unchanged since the last fetch: reuse the items parsed then
+            return [dict(item) for item in meta[2]]
+        raise
+
+    if etag or last_modified:
+        _feed_meta[url] = (etag, last_modified, [dict(item) for item in items])
+    return items
 
-    # Try RSS 2.0 format
-    for item in root.iter("item"):
-        title = _get_text(item, "title")
-        link = _get_text(item, "link")
-        desc = _get_text(item, "description")
-        pub_date = _get_text(item, "pubDate")
-        items.append({
-            "title": _clean_html(title or ""),
-            "link": link or "",
-            "description": _clean_html(desc or ""),
-            "published": pub_date or "",
-            "published_dt": _parse_date(pub_date),
-            "source": source_name,
-        })
-
-    # Try Atom format
-    ns = {"atom": "http://www.w3.org/2005/Atom"}
-    for entry in root.iter("{http://www.w3.org/2005/Atom}entry"):
-        title = _get_text(entry, "{http://www.w3.org/2005/Atom}title")
-        link_el = entry.find("{http://www.w3.org/2005/Atom}link")
-        link = link_el.get("href", "") if link_el is not None else ""
-        summary = _get_text(entry, "{http://www.w3.org/2005/Atom}summary") or _get_text(entry, "{http://www.w3.org/2005/Atom}content")
-        updated = _get_text(entry, "{http://www.w3.org/2005/Atom}updated") or _get_text(entry, "{http://www.w3.org/2005/Atom}published")
-        items.append({
-            "title": _clean_html(title or ""),
-            "link": link,
-            "description": _clean_html(summary or ""),
-            "published": updated or "",
-            "published_dt": _parse_date(updated),
-            "source": source_name,
-        })
 
-    return items
+def _iter_feed_entries(stream):
+    """Yield each completed RSS ``<item>`` or Atom ``<entry>`` in *stream*."""
+    if _HAVE_LXML:
+        # Feeds are untrusted: never expand entities or fetch external DTDs.
+        context = ElementTree.iterparse(
+            stream, events=("end",), tag=(_RSS_ITEM, _ATOM_ENTRY),
+            resolve_entities=False, no_network=True,
+        )
+        for _event, elem in context:
+            yield elem
+        return
+    for _event, elem in ElementTree.iterparse(stream, events=("end",)):
+        if elem.tag == _RSS_ITEM or elem.tag == _ATOM_ENTRY:
+            yield elem
+
+
+def _release(elem) -> None:
+    """Free a parsed entry (and, under lxml, its already-seen siblings)."""
+    elem.clear()
+    if _HAVE_LXML:
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def _rss_item(item, source_name: str) -> dict:
+    """Build a raw news item from an RSS 2.0 ``<item>``."""
+    title = _get_text(item, "title")
+    link = _get_text(item, "link")
+    desc = _get_text(item, "description")
+    pub_date = _get_text(item, "pubDate")
+    title = _clean_html(title or "")
+    published_dt = _parse_date(pub_date)
+    return {
+        "title": title,
+        "title_norm": _normalize_title(title),
+        "link": link or "",
+        "description": _clean_html(desc or ""),
+        "published": pub_date or "",
+        "published_dt": published_dt,
+        "published_ts": _timestamp(published_dt),
+        "source": source_name,
+    }
+
+
+def _atom_entry(entry, source_name: str) -> dict:
+    """Build a raw news item from an Atom ``<entry>``."""
+    title = _get_text(entry, _ATOM_TITLE)
+    link_el = entry.find(_ATOM_LINK)
+    link = link_el.get("href", "") if link_el is not None else ""
+    summary = _get_text(entry, _ATOM_SUMMARY) or _get_text(entry, _ATOM_CONTENT)
+    updated = _get_text(entry, _ATOM_UPDATED) or _get_text(entry, _ATOM_PUBLISHED)
+    title = _clean_html(title or "")
+    published_dt = _parse_date(updated)
+    return {
+        "title": title,
+        "title_norm": _normalize_title(title),
+        "link": link,
+        "description": _clean_html(summary or ""),
+        "published": updated or "",
+        "published_dt": published_dt,
+        "published_ts": _timestamp(published_dt),
+        "source": source_name,
+    }
 
 
 def _format_item(item: dict, news_type: str) -> dict:
@@ -211,31 +430,21 @@ def _make_headline(title: str, desc: str) -> str:
     if not title:
         return "AI News Update"
 
-    # Strip common source suffixes: "Title - Source Name"
-    cleaned = re.sub(r'\s*[-–—|]\s*(TechCrunch|The Verge|Reuters|WSJ|Ars Technica|'
-                     r'VentureBeat|MIT Technology Review|Wired|CNBC|Bloomberg|'
-                     r'The New York Times|BBC|CNN|Google News|Hacker News|'
-                     r'The Guardian|Forbes|Business Insider|ZDNet|Engadget|'
-                     r'The Information|Axios|Protocol|Semafor|Rest of World)\s*$',
-                     '', title, flags=re.IGNORECASE).strip()
+    # Short headlines without separators have nothing to strip or compress
+    if len(title) <= 80 and not any(ch in title for ch in _AFFIX_CHARS):
+        return title.strip()
 
-    # Strip leading "AI:" or "Artificial Intelligence:" prefixes
-    cleaned = re.sub(r'^(?:AI|Artificial Intelligence)\s*[:–—]\s*', '', cleaned, flags=re.IGNORECASE).strip()
+    # Strip source suffixes ("Title - Source Name") and leading
+    # "AI:" / "Artificial Intelligence:" labels
+    cleaned = _RE_HEADLINE_AFFIXES.sub('', title).strip()
 
     # If it's already short enough (under ~80 chars), use as-is
     if len(cleaned) <= 80:
         return cleaned
 
     # Compress: remove filler phrases
-    compressed = cleaned
-    fillers = [
-        r'\baccording to\b.*?(?=,|$)', r'\breport says\b', r'\breports say\b',
-        r'\bin a move that\b', r'\bin what could be\b', r'\bit was announced that\b',
-        r'\bthe company said\b', r'\bthe company announced\b',
-    ]
-    for filler in fillers:
-        compressed = re.sub(filler, '', compressed, flags=re.IGNORECASE).strip()
-    compressed = re.sub(r'\s{2,}', ' ', compressed).strip(' ,;:')
+    compressed = _RE_FILLERS.sub('', cleaned)
+    compressed = _RE_MULTI_SPACE.sub(' ', compressed).strip(' ,;:')
 
     # If still too long, take up to the first natural break (comma, colon, dash)
     if len(compressed) > 80:
@@ -258,38 +467,32 @@ def _extract_takeaway(desc: str, title: str = "") -> str:
         if title:
             return title
         return "Details available at the source link."
+    if len(desc) <= 20:  # no sentence can pass the length filter below
+        return desc
     # Split into sentences and take first 2-3
-    sentences = re.split(r'(?<=[.!?])\s+', desc.strip())
+    sentences = _RE_SENTENCE_SPLIT.split(desc.strip())
     sentences = [s for s in sentences if len(s) > 20]
     return " ".join(sentences[:3]) if sentences else desc[:300]
 
 
 def _business_relevance(title: str, desc: str) -> str:
     """Generate a business-relevance note."""
-    text = (title + " " + desc).lower()
-    if any(k in text for k in ("enterprise", "business", "company", "revenue", "market")):
-        return "Directly impacts enterprise AI adoption and business strategy."
-    if any(k in text for k in ("regulation", "policy", "government", "law")):
-        return "May affect AI governance and compliance requirements at work."
-    if any(k in text for k in ("productivity", "automation", "workflow", "tool")):
-        return "Could change how teams work and automate daily tasks."
-    if any(k in text for k in ("launch", "release", "announce", "new")):
-        return "New capability that could be relevant to your team's projects."
-    return "Relevant to staying informed about the evolving AI landscape."
+    return _first_bucket(_BUSINESS_BUCKETS, title + " " + desc,
+                         "Relevant to staying informed about the evolving AI landscape.")
 
 
 def _technical_relevance(title: str, desc: str) -> str:
     """Generate a technical-relevance note."""
-    text = (title + " " + desc).lower()
-    if any(k in text for k in ("open source", "github", "repository", "library")):
-        return "Open source project worth evaluating for your tech stack."
-    if any(k in text for k in ("benchmark", "performance", "faster", "efficient")):
-        return "Performance improvement that could benefit your infrastructure."
-    if any(k in text for k in ("model", "llm", "transformer", "training")):
-        return "Advances in model architecture relevant to ML engineering."
-    if any(k in text for k in ("api", "sdk", "framework", "tool")):
-        return "New developer tooling that could accelerate your workflow."
-    return "Technical development worth tracking for engineering decisions."
+    return _first_bucket(_TECHNICAL_BUCKETS, title + " " + desc,
+                         "Technical development worth tracking for engineering decisions.")
+
+
+def _first_bucket(buckets: tuple[tuple[re.Pattern, str], ...], text: str, default: str) -> str:
+    """Return the note of the first bucket whose keywords appear in *text*."""
+    for pattern, note in buckets:
+        if pattern.search(text):
+            return note
+    return default
 
 
 def _get_text(element, tag: str) -> Optional[str]:
@@ -300,29 +503,67 @@ def _get_text(element, tag: str) -> Optional[str]:
     return None
 
 
+def _normalize_title(title: str) -> str:
+    """Lowercase *title* and collapse whitespace, for duplicate detection."""
+    return _RE_WS.sub(' ', title.lower().strip())
+
+
 def _clean_html(text: str) -> str:
     """Strip HTML tags from text."""
-    return re.sub(r'<[^>]+>', '', text).strip()
+    if '<' not in text:  # most feed titles carry no markup
+        return text.strip()
+    return _RE_HTML.sub('', text).strip()
 
 
 def _parse_date(date_str: Optional[str]) -> Optional[datetime]:
-    """Try to parse various date formats from RSS feeds."""
+    """Try to parse various date formats from RSS feeds.
+
+    RFC 822 and ISO 8601 dates, which nearly every feed uses, are read
+    with a single regex match; other shapes fall back to ``strptime``.
+    Any UTC offset is dropped, not applied.
+    """
     if not date_str:
         return None
-    # Common RSS date formats
-    formats = [
-        "%a, %d %b %Y %H:%M:%S %z",      # RFC 822
-        "%a, %d %b %Y %H:%M:%S %Z",
-        "%Y-%m-%dT%H:%M:%S%z",            # ISO 8601
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-    ]
-    for fmt in formats:
+    date_str = date_str.strip()
+    dt = _fast_parse_date(date_str)
+    if dt is not None:
+        return dt
+    for fmt in _DATE_FORMATS:
         try:
-            dt = datetime.strptime(date_str.strip(), fmt)
+            dt = datetime.strptime(date_str, fmt)
             return dt.replace(tzinfo=None) if dt.tzinfo else dt
         except ValueError:
             continue
     return None
+
+
+def _timestamp(dt: Optional[datetime]) -> Optional[float]:
+    """Return *dt* (naive, local time) as POSIX seconds, or None."""
+    if dt is None:
+        return None
+    try:
+        return dt.timestamp()
+    except (OverflowError, OSError, ValueError):  # outside the platform's time_t range
+        return None
+
+
+def _fast_parse_date(date_str: str) -> Optional[datetime]:
+    """Parse the common RFC 822 / ISO 8601 shapes without ``strptime``."""
+    try:
+        m = _RE_ISO_DATE.match(date_str)
+        if m is not None:
+            year, month, day, hour, minute, second, fraction = m.groups()
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour or 0), int(minute or 0), int(second or 0),
+                int(fraction.ljust(6, "0")) if fraction else 0,
+            )
+        m = _RE_RFC822_DATE.match(date_str)
+        if m is not None:
+            day, month_name, year, hour, minute, second = m.groups()
+            month = _MONTHS.get(month_name)
+            if month is not None:
+                return datetime(int(year), month, int(day), int(hour), int(minute), int(second))
+    except ValueError:  # out-of-range field, e.g. month 13
+        return None
+    return None
@@ -11,6 +11,10 @@ from typing import Optional
 
 from flowtrack.core.models import PomodoroSession, SessionStatus
 
+# Tick constants, hoisted so the per-second tick allocates nothing extra
+_NO_TIME = timedelta(0)
+_TIMED_STATUSES = frozenset({SessionStatus.ACTIVE, SessionStatus.BREAK})
+
 
 class PomodoroManager:
     """Manages Pomodoro work/break sessions with debounce-based context switching."""
@@ -87,6 +91,23 @@ class PomodoroManager:
         events.append("context_switch_pending")
         return events
 
+    def observe(
+        self,
+        category: str,
+        sub_category: str,
+        now: datetime,
+        active_task_id: Optional[int] = None,
+    ) -> Optional[PomodoroSession]:
+        """Record an activity observation and advance the timer in one call.
+
+        Sets :attr:`active_task_id`, runs :meth:`on_activity` and then
+        :meth:`tick`, and returns the resulting active session (or ``None``).
+        """
+        self.active_task_id = active_task_id
+        self.on_activity(category, sub_category, now)
+        self.tick(now)
+        return self.active_session
+
     def tick(self, now: datetime) -> list[str]:
         """Advance timer state.  Should be called periodically.
 
@@ -97,40 +118,36 @@ class PomodoroManager:
         """
         events: list[str] = []
 
-        if self.active_session is None:
+        session = self.active_session
+        if session is None:
             self._last_tick = now
             return events
 
         # Accumulate elapsed time since last tick
-        if self._last_tick is not None and self.active_session.status in (
-            SessionStatus.ACTIVE,
-            SessionStatus.BREAK,
-        ):
+        if self._last_tick is not None and session.status in _TIMED_STATUSES:
             delta = now - self._last_tick
-            if delta > timedelta(0):
-                self.active_session.elapsed += delta
+            if delta > _NO_TIME:
+                session.elapsed += delta
 
         self._last_tick = now
 
         # --- ACTIVE session: check for work completion ---
-        if self.active_session.status == SessionStatus.ACTIVE:
-            if self.active_session.elapsed >= self.WORK_DURATION:
-                self.active_session.completed_count += 1
-                self.active_session.status = SessionStatus.BREAK
+        if session.status is SessionStatus.ACTIVE:
+            if session.elapsed >= self.WORK_DURATION:
+                session.completed_count += 1
+                session.status = SessionStatus.BREAK
                 # Reset elapsed for the break interval
-                overflow = self.active_session.elapsed - self.WORK_DURATION
-                self.active_session.elapsed = overflow
+                session.elapsed -= self.WORK_DURATION
                 events.append("work_completed")
                 events.append("break_started")
 
         # --- BREAK session: check for break completion ---
-        elif self.active_session.status == SessionStatus.BREAK:
-            break_dur = self.get_break_duration(self.active_session.completed_count)
-            if self.active_session.elapsed >= break_dur:
+        elif session.status is SessionStatus.BREAK:
+            break_dur = self.get_break_duration(session.completed_count)
+            if session.elapsed >= break_dur:
                 # Auto-restart: begin next work interval immediately
-                overflow = self.active_session.elapsed - break_dur
-                self.active_session.status = SessionStatus.ACTIVE
-                self.active_session.elapsed = overflow
+                session.status = SessionStatus.ACTIVE
+                session.elapsed -= break_dur
                 events.append("break_completed")
                 events.append("work_started")
 
@@ -154,8 +171,8 @@ class PomodoroManager:
         """Start a new session or resume a paused one for *category*."""
         events: list[str] = []
 
-        if category in self.paused_sessions:
-            session = self.paused_sessions.pop(category)
+        session = self.paused_sessions.pop(category, None)
+        if session is not None:
             session.status = SessionStatus.ACTIVE
             session.active_task_id = self.active_task_id
             self.active_session = session
@@ -10,10 +10,60 @@ This is a feature toggle — disabled by default. Enable via config:
 
 import logging
 import re
+import time
+from collections import OrderedDict
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Screenshots wider than this are downscaled before OCR; the summarizers
+# only need coarse keywords, and Vision's cost grows with pixel count.
+_OCR_MAX_WIDTH = 1600
+# Default seconds for which repeat analyses of the same window reuse the
+# previous result instead of capturing again.
+_ANALYSIS_TTL = 10.0
+# Most windows remembered by the analysis cache at once
+_ANALYSIS_CACHE_SIZE = 32
+
+# OCR heuristics, compiled once at import
+_RE_ERROR = re.compile(r'\berror\b', re.I)
+_RE_TEST = re.compile(r'\b(passed|failed|PASS|FAIL)\b')
+_RE_DIFF = re.compile(r'\b(diff|commit|staged|unstaged)\b', re.I)
+_RE_COMPOSE = re.compile(r'\b(compose|new message|reply|forward)\b', re.I)
+_RE_INBOX = re.compile(r'\b(inbox|all mail|sent)\b', re.I)
+_RE_PRESENT = re.compile(r'\b(screen share|sharing|present)\b', re.I)
+_RE_CHAT = re.compile(r'\b(chat|message|send)\b', re.I)
+
+
+def _keywords(*words: str) -> re.Pattern:
+    """Compile a case-insensitive substring match for any of *words*."""
+    return re.compile("|".join(re.escape(w) for w in words), re.I)
+
+
+# App-name buckets used to pick a summarizer
+_APP_IDE = _keywords("code", "intellij", "pycharm", "xcode", "vim", "neovim")
+_APP_BROWSER = _keywords("chrome", "firefox", "safari", "edge", "brave", "arc")
+_APP_EMAIL = _keywords("outlook", "mail", "gmail", "thunderbird")
+_APP_MEETING = _keywords("zoom", "teams", "meet", "webex")
+_APP_DOCUMENT = _keywords("word", "docs", "pages", "notion", "quip")
+
+# App bucket -> summarizer method name, checked in order
+_APP_DISPATCH = (
+    (_APP_IDE, "_summarize_ide"),
+    (_APP_BROWSER, "_summarize_browser"),
+    (_APP_EMAIL, "_summarize_email"),
+    (_APP_MEETING, "_summarize_meeting"),
+    (_APP_DOCUMENT, "_summarize_document"),
+)
+
+# Screen-text buckets for the browser and document summarizers
+_KW_DOCS = _keywords("api reference", "documentation", "docs.", "readme")
+_KW_FORUM = _keywords("stackoverflow", "stack overflow", "asked", "answered", "votes")
+_KW_CODE_REVIEW = _keywords("pull request", "merge request", "commits", "files changed")
+_KW_SEARCH = _keywords("search results", "google.com/search")
+_KW_OUTLINE = _keywords("table of contents", "heading", "chapter")
+_KW_COMMENTS = _keywords("comment", "suggestion", "resolve")
+
 
 class ScreenAnalyzer:
     """Captures and analyzes screen content for richer activity summaries.
@@ -22,11 +72,20 @@ class ScreenAnalyzer:
     and Apple Vision framework for on-device OCR. No data leaves the machine.
     """
 
-    def __init__(self, enabled: bool = False) -> None:
+    def __init__(
+        self,
+        enabled: bool = False,
+        ocr_max_width: int = _OCR_MAX_WIDTH,
+        analysis_ttl: float = _ANALYSIS_TTL,
+    ) -> None:
         self.enabled = enabled
+        self.ocr_max_width = ocr_max_width
+        self.analysis_ttl = analysis_ttl
         self._vision_available = False
         self._capture_available = False
         self.last_ocr_text = ""  # Raw OCR text for debug display
+        # (app_name, window_title) -> (monotonic time, summary), oldest first
+        self._analysis_cache: OrderedDict[tuple[str, str], tuple[float, Optional[str]]] = OrderedDict()
         if enabled:
             self._check_availability()
 
@@ -55,10 +114,33 @@ class ScreenAnalyzer:
 
         Returns None if disabled, unavailable, or analysis fails.
         The caller should fall back to regex-based summary generation.
+        Results are reused for ``analysis_ttl`` seconds per window.
         """
         if not self.enabled or not self._capture_available or not self._vision_available:
             return None
 
+        key = (app_name, window_title)
+        now = time.monotonic()
+        cache = self._analysis_cache
+        cached = cache.get(key)
+        if cached is not None:
+            if now - cached[0] < self.analysis_ttl:
+                return cached[1]
+            del cache[key]
+
+        summary = self._analyze(app_name, window_title)
+        cache[key] = (now, summary)
+        # Entries are stored in time order, so expired ones and any beyond
+        # the size cap are at the front
+        while cache:
+            oldest_time = next(iter(cache.values()))[0]
+            if len(cache) <= _ANALYSIS_CACHE_SIZE and now - oldest_time < self.analysis_ttl:
+                break
+            cache.popitem(last=False)
+        return summary
+
+    def _analyze(self, app_name: str, window_title: str) -> Optional[str]:
+        """Capture, OCR and summarize the screen without caching."""
         try:
             image = self._capture_screen()
             if image is None:
@@ -75,7 +157,7 @@ class ScreenAnalyzer:
             return None
 
     def _capture_screen(self):
-        """Capture the current screen as a CGImage."""
+        """Capture the current screen as a CGImage, at most ``ocr_max_width`` wide."""
         try:
             import Quartz
 
@@ -86,11 +168,37 @@ class ScreenAnalyzer:
                 Quartz.kCGNullWindowID,
                 Quartz.kCGWindowImageDefault,
             )
-            return image
+            if image is None:
+                return None
+            return self._downscale(image)
         except Exception:
             logger.debug("Screen capture failed", exc_info=True)
             return None
 
+    def _downscale(self, cg_image):
+        """Return *cg_image* resized to ``ocr_max_width``, keeping aspect ratio."""
+        import Quartz
+
+        width = Quartz.CGImageGetWidth(cg_image)
+        height = Quartz.CGImageGetHeight(cg_image)
+        if not self.ocr_max_width or width <= self.ocr_max_width:
+            return cg_image
+
+        new_width = self.ocr_max_width
+        new_height = max(1, round(height * new_width / width))
+        context = Quartz.CGBitmapContextCreate(
+            None, new_width, new_height, 8, 0,
+            Quartz.CGColorSpaceCreateDeviceRGB(),
+            Quartz.kCGImageAlphaPremultipliedLast,
+        )
+        if context is None:
+            return cg_image
+        Quartz.CGContextSetInterpolationQuality(context, Quartz.kCGInterpolationMedium)
+        Quartz.CGContextDrawImage(
+            context, Quartz.CGRectMake(0, 0, new_width, new_height), cg_image
+        )
+        return Quartz.CGBitmapContextCreateImage(context) or cg_image
+
     def _ocr_image(self, cg_image) -> str:
         """Run Vision OCR on a CGImage and return extracted text."""
         try:
@@ -131,95 +239,75 @@ class ScreenAnalyzer:
         if not screen_text or len(screen_text) < 10:
             return None
 
-        # Truncate to first ~2000 chars for performance
-        text = screen_text[:2000].lower()
-        app_lower = app_name.lower() if app_name else ""
-
-        # IDE: look for file tabs, function names, error messages
-        if any(k in app_lower for k in ("code", "intellij", "pycharm", "xcode", "vim", "neovim")):
-            return self._summarize_ide(screen_text)
+        app_name = app_name or ""
 
-        # Browser: look for page content, search queries, form fields
-        if any(k in app_lower for k in ("chrome", "firefox", "safari", "edge", "brave", "arc")):
-            return self._summarize_browser(screen_text, window_title)
-
-        # Email: look for subject lines, recipients
-        if any(k in app_lower for k in ("outlook", "mail", "gmail", "thunderbird")):
-            return self._summarize_email(screen_text)
-
-        # Meetings: look for participant names, shared content
-        if any(k in app_lower for k in ("zoom", "teams", "meet", "webex")):
-            return self._summarize_meeting(screen_text, window_title)
-
-        # Document editors: look for headings, content type
-        if any(k in app_lower for k in ("word", "docs", "pages", "notion", "quip")):
-            return self._summarize_document(screen_text, window_title)
+        # IDE, browser, email, meeting, then document editor
+        for pattern, method in _APP_DISPATCH:
+            if pattern.search(app_name):
+                return getattr(self, method)(screen_text, window_title)
 
         return None
 
-    def _summarize_ide(self, text: str) -> Optional[str]:
+    def _summarize_ide(self, text: str, title: str) -> Optional[str]:
         """Extract IDE context: current file, errors, test results."""
         lines = text.split("\n")
 
         # Look for error indicators
-        error_count = sum(1 for l in lines if re.search(r'\berror\b', l, re.I))
+        error_count = sum(1 for l in lines if _RE_ERROR.search(l))
         if error_count > 0:
             return f"debugging ({error_count} errors visible)"
 
         # Look for test output
-        if any(re.search(r'\b(passed|failed|PASS|FAIL)\b', l) for l in lines):
+        if any(_RE_TEST.search(l) for l in lines):
             return "running/reviewing tests"
 
         # Look for diff/git indicators
-        if any(re.search(r'\b(diff|commit|staged|unstaged)\b', l, re.I) for l in lines):
+        if any(_RE_DIFF.search(l) for l in lines):
             return "reviewing code changes"
 
         return "writing code"
 
     def _summarize_browser(self, text: str, title: str) -> Optional[str]:
         """Extract browser context from visible page content."""
-        text_lower = text.lower()
-
         # Documentation sites
-        if any(k in text_lower for k in ("api reference", "documentation", "docs.", "readme")):
+        if _KW_DOCS.search(text):
             return f"reading documentation"
 
         # Stack Overflow / forums
-        if any(k in text_lower for k in ("stackoverflow", "stack overflow", "asked", "answered", "votes")):
+        if _KW_FORUM.search(text):
             return "researching on Stack Overflow"
 
         # GitHub / code review
-        if any(k in text_lower for k in ("pull request", "merge request", "commits", "files changed")):
+        if _KW_CODE_REVIEW.search(text):
             return "reviewing code on GitHub"
 
         # Search
-        if any(k in text_lower for k in ("search results", "google.com/search")):
+        if _KW_SEARCH.search(text):
             return "searching the web"
 
         return None
 
-    def _summarize_email(self, text: str) -> Optional[str]:
+    def _summarize_email(self, text: str, title: str) -> Optional[str]:
         """Extract email context."""
-        if re.search(r'\b(compose|new message|reply|forward)\b', text, re.I):
+        if _RE_COMPOSE.search(text):
             return "composing email"
-        if re.search(r'\b(inbox|all mail|sent)\b', text, re.I):
+        if _RE_INBOX.search(text):
             return "reading emails"
         return "working in email"
 
     def _summarize_meeting(self, text: str, title: str) -> Optional[str]:
         """Extract meeting context."""
         # Count visible participant-like names (rough heuristic)
-        if re.search(r'\b(screen share|sharing|present)\b', text, re.I):
+        if _RE_PRESENT.search(text):
             return "presenting in meeting"
-        if re.search(r'\b(chat|message|send)\b', text, re.I):
+        if _RE_CHAT.search(text):
             return "chatting in meeting"
         return None
 
     def _summarize_document(self, text: str, title: str) -> Optional[str]:
         """Extract document editing context."""
-        text_lower = text.lower()
-        if any(k in text_lower for k in ("table of contents", "heading", "chapter")):
+        if _KW_OUTLINE.search(text):
             return "writing document"
-        if any(k in text_lower for k in ("comment", "suggestion", "resolve")):
+        if _KW_COMMENTS.search(text):
             return "reviewing document comments"
         return "editing document"
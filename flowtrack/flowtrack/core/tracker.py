@@ -5,11 +5,19 @@ Coordinates activity tracking via either:
 - Polling mode (fallback/Windows): periodic full window queries
 
 Also supports optional ML-powered screen analysis for richer activity summaries.
+
+While running, database writes are handed to a background writer thread
+through a bounded queue, so a slow disk never delays the next poll.
 """
 
+import functools
 import logging
+import queue
 import sys
+import threading
 import time
+from collections import OrderedDict, deque
+from dataclasses import replace
 from datetime import datetime
 from typing import Optional
 
@@ -17,11 +25,39 @@ from flowtrack.core.classifier import Classifier
 from flowtrack.core.context_analyzer import ContextAnalyzer
 from flowtrack.core.models import ActivityRecord, WindowInfo
 from flowtrack.core.pomodoro import PomodoroManager
-from flowtrack.persistence.store import ActivityStore
+from flowtrack.persistence.store import ActivityStore, normalize_todo_title
 from flowtrack.platform.base import WindowProvider
 
 logger = logging.getLogger(__name__)
 
+# Most (category, sub_category) keys remembered for auto-todo dedup.  An
+# evicted key only costs one indexed database lookup if it comes back.
+_SEEN_CONTEXTS_MAX = 4096
+
+# Pending write jobs allowed before new ones are dropped, and the most jobs
+# the writer thread commits in a single transaction.
+_WRITE_QUEUE_MAX = 256
+_WRITE_BATCH_MAX = 64
+
+# Seconds an ML screen summary is reused while the same window stays
+# focused; OCR is by far the most expensive step of a poll.
+_ML_MIN_INTERVAL = 30.0
+
+# While running, repeat observations of the same row are accumulated in
+# memory and written at most this often (or when anything changes).
+_MIN_PERSIST_INTERVAL = 60
+
+# Queued to tell the writer thread to exit.
+_STOP_WRITER = object()
+
+# Sub-categories that are just app names and make useless auto-todos.
+_SKIP_NAMES: frozenset[str] = frozenset({
+    "google chrome", "firefox", "safari", "edge", "brave", "arc",
+    "chrome", "opera", "slack", "discord", "zoom", "teams",
+    "outlook", "mail", "terminal", "iterm", "finder", "explorer",
+    "code", "vs code", "visual studio code", "electron",
+})
+
 
 class Tracker:
     """Orchestrates the activity-tracking pipeline.
@@ -50,16 +86,40 @@ class Tracker:
         self.pomodoro_manager = pomodoro_manager
         self.store = store
         self.poll_interval = poll_interval
-        self._running = False
-        self._seen_contexts: set[str] = set()
+        self._stop_event = threading.Event()
+        # Insertion-ordered so the least recently seen key is evicted first
+        self._seen_contexts: OrderedDict[str, None] = OrderedDict()
+        self._last_todo_context: Optional[tuple[str, str]] = None
         self.current_active_task_id: Optional[int] = None
         self._observer = None  # MacOSWindowObserver when in event-driven mode
         self._screen_analyzer = None
         self._last_window_info: Optional[WindowInfo] = None
         self._last_context = None
+        # Identity of the last inserted activity row, so identical
+        # consecutive polls extend it instead of inserting a new row.
+        # Both are owned by whichever thread runs the write jobs.
+        self._last_record_key: Optional[tuple] = None
+        self._last_record_id: Optional[int] = None
+        # Bumped whenever the user goes idle so the next observation never
+        # extends a row from before the idle gap.
+        self._idle_epoch = 0
+        # Seconds observed for the last row but not yet queued for writing,
+        # with the session to persist alongside them.  Guarded by the lock
+        # because window events, the tick loop and flush() all touch it.
+        self.min_persist_interval_seconds = _MIN_PERSIST_INTERVAL
+        self._held_lock = threading.Lock()
+        self._held_key: Optional[tuple] = None
+        self._held_status = None
+        self._held_since: Optional[datetime] = None
+        self._held_record: Optional[ActivityRecord] = None
+        self._held_seconds = 0.0
+        self._held_session = None
+        self._write_queue: queue.Queue = queue.Queue(maxsize=_WRITE_QUEUE_MAX)
+        self._writer_thread: Optional[threading.Thread] = None
         self.debug_mode = False
-        self._debug_log: list[dict] = []  # ring buffer of recent debug entries
         self._debug_max = 100
+        # Ring buffer of recent debug entries; the oldest falls off when full
+        self._debug_log: deque[dict] = deque(maxlen=self._debug_max)
 
         # Initialize ML screen analyzer if enabled
         if ml_screen_analysis:
@@ -84,7 +144,9 @@ class Tracker:
         """Lazily initialize the screen analyzer."""
         try:
             from flowtrack.core.screen_analyzer import ScreenAnalyzer
-            self._screen_analyzer = ScreenAnalyzer(enabled=True)
+            self._screen_analyzer = ScreenAnalyzer(
+                enabled=True, analysis_ttl=_ML_MIN_INTERVAL
+            )
             logger.info("ML screen analysis initialized")
         except Exception:
             logger.info("ML screen analysis not available on this platform")
@@ -133,16 +195,18 @@ class Tracker:
                 )
                 if ml_summary:
                     ml_used = True
-                    context.activity_summary = ml_summary
+                    # ContextResult is frozen; derive a copy with the ML summary
+                    context = replace(context, activity_summary=ml_summary)
             except Exception:
                 logger.debug("ML screen analysis failed, using regex summary")
 
         # Debug logging
         if self.debug_mode:
             ocr_raw = ""
-            if self._screen_analyzer and hasattr(self._screen_analyzer, 'last_ocr_text'):
+            if ml_used:
                 ocr_raw = self._screen_analyzer.last_ocr_text
-            entry = {
+            session = self.pomodoro_manager.active_session
+            self._debug_log.append({
                 "timestamp": now.isoformat(),
                 "app_name": window_info.app_name,
                 "window_title": window_info.window_title,
@@ -152,33 +216,47 @@ class Tracker:
                 "activity_summary": context.activity_summary,
                 "ml_used": ml_used,
                 "ml_raw_summary": ml_summary,
-                "ocr_raw_text": ocr_raw if ml_used else "",
+                "ocr_raw_text": ocr_raw,
                 "active_task_id": self.current_active_task_id,
-                "session_id": self.pomodoro_manager.active_session.id if self.pomodoro_manager.active_session else None,
-                "session_status": self.pomodoro_manager.active_session.status.value if self.pomodoro_manager.active_session else None,
-            }
-            self._debug_log.append(entry)
-            if len(self._debug_log) > self._debug_max:
-                self._debug_log = self._debug_log[-self._debug_max:]
+                "session_id": session.id if session is not None else None,
+                "session_status": session.status.value if session is not None else None,
+            })
 
         # Cache for periodic recording in event-driven mode
         self._last_window_info = window_info
         self._last_context = context
 
-        # 4. Update pomodoro (propagate active task to session)
-        self.pomodoro_manager.active_task_id = self.current_active_task_id
-        self.pomodoro_manager.on_activity(
-            context.category, context.sub_category, now
+        # 4-5. Update pomodoro (propagating the active task) and tick its timer
+        session = self.pomodoro_manager.observe(
+            context.category, context.sub_category, now, self.current_active_task_id
         )
 
-        # 5. Tick pomodoro timer
-        self.pomodoro_manager.tick(now)
+        # 6. Persist activity record and session state in one transaction
+        self._submit_activity(window_info, context, now, session)
+
+        # 8. Auto-generate todo disabled — Focus tab is manual-only
 
-        # 6. Persist activity record
-        session_id: Optional[str] = None
-        if self.pomodoro_manager.active_session is not None:
-            session_id = self.pomodoro_manager.active_session.id
+    def _submit_activity(self, window_info: WindowInfo, context, now: datetime, session) -> None:
+        """Queue one poll interval of activity plus the state of *session*.
 
+        An observation identical to the previous one (same day, no idle
+        gap) extends the previous row's duration instead of inserting.
+        While the writer thread runs, such extensions are accumulated in
+        memory and queued once per ``min_persist_interval_seconds``, or
+        as soon as the row or the Pomodoro status changes.
+        """
+        session_id = session.id if session is not None else None
+        record_key = (
+            now.date(),
+            self._idle_epoch,
+            window_info.app_name,
+            window_info.window_title,
+            context.category,
+            context.sub_category,
+            session_id,
+            self.current_active_task_id,
+            context.activity_summary,
+        )
         record = ActivityRecord(
             id=0,
             timestamp=now,
@@ -189,14 +267,44 @@ class Tracker:
             session_id=session_id,
             active_task_id=self.current_active_task_id,
             activity_summary=context.activity_summary,
+            duration_seconds=self.poll_interval,
         )
-        self.store.save_activity(record)
-
-        # 7. Persist session state if one exists
-        if self.pomodoro_manager.active_session is not None:
-            self.store.save_session(self.pomodoro_manager.active_session)
-
-        # 8. Auto-generate todo disabled — Focus tab is manual-only
+        status = session.status if session is not None else None
+        with self._held_lock:
+            if (
+                self._writer_thread is not None
+                and record_key == self._held_key
+                and status is self._held_status
+            ):
+                self._held_record = record
+                self._held_seconds += self.poll_interval
+                self._held_session = session
+                if (now - self._held_since).total_seconds() >= self.min_persist_interval_seconds:
+                    self._release_held()
+                    self._held_since = now
+                return
+            self._release_held()
+            self._held_key = record_key
+            self._held_status = status
+            self._held_since = now
+            self._submit(functools.partial(
+                self._write_activity, record_key, record, _snapshot(session)
+            ))
+
+    def _release_held(self) -> None:
+        """Queue the seconds accumulated for the held row, if any.
+
+        The caller must hold ``_held_lock``.
+        """
+        if not self._held_seconds:
+            return
+        extension = replace(self._held_record, duration_seconds=self._held_seconds)
+        self._submit(functools.partial(
+            self._write_activity, self._held_key, extension, _snapshot(self._held_session)
+        ))
+        self._held_record = None
+        self._held_seconds = 0.0
+        self._held_session = None
 
     def run(self) -> None:
         """Main loop: uses event-driven observer on macOS, falls back to polling.
@@ -207,15 +315,48 @@ class Tracker:
 
         On other platforms, falls back to the traditional poll loop.
         """
-        self._running = True
-
-        # Try event-driven mode on macOS
-        if sys.platform == "darwin" and self._try_start_observer():
-            logger.info("Running in event-driven mode (macOS observer)")
-            self._run_tick_loop()
-        else:
-            logger.info("Running in polling mode (interval=%ds)", self.poll_interval)
-            self._run_poll_loop()
+        self._stop_event.clear()
+        self._start_writer()
+        try:
+            # Try event-driven mode on macOS
+            if sys.platform == "darwin" and self._try_start_observer():
+                logger.info("Running in event-driven mode (macOS observer)")
+                self._run_tick_loop()
+            else:
+                logger.info("Running in polling mode (interval=%ds)", self.poll_interval)
+                self._run_poll_loop()
+        finally:
+            with self._held_lock:
+                self._release_held()
+                self._held_key = None
+            self._stop_writer()
+
+    def flush(self) -> None:
+        """Block until every observed interval has been committed."""
+        if self._writer_thread is not None:
+            with self._held_lock:
+                self._release_held()
+            self._write_queue.join()
+
+    def forget_last_activity(self) -> None:
+        """Start a fresh row on the next poll, dropping any held seconds.
+
+        Called after the activity log has been cleared, so time tracked
+        before the clear is not added back to the new log.  The cached row
+        is dropped by a queued job, after any writes already pending.
+        """
+        with self._held_lock:
+            self._held_key = None
+            self._held_record = None
+            self._held_seconds = 0.0
+            self._held_session = None
+            self._submit(self._forget_last_record)
+
+    def _forget_last_record(self):
+        """Write job: stop extending the cached row.  Persists no session."""
+        self._last_record_key = None
+        self._last_record_id = None
+        return None
 
     def _try_start_observer(self) -> bool:
         """Try to start the macOS event-driven observer."""
@@ -245,10 +386,12 @@ class Tracker:
         The observer handles window change detection and calls on_window_change.
         This loop periodically:
         1. Ticks the Pomodoro timer
-        2. Saves an activity record for the current window (so time accumulates)
+        2. Records a poll interval for the current window (so time
+           accumulates), extending its row rather than inserting a new one
         3. Persists session state
         """
-        while self._running:
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
             try:
                 idle = self.window_provider.is_user_idle()
             except Exception:
@@ -258,36 +401,20 @@ class Tracker:
                 now = datetime.now()
                 self.pomodoro_manager.tick(now)
 
-                # Save a periodic activity record so time accumulates
+                # Accumulate time on the current window's row and persist
+                # session state, in a single transaction
+                session = self.pomodoro_manager.active_session
                 if self._last_window_info is not None and self._last_context is not None:
-                    session_id = None
-                    if self.pomodoro_manager.active_session is not None:
-                        session_id = self.pomodoro_manager.active_session.id
-
-                    record = ActivityRecord(
-                        id=0,
-                        timestamp=now,
-                        app_name=self._last_window_info.app_name,
-                        window_title=self._last_window_info.window_title,
-                        category=self._last_context.category,
-                        sub_category=self._last_context.sub_category,
-                        session_id=session_id,
-                        active_task_id=self.current_active_task_id,
-                        activity_summary=self._last_context.activity_summary,
+                    self._submit_activity(
+                        self._last_window_info, self._last_context, now, session
                     )
-                    try:
-                        self.store.save_activity(record)
-                    except Exception:
-                        logger.debug("Failed to save periodic activity record")
-
-                # Persist session state
-                if self.pomodoro_manager.active_session is not None:
-                    try:
-                        self.store.save_session(self.pomodoro_manager.active_session)
-                    except Exception:
-                        logger.debug("Failed to persist session in tick loop")
+                elif session is not None:
+                    self._submit(functools.partial(self._write_session, _snapshot(session)))
+            else:
+                # Time spent idle must not be folded into the previous row
+                self._idle_epoch += 1
 
-            time.sleep(self.poll_interval)
+            next_tick = self._wait_for_next_tick(next_tick)
 
         # Clean up observer
         if self._observer is not None:
@@ -296,7 +423,8 @@ class Tracker:
 
     def _run_poll_loop(self) -> None:
         """Traditional polling loop (fallback for non-macOS)."""
-        while self._running:
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
             try:
                 idle = self.window_provider.is_user_idle()
             except Exception:
@@ -307,25 +435,144 @@ class Tracker:
                 self.poll_once(datetime.now())
             else:
                 logger.debug("User is idle; skipping poll")
+                # Time spent idle must not be folded into the previous row
+                self._idle_epoch += 1
 
-            time.sleep(self.poll_interval)
+            next_tick = self._wait_for_next_tick(next_tick)
+
+    def _wait_for_next_tick(self, next_tick: float) -> float:
+        """Block until the next scheduled tick or until stop() is called.
+
+        Deadlines advance by a fixed ``poll_interval`` from the previous
+        deadline so the cadence does not drift by the time spent in the
+        loop body.  If the loop has fallen a whole interval behind (e.g.
+        after system sleep) the schedule is re-anchored to now rather
+        than firing a burst of catch-up ticks.  Returns the deadline that
+        was waited for.
+        """
+        next_tick += self.poll_interval
+        now = time.monotonic()
+        if next_tick < now - self.poll_interval:
+            next_tick = now
+        self._stop_event.wait(max(0.0, next_tick - now))
+        return next_tick
 
     def stop(self) -> None:
-        """Signal the run loop to stop."""
-        self._running = False
+        """Signal the run loop to stop; wakes it immediately if waiting."""
+        self._stop_event.set()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _submit(self, job) -> None:
+        """Queue a write job for the writer thread, or run it inline.
+
+        Outside ``run()`` there is no writer thread and the job is committed
+        before returning.  When the queue is full the job is dropped.
+        """
+        if self._writer_thread is None:
+            self._write_batch([job])
+            return
+        try:
+            self._write_queue.put_nowait(job)
+        except queue.Full:
+            logger.warning("Persistence queue full; dropping an activity write")
+
+    def _start_writer(self) -> None:
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, daemon=True, name="flowtrack-writer"
+        )
+        self._writer_thread.start()
+
+    def _stop_writer(self) -> None:
+        """Commit everything still queued, then stop the writer thread."""
+        thread, self._writer_thread = self._writer_thread, None
+        if thread is None:
+            return
+        self._write_queue.put(_STOP_WRITER)
+        thread.join()
+
+    def _writer_loop(self) -> None:
+        """Drain the queue, committing whatever has piled up as one batch."""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < _WRITE_BATCH_MAX:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            jobs = [job for job in batch if job is not _STOP_WRITER]
+            if jobs:
+                self._write_batch(jobs)
+            for _ in batch:
+                self._write_queue.task_done()
+            if len(jobs) < len(batch):
+                return
+
+    def _write_batch(self, jobs: list) -> None:
+        """Run write jobs in a single transaction; log and discard on failure.
+
+        Each job returns the session snapshot it wants persisted, or None.
+        Only the newest snapshot of each session is written, once, at the
+        end of the batch.
+        """
+        try:
+            with self.store.transaction():
+                sessions = {}
+                for job in jobs:
+                    session = job()
+                    if session is not None:
+                        sessions[session.id] = session
+                for session in sessions.values():
+                    self.store.save_session(session)
+        except Exception:
+            # The transaction was rolled back; the cached row may not exist.
+            self._last_record_key = None
+            self._last_record_id = None
+            logger.exception("Failed to persist activity; skipping this cycle")
+
+    def _write_activity(self, record_key: tuple, record: ActivityRecord, session):
+        """Insert *record*, or extend the previous row if *record_key* matches it.
+
+        Falls back to inserting when the cached row has been deleted (e.g.
+        the activity log was cleared).  Returns *session* so the batch
+        persists its state.
+        """
+        if (
+            record_key != self._last_record_key
+            or self._last_record_id is None
+            or not self.store.extend_activity(self._last_record_id, record.duration_seconds)
+        ):
+            self._last_record_id = self.store.save_activity(record)
+            self._last_record_key = record_key
+        # 7. Persist session state if one exists
+        return session
+
+    @staticmethod
+    def _write_session(session):
+        """Persist session state only; returns *session* for the batch."""
+        return session
 
     def _maybe_create_todo(self, category: str, sub_category: str) -> None:
         """Auto-create a todo when a meaningful new work context is detected.
 
         Skips generic/unhelpful labels (just the category name, app names,
         or very short strings). Deduplicates against both the in-memory
-        seen set and existing todos in the database.
+        seen set and existing todos in the database.  Repeat calls for the
+        context handled last return immediately.
         """
+        ctx = (category, sub_category)
+        if ctx == self._last_todo_context:
+            return
+        self._last_todo_context = ctx
+
         if category == "Other" or not sub_category:
             return
 
         # Skip if the sub_category is just the category name (no real context)
-        if sub_category.lower() == category.lower():
+        sub_lower = sub_category.lower()
+        if sub_lower == category.lower():
             return
 
         # Skip very short or generic labels
@@ -333,28 +580,22 @@ class Tracker:
             return
 
         # Skip labels that are just app names
-        _SKIP_NAMES = {
-            "google chrome", "firefox", "safari", "edge", "brave", "arc",
-            "chrome", "opera", "slack", "discord", "zoom", "teams",
-            "outlook", "mail", "terminal", "iterm", "finder", "explorer",
-            "code", "vs code", "visual studio code", "electron",
-        }
-        if sub_category.lower().strip() in _SKIP_NAMES:
+        if sub_lower.strip() in _SKIP_NAMES:
             return
 
         # In-memory dedup
         key = f"{category}::{sub_category}"
         if key in self._seen_contexts:
+            self._seen_contexts.move_to_end(key)
             return
-        self._seen_contexts.add(key)
+        self._seen_contexts[key] = None
+        if len(self._seen_contexts) > _SEEN_CONTEXTS_MAX:
+            self._seen_contexts.popitem(last=False)
 
         # Database dedup — check if a todo with similar title already exists
         try:
-            existing = self.store.get_todos(include_done=True)
-            normalized = _normalize_todo(sub_category)
-            for todo in existing:
-                if _normalize_todo(todo.get("title", "")) == normalized:
-                    return
+            if self.store.todo_exists_normalized(normalize_todo_title(sub_category)):
+                return
         except Exception:
             pass
 
@@ -368,11 +609,10 @@ class Tracker:
     def _find_or_create_bucket(self, category: str) -> int | None:
         """Find a manual work bucket for this category, or create a general one."""
         try:
-            todos = self.store.get_todos(include_done=True)
             # Look for an existing top-level todo matching this category (manual or auto)
-            for t in todos:
-                if not t.get("parent_id") and t.get("category", "").lower() == category.lower():
-                    return t["id"]
+            bucket_id = self.store.find_category_bucket(category)
+            if bucket_id is not None:
+                return bucket_id
             # No bucket found — create an auto-generated one
             bucket_id = self.store.add_todo(f"General: {category}", category, auto=True, parent_id=None)
             return bucket_id
@@ -380,11 +620,6 @@ class Tracker:
             return None
 
 
-def _normalize_todo(title: str) -> str:
-    """Normalize a todo title for dedup comparison."""
-    import re
-    t = title.lower().strip()
-    # Strip common prefixes we used to add
-    t = re.sub(r"^work on:\s*", "", t)
-    t = re.sub(r"^(writing|emailing|browsing|coding|designing|meeting|chat|task|spreadsheet|presentation):\s*", "", t)
-    return t.strip()
+def _snapshot(session):
+    """Copy a session so a queued write is unaffected by later mutation."""
+    return replace(session) if session is not None else None
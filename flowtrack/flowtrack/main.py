@@ -15,11 +15,12 @@ import logging
 import os
 import sys
 from datetime import date, timedelta
+from typing import TYPE_CHECKING
 
 from flowtrack.core.config import get_default_config_path, load_config
-from flowtrack.persistence.store import ActivityStore
-from flowtrack.reporting.formatter import TextFormatter
-from flowtrack.reporting.summary import SummaryGenerator
+
+if TYPE_CHECKING:
+    from flowtrack.persistence.store import ActivityStore
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -42,11 +43,23 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _print_daily_summary(config: dict) -> None:
-    """Create a store and summary generator, then print today's summary."""
+def _open_store(config: dict) -> "ActivityStore":
+    """Open the activity store named in *config* and ensure its schema exists."""
+    # Imported here, like the GUI, so each mode loads only what it uses
+    from flowtrack.persistence.store import ActivityStore
+
     db_path = os.path.expanduser(config.get("database_path", "~/.flowtrack/flowtrack.db"))
     store = ActivityStore(db_path)
     store.init_db()
+    return store
+
+
+def _print_daily_summary(config: dict) -> None:
+    """Create a store and summary generator, then print today's summary."""
+    from flowtrack.reporting.formatter import TextFormatter
+    from flowtrack.reporting.summary import SummaryGenerator
+
+    store = _open_store(config)
     try:
         poll_interval = config.get("poll_interval_seconds", 5)
         generator = SummaryGenerator(store, poll_interval)
@@ -58,9 +71,10 @@ def _print_daily_summary(config: dict) -> None:
 
 def _print_weekly_summary(config: dict) -> None:
     """Create a store and summary generator, then print this week's summary."""
-    db_path = os.path.expanduser(config.get("database_path", "~/.flowtrack/flowtrack.db"))
-    store = ActivityStore(db_path)
-    store.init_db()
+    from flowtrack.reporting.formatter import TextFormatter
+    from flowtrack.reporting.summary import SummaryGenerator
+
+    store = _open_store(config)
     try:
         poll_interval = config.get("poll_interval_seconds", 5)
         generator = SummaryGenerator(store, poll_interval)
@@ -1,11 +1,123 @@
 """SQLite-backed persistence for activity logs and Pomodoro sessions."""
 
+import functools
+import re
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Optional
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
 
 from flowtrack.core.models import ActivityRecord, PomodoroSession, SessionStatus
 
+# Applied once to every new connection (foreign_keys is per-connection
+# state, so writers need not repeat it).  WAL lets summary/dashboard reads run
+# alongside tracker writes; synchronous=NORMAL is durable in WAL mode
+# except for the last commits on power loss, which is fine for activity logs.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+)
+
+# Enough for every statement the store issues, so none is ever re-prepared.
+_CACHED_STATEMENTS = 256
+
+# Connections kept open for reuse after their thread exits.  The web
+# server runs each request on a fresh thread; this many idle connections
+# covers its concurrent requests without reopening a file per request.
+_MAX_IDLE_CONNECTIONS = 4
+
+# Statements on the tracker's per-poll write path.
+_SQL_INSERT_ACTIVITY = """\
+INSERT INTO activity_logs
+    (timestamp, app_name, window_title, category, sub_category,
+     session_id, active_task_id, activity_summary, duration_seconds)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_EXTEND_ACTIVITY = (
+    "UPDATE activity_logs SET duration_seconds = duration_seconds + ? WHERE id = ?"
+)
+_SQL_UPSERT_SESSION = """\
+INSERT OR REPLACE INTO pomodoro_sessions
+    (id, category, sub_category, start_time, elapsed_seconds,
+     status, completed_count, active_task_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Explicit column lists for the record readers, in the order the row
+# mappers unpack them.
+_ACTIVITY_COLUMNS = (
+    "id, timestamp, app_name, window_title, category, sub_category, "
+    "session_id, active_task_id, activity_summary, duration_seconds"
+)
+_SESSION_COLUMNS = (
+    "id, category, sub_category, start_time, elapsed_seconds, "
+    "status, completed_count, active_task_id"
+)
+# Todo dict keys, in SELECT order for get_todos
+_TODO_FIELDS = (
+    "id", "title", "category", "parent_id", "done", "auto_generated",
+    "created_at", "sort_order", "title_normalized",
+)
+_TODO_COLUMNS = ", ".join(_TODO_FIELDS)
+
+
+# Label prefixes that older versions added to auto-generated todo titles:
+# an optional "work on:" followed by an optional activity label.
+_TODO_PREFIX_RE = re.compile(
+    r"^(?:work on:\s*)?"
+    r"(?:(?:writing|emailing|browsing|coding|designing|meeting|chat|task|spreadsheet|presentation):\s*)?"
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_todo_title(title: str) -> str:
+    """Normalize a todo title for dedup comparison."""
+    # Strip common prefixes we used to add, in a single pass
+    return _TODO_PREFIX_RE.sub("", title.lower().strip(), count=1).strip()
+
+
+class _Connection(sqlite3.Connection):
+    """A ``sqlite3.Connection`` that supports weak references.
+
+    ``batch_open`` is set while an :meth:`ActivityStore.transaction` block
+    is open on the connection, so writes made through it join the batch
+    instead of committing it.
+    """
+
+    batch_open = False
+
+
+class _Lease:
+    """A thread's hold on a pooled connection, dropped when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _release_connection(
+    conn: _Connection,
+    idle: list[_Connection],
+    connections: "weakref.WeakSet[_Connection]",
+    lock: threading.Lock,
+) -> None:
+    """Return an exited thread's connection to the idle pool, or close it."""
+    with lock:
+        if conn not in connections:  # the store was closed
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        conn.batch_open = False
+        if len(idle) < _MAX_IDLE_CONNECTIONS:
+            idle.append(conn)
+            return
+        connections.discard(conn)
+    conn.close()
+
 
 class ActivityStore:
     """Read/write interface to the local SQLite database.
@@ -13,27 +125,135 @@ class ActivityStore:
     Stores activity observations and Pomodoro session state.  Timestamps are
     persisted as ISO 8601 text and ``timedelta`` values as total seconds
     (REAL) so that round-trip fidelity is preserved.
+
+    An activity row covers ``duration_seconds`` of tracked time; consecutive
+    identical observations extend one row instead of inserting new ones.
+    Rows written before that column existed have a NULL duration and count
+    as one poll interval.
+
+    Each thread gets its own connection, so the tracker's writer thread,
+    the UI and web request threads never share a transaction, and WAL
+    readers run alongside the writer.  When a thread exits, its connection
+    goes back to a small idle pool for the next thread (such as the web
+    server's per-request threads) rather than being closed; :meth:`close`
+    closes them all.
     """
 
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
-        self._conn: Optional[sqlite3.Connection] = None
+        self._local = threading.local()
+        self._connections: weakref.WeakSet[_Connection] = weakref.WeakSet()
+        self._idle: list[_Connection] = []
+        self._lock = threading.Lock()
+        # Every connection to ":memory:" is a separate database, so an
+        # in-memory store shares one connection across threads instead.
+        self._shared_conn: Optional[sqlite3.Connection] = None
 
     # ------------------------------------------------------------------
     # Connection helpers
     # ------------------------------------------------------------------
 
-    def _get_conn(self) -> sqlite3.Connection:
-        if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._conn.row_factory = sqlite3.Row
-            self._conn.execute("PRAGMA foreign_keys = ON")
-        return self._conn
+    def _get_conn(self) -> _Connection:
+        """Return the calling thread's connection, taking one on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._lock:
+                if self._shared_conn is not None:
+                    conn = self._shared_conn
+                elif self._idle:
+                    conn = self._idle.pop()
+                else:
+                    conn = self._connect()
+            if conn is not self._shared_conn:
+                # The lease lives only in this thread's locals, so it is
+                # collected, and the connection released, when the thread exits.
+                lease = _Lease()
+                weakref.finalize(
+                    lease, _release_connection,
+                    conn, self._idle, self._connections, self._lock,
+                )
+                self._local.lease = lease
+            self._local.conn = conn
+        return conn
+
+    def _connect(self) -> _Connection:
+        """Open and configure a new connection.  Called with ``_lock`` held."""
+        # check_same_thread=False so close() can close every thread's
+        # connection and an idle one can pass to the next thread; each is
+        # used by one thread at a time.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+            factory=_Connection,
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL is meaningless (and unsupported) for in-memory databases.
+        if self.db_path in ("", ":memory:"):
+            self._shared_conn = conn
+        else:
+            conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        self._connections.add(conn)
+        return conn
 
     def close(self) -> None:
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+        """Close every thread's connection."""
+        with self._lock:
+            for conn in list(self._connections):
+                conn.close()
+            self._connections.clear()
+            self._idle.clear()
+            self._shared_conn = None
+            self._local = threading.local()
+
+    def _fetch_tuples(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Run a query and return plain tuples instead of ``sqlite3.Row``."""
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = None
+        return cursor.execute(sql, params).fetchall()
+
+    def _iter_tuples(self, sql: str, params: tuple = ()) -> Iterator[tuple]:
+        """Like :meth:`_fetch_tuples`, but yield rows as the cursor steps."""
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = None
+        try:
+            yield from cursor.execute(sql, params)
+        finally:
+            cursor.close()
+
+    def _commit(self, conn: _Connection) -> None:
+        """Commit unless the write is part of an enclosing transaction()."""
+        if not conn.batch_open:
+            conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Group several writes into a single SQLite transaction.
+
+        Writes issued inside the block are committed together on exit, or
+        rolled back together if the block raises.  Nested blocks join the
+        outermost transaction.  The open transaction belongs to the
+        connection, so on a shared in-memory store writes from other
+        threads join it too rather than committing it early.
+        """
+        conn = self._get_conn()
+        if conn.batch_open:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.batch_open = True
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            conn.batch_open = False
 
     # ------------------------------------------------------------------
     # Schema initialisation
@@ -42,7 +262,6 @@ class ActivityStore:
     def init_db(self) -> None:
         """Create tables and indexes if they don't already exist."""
         conn = self._get_conn()
-        conn.execute("PRAGMA foreign_keys = ON")
         conn.executescript(
             """\
             CREATE TABLE IF NOT EXISTS activity_logs (
@@ -54,7 +273,8 @@ class ActivityStore:
                 sub_category TEXT NOT NULL DEFAULT '',
                 session_id TEXT,
                 active_task_id INTEGER,
-                activity_summary TEXT NOT NULL DEFAULT ''
+                activity_summary TEXT NOT NULL DEFAULT '',
+                duration_seconds REAL
             );
 
             CREATE TABLE IF NOT EXISTS pomodoro_sessions (
@@ -77,6 +297,7 @@ class ActivityStore:
                 auto_generated INTEGER NOT NULL DEFAULT 0,
                 created_at TEXT NOT NULL,
                 sort_order INTEGER NOT NULL DEFAULT 0,
+                title_normalized TEXT,
                 FOREIGN KEY (parent_id) REFERENCES focus_tasks(id) ON DELETE CASCADE
             );
 
@@ -86,9 +307,6 @@ class ActivityStore:
             CREATE INDEX IF NOT EXISTS idx_session_start
                 ON pomodoro_sessions(start_time);
 
-            CREATE INDEX IF NOT EXISTS idx_activity_task
-                ON activity_logs(active_task_id);
-
             CREATE INDEX IF NOT EXISTS idx_focus_parent
                 ON focus_tasks(parent_id);
             """
@@ -98,8 +316,36 @@ class ActivityStore:
         # Migrate: add columns if missing (existing DBs)
         self._migrate_add_column(conn, "activity_logs", "active_task_id", "INTEGER")
         self._migrate_add_column(conn, "activity_logs", "activity_summary", "TEXT NOT NULL DEFAULT ''")
+        self._migrate_add_column(conn, "activity_logs", "duration_seconds", "REAL")
         self._migrate_add_column(conn, "pomodoro_sessions", "active_task_id", "INTEGER")
         self._migrate_add_column(conn, "focus_tasks", "sort_order", "INTEGER NOT NULL DEFAULT 0")
+        self._migrate_add_column(conn, "focus_tasks", "title_normalized", "TEXT")
+        self._backfill_normalized_titles(conn)
+        conn.executescript(
+            """\
+            -- Per-task reads seek on (task, time range).  Kept narrow on
+            -- purpose: extend_activity() rewrites duration_seconds on every
+            -- coalesced poll, so that column stays out of every index.
+            CREATE INDEX IF NOT EXISTS idx_activity_task_time
+                ON activity_logs(active_task_id, timestamp);
+            DROP INDEX IF EXISTS idx_activity_task;
+            DROP INDEX IF EXISTS idx_activity_task_cover;
+
+            CREATE INDEX IF NOT EXISTS idx_focus_title_norm
+                ON focus_tasks(title_normalized);
+
+            CREATE INDEX IF NOT EXISTS idx_focus_category
+                ON focus_tasks(category COLLATE NOCASE) WHERE parent_id IS NULL;
+
+            -- Partial indexes: get_todos() walks only open todos, already in
+            -- display order, and clear_auto_todos() touches only generated ones.
+            CREATE INDEX IF NOT EXISTS idx_focus_active
+                ON focus_tasks(sort_order, id DESC) WHERE done = 0;
+
+            CREATE INDEX IF NOT EXISTS idx_focus_auto
+                ON focus_tasks(auto_generated) WHERE auto_generated = 1;
+            """
+        )
 
         # Fix: mark "General: ..." buckets as auto_generated (they were incorrectly created as manual)
         try:
@@ -110,6 +356,19 @@ class ActivityStore:
         except Exception:
             pass
 
+    @staticmethod
+    def _backfill_normalized_titles(conn) -> None:
+        """Populate title_normalized for todos created before the column existed."""
+        rows = conn.execute(
+            "SELECT id, title FROM focus_tasks WHERE title_normalized IS NULL"
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE focus_tasks SET title_normalized = ? WHERE id = ?",
+                [(normalize_todo_title(r["title"]), r["id"]) for r in rows],
+            )
+            conn.commit()
+
     @staticmethod
     def _migrate_add_column(conn, table: str, column: str, col_type: str) -> None:
         """Add a column to a table if it doesn't exist yet."""
@@ -130,12 +389,7 @@ class ActivityStore:
         """Persist an activity record. Returns the row id."""
         conn = self._get_conn()
         cursor = conn.execute(
-            """\
-            INSERT INTO activity_logs
-                (timestamp, app_name, window_title, category, sub_category,
-                 session_id, active_task_id, activity_summary)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _SQL_INSERT_ACTIVITY,
             (
                 record.timestamp.isoformat(),
                 record.app_name,
@@ -145,35 +399,90 @@ class ActivityStore:
                 record.session_id,
                 record.active_task_id,
                 record.activity_summary,
+                record.duration_seconds,
             ),
         )
-        conn.commit()
+        self._commit(conn)
         return cursor.lastrowid  # type: ignore[return-value]
 
+    def extend_activity(self, record_id: int, seconds: float) -> int:
+        """Add *seconds* of tracked time to an existing activity row.
+
+        Returns the number of rows updated: 0 if the row no longer exists.
+        """
+        conn = self._get_conn()
+        updated = conn.execute(_SQL_EXTEND_ACTIVITY, (seconds, record_id)).rowcount
+        self._commit(conn)
+        return updated
+
     def get_activity_by_id(self, record_id: int) -> Optional[ActivityRecord]:
         """Return a single activity record by primary key, or ``None``."""
-        conn = self._get_conn()
-        row = conn.execute(
-            "SELECT * FROM activity_logs WHERE id = ?", (record_id,)
-        ).fetchone()
-        if row is None:
-            return None
-        return self._row_to_activity(row)
+        rows = self._fetch_tuples(
+            f"SELECT {_ACTIVITY_COLUMNS} FROM activity_logs WHERE id = ?", (record_id,)
+        )
+        return self._row_to_activity(rows[0]) if rows else None
 
     def get_activities(
         self, start: datetime, end: datetime
     ) -> list[ActivityRecord]:
         """Return all activity records whose timestamp falls in [start, end)."""
+        return list(self.iter_activities(start, end))
+
+    def iter_activities(
+        self, start: datetime, end: datetime
+    ) -> Iterator[ActivityRecord]:
+        """Yield activity records in [start, end) without building a list."""
+        rows = self._iter_tuples(
+            f"""\
+            SELECT {_ACTIVITY_COLUMNS} FROM activity_logs
+            WHERE timestamp >= ? AND timestamp < ?
+            ORDER BY timestamp
+            """,
+            (start.isoformat(), end.isoformat()),
+        )
+        return map(self._row_to_activity, rows)
+
+    def get_category_durations(
+        self, start: datetime, end: datetime, poll_interval: float
+    ) -> list[tuple[str, str, float]]:
+        """Return ``(category, sub_category, seconds)`` for activities in [start, end).
+
+        Aggregation happens in SQLite so callers that only need per-category
+        totals never materialize individual ``ActivityRecord`` rows.  Rows
+        without a recorded duration count as *poll_interval* seconds.
+        """
         conn = self._get_conn()
         rows = conn.execute(
             """\
-            SELECT * FROM activity_logs
+            SELECT category, sub_category, SUM(COALESCE(duration_seconds, ?))
+            FROM activity_logs
             WHERE timestamp >= ? AND timestamp < ?
-            ORDER BY timestamp
+            GROUP BY category, sub_category
             """,
-            (start.isoformat(), end.isoformat()),
+            (poll_interval, start.isoformat(), end.isoformat()),
+        ).fetchall()
+        return [(r[0], r[1], r[2]) for r in rows]
+
+    def get_daily_category_durations(
+        self, start: datetime, end: datetime, poll_interval: float
+    ) -> list[tuple[date, str, str, float]]:
+        """Return ``(day, category, sub_category, seconds)`` for activities in [start, end).
+
+        Timestamps are stored as local ISO 8601 text, so the calendar day
+        is the first ten characters of the column.
+        """
+        conn = self._get_conn()
+        rows = conn.execute(
+            """\
+            SELECT substr(timestamp, 1, 10) AS day, category, sub_category,
+                   SUM(COALESCE(duration_seconds, ?))
+            FROM activity_logs
+            WHERE timestamp >= ? AND timestamp < ?
+            GROUP BY day, category, sub_category
+            """,
+            (poll_interval, start.isoformat(), end.isoformat()),
         ).fetchall()
-        return [self._row_to_activity(r) for r in rows]
+        return [(date.fromisoformat(r[0]), r[1], r[2], r[3]) for r in rows]
 
     # ------------------------------------------------------------------
     # Pomodoro session operations
@@ -183,12 +492,7 @@ class ActivityStore:
         """Insert or update a Pomodoro session (upsert by id)."""
         conn = self._get_conn()
         conn.execute(
-            """\
-            INSERT OR REPLACE INTO pomodoro_sessions
-                (id, category, sub_category, start_time, elapsed_seconds,
-                 status, completed_count, active_task_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _SQL_UPSERT_SESSION,
             (
                 session.id,
                 session.category,
@@ -200,32 +504,34 @@ class ActivityStore:
                 session.active_task_id,
             ),
         )
-        conn.commit()
+        self._commit(conn)
 
     def get_session_by_id(self, session_id: str) -> Optional[PomodoroSession]:
         """Return a single Pomodoro session by id, or ``None``."""
-        conn = self._get_conn()
-        row = conn.execute(
-            "SELECT * FROM pomodoro_sessions WHERE id = ?", (session_id,)
-        ).fetchone()
-        if row is None:
-            return None
-        return self._row_to_session(row)
+        rows = self._fetch_tuples(
+            f"SELECT {_SESSION_COLUMNS} FROM pomodoro_sessions WHERE id = ?", (session_id,)
+        )
+        return self._row_to_session(rows[0]) if rows else None
 
     def get_sessions(
         self, start: datetime, end: datetime
     ) -> list[PomodoroSession]:
         """Return all sessions whose start_time falls in [start, end)."""
-        conn = self._get_conn()
-        rows = conn.execute(
-            """\
-            SELECT * FROM pomodoro_sessions
+        return list(self.iter_sessions(start, end))
+
+    def iter_sessions(
+        self, start: datetime, end: datetime
+    ) -> Iterator[PomodoroSession]:
+        """Yield sessions starting in [start, end) without building a list."""
+        rows = self._iter_tuples(
+            f"""\
+            SELECT {_SESSION_COLUMNS} FROM pomodoro_sessions
             WHERE start_time >= ? AND start_time < ?
             ORDER BY start_time
             """,
             (start.isoformat(), end.isoformat()),
-        ).fetchall()
-        return [self._row_to_session(r) for r in rows]
+        )
+        return map(self._row_to_session, rows)
 
     # ------------------------------------------------------------------
     # Todo operations
@@ -234,24 +540,44 @@ class ActivityStore:
     def add_todo(self, title: str, category: str = "", auto: bool = False, parent_id: int | None = None) -> int:
         conn = self._get_conn()
         cursor = conn.execute(
-            "INSERT INTO focus_tasks (title, category, done, auto_generated, parent_id, created_at, sort_order) VALUES (?, ?, 0, ?, ?, ?, 0)",
-            (title, category, 1 if auto else 0, parent_id, datetime.now().isoformat()),
+            "INSERT INTO focus_tasks (title, category, done, auto_generated, parent_id, created_at, sort_order, title_normalized) VALUES (?, ?, 0, ?, ?, ?, 0, ?)",
+            (title, category, 1 if auto else 0, parent_id, datetime.now().isoformat(), normalize_todo_title(title)),
         )
         conn.commit()
         return cursor.lastrowid  # type: ignore[return-value]
 
-    def get_todos(self, include_done: bool = False) -> list[dict]:
+    def todo_exists_normalized(self, normalized_title: str) -> bool:
+        """Return True if any todo (done or not) has this normalized title."""
         conn = self._get_conn()
+        row = conn.execute(
+            "SELECT 1 FROM focus_tasks WHERE title_normalized = ? LIMIT 1",
+            (normalized_title,),
+        ).fetchone()
+        return row is not None
+
+    def find_category_bucket(self, category: str) -> int | None:
+        """Return the id of the top-level todo for *category* (case-insensitive).
+
+        When several match, the one listed first by ``get_todos`` wins.
+        """
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT id FROM focus_tasks WHERE parent_id IS NULL AND category = ? COLLATE NOCASE "
+            "ORDER BY sort_order, done, id DESC LIMIT 1",
+            (category,),
+        ).fetchone()
+        return row["id"] if row is not None else None
+
+    def get_todos(self, include_done: bool = False) -> list[dict]:
         if include_done:
-            rows = conn.execute("SELECT * FROM focus_tasks ORDER BY sort_order, done, id DESC").fetchall()
+            rows = self._fetch_tuples(
+                f"SELECT {_TODO_COLUMNS} FROM focus_tasks ORDER BY sort_order, done, id DESC"
+            )
         else:
-            rows = conn.execute("SELECT * FROM focus_tasks WHERE done = 0 ORDER BY sort_order, id DESC").fetchall()
-        result = []
-        for r in rows:
-            d = dict(r)
-            d.setdefault("parent_id", None)
-            result.append(d)
-        return result
+            rows = self._fetch_tuples(
+                f"SELECT {_TODO_COLUMNS} FROM focus_tasks WHERE done = 0 ORDER BY sort_order, id DESC"
+            )
+        return [dict(zip(_TODO_FIELDS, r)) for r in rows]
 
     def move_todo(self, todo_id: int, parent_id: int | None) -> None:
         conn = self._get_conn()
@@ -265,7 +591,6 @@ class ActivityStore:
 
     def delete_todo(self, todo_id: int) -> None:
         conn = self._get_conn()
-        conn.execute("PRAGMA foreign_keys = ON")
         conn.execute("DELETE FROM focus_tasks WHERE id = ?", (todo_id,))
         conn.commit()
 
@@ -282,7 +607,6 @@ class ActivityStore:
     def clear_done_todos(self) -> None:
         """Delete all tasks marked as done."""
         conn = self._get_conn()
-        conn.execute("PRAGMA foreign_keys = ON")
         conn.execute("DELETE FROM focus_tasks WHERE done = 1")
         conn.commit()
 
@@ -293,75 +617,94 @@ class ActivityStore:
         conn.commit()
 
     def merge_buckets(self, source_id: int, target_id: int) -> None:
-        """Move all children of source_id to target_id, then delete source."""
-        conn = self._get_conn()
-        conn.execute("UPDATE focus_tasks SET parent_id = ? WHERE parent_id = ?", (target_id, source_id))
-        conn.execute("DELETE FROM focus_tasks WHERE id = ?", (source_id,))
-        conn.commit()
+        """Move all children of source_id to target_id, then delete source.
+
+        Both steps commit together, so a failure never leaves the children
+        moved with the source bucket still present (or vice versa).
+        """
+        with self.transaction() as conn:
+            conn.execute("UPDATE focus_tasks SET parent_id = ? WHERE parent_id = ?", (target_id, source_id))
+            conn.execute("DELETE FROM focus_tasks WHERE id = ?", (source_id,))
     def get_activities_by_task(self, task_id: int, start: datetime, end: datetime) -> list[ActivityRecord]:
         """Get all auto-tracked activities associated with a specific task."""
-        conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT * FROM activity_logs WHERE active_task_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+        return list(self.iter_activities_by_task(task_id, start, end))
+
+    def iter_activities_by_task(self, task_id: int, start: datetime, end: datetime) -> Iterator[ActivityRecord]:
+        """Yield a task's activities in [start, end) without building a list."""
+        rows = self._iter_tuples(
+            f"SELECT {_ACTIVITY_COLUMNS} FROM activity_logs "
+            "WHERE active_task_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
             (task_id, start.isoformat(), end.isoformat()),
-        ).fetchall()
-        return [self._row_to_activity(r) for r in rows]
+        )
+        return map(self._row_to_activity, rows)
 
     def get_activity_summary_by_task(self, task_id: int, start: datetime, end: datetime, poll_interval: int = 5) -> list[dict]:
-        """Get aggregated activity entries for a task, grouped by app+summary with time totals."""
+        """Get aggregated activity entries for a task, grouped by app+summary with time totals.
+
+        Rows are extended in place, so ``count`` is the number of poll
+        intervals tracked (not rows) and ``last_seen`` is when the latest
+        row's tracked time ends, not when it started.
+        """
         conn = self._get_conn()
         rows = conn.execute(
             """\
-            SELECT app_name, activity_summary, category, sub_category, COUNT(*) as count,
-                   MIN(timestamp) as first_seen, MAX(timestamp) as last_seen
+            SELECT app_name, activity_summary, category, sub_category,
+                   CAST(ROUND(SUM(COALESCE(duration_seconds, :poll)) / :poll) AS INTEGER) AS count,
+                   SUM(COALESCE(duration_seconds, :poll)) AS time_seconds,
+                   MIN(timestamp) AS first_seen,
+                   MAX(strftime('%Y-%m-%dT%H:%M:%f', timestamp,
+                                '+' || COALESCE(duration_seconds, :poll) || ' seconds')) AS last_seen
             FROM activity_logs
-            WHERE active_task_id = ? AND timestamp >= ? AND timestamp < ?
+            WHERE active_task_id = :task AND timestamp >= :start AND timestamp < :end
             GROUP BY app_name, activity_summary
-            ORDER BY count DESC
+            ORDER BY time_seconds DESC
             """,
-            (task_id, start.isoformat(), end.isoformat()),
+            {"poll": poll_interval, "task": task_id,
+             "start": start.isoformat(), "end": end.isoformat()},
         ).fetchall()
         result = []
         for r in rows:
-            result.append({
-                "app_name": r["app_name"],
-                "activity_summary": r["activity_summary"],
-                "category": r["category"],
-                "sub_category": r["sub_category"],
-                "count": r["count"],
-                "time_seconds": r["count"] * poll_interval,
-                "first_seen": r["first_seen"],
-                "last_seen": r["last_seen"],
-            })
+            d = dict(r)
+            # Same isoformat() shape as first_seen
+            d["last_seen"] = datetime.fromisoformat(d["last_seen"]).isoformat()
+            result.append(d)
         return result
 
     # ------------------------------------------------------------------
     # Row mapping helpers
     # ------------------------------------------------------------------
 
+    # init_db() adds any column an older database lacks, so every column
+    # in _ACTIVITY_COLUMNS / _SESSION_COLUMNS is always present.
+
     @staticmethod
-    def _row_to_activity(row: sqlite3.Row) -> ActivityRecord:
+    def _row_to_activity(row: tuple) -> ActivityRecord:
+        (record_id, timestamp, app_name, window_title, category, sub_category,
+         session_id, active_task_id, activity_summary, duration_seconds) = row
         return ActivityRecord(
-            id=row["id"],
-            timestamp=datetime.fromisoformat(row["timestamp"]),
-            app_name=row["app_name"],
-            window_title=row["window_title"],
-            category=row["category"],
-            sub_category=row["sub_category"],
-            session_id=row["session_id"],
-            active_task_id=row["active_task_id"] if "active_task_id" in row.keys() else None,
-            activity_summary=row["activity_summary"] if "activity_summary" in row.keys() else "",
+            id=record_id,
+            timestamp=datetime.fromisoformat(timestamp),
+            app_name=app_name,
+            window_title=window_title,
+            category=category,
+            sub_category=sub_category,
+            session_id=session_id,
+            active_task_id=active_task_id,
+            activity_summary=activity_summary,
+            duration_seconds=duration_seconds,
         )
 
     @staticmethod
-    def _row_to_session(row: sqlite3.Row) -> PomodoroSession:
+    def _row_to_session(row: tuple) -> PomodoroSession:
+        (session_id, category, sub_category, start_time, elapsed_seconds,
+         status, completed_count, active_task_id) = row
         return PomodoroSession(
-            id=row["id"],
-            category=row["category"],
-            sub_category=row["sub_category"],
-            start_time=datetime.fromisoformat(row["start_time"]),
-            elapsed=timedelta(seconds=row["elapsed_seconds"]),
-            status=SessionStatus(row["status"]),
-            completed_count=row["completed_count"],
-            active_task_id=row["active_task_id"] if "active_task_id" in row.keys() else None,
+            id=session_id,
+            category=category,
+            sub_category=sub_category,
+            start_time=datetime.fromisoformat(start_time),
+            elapsed=timedelta(seconds=elapsed_seconds),
+            status=SessionStatus(status),
+            completed_count=completed_count,
+            active_task_id=active_task_id,
         )
@@ -1,15 +1,26 @@
 """Factory for creating the appropriate WindowProvider for the current OS."""
 
 import sys
+from typing import Optional
 
 from flowtrack.platform.base import WindowProvider
 
+# Resolved once at import.  Only the current platform's module is
+# imported, so platform-specific dependencies stay off other OSes.
+_PROVIDER_CLS: Optional[type[WindowProvider]]
+if sys.platform == "darwin":
+    from flowtrack.platform.macos import MacOSWindowProvider as _PROVIDER_CLS
+elif sys.platform == "win32":
+    from flowtrack.platform.windows import WindowsWindowProvider as _PROVIDER_CLS
+else:
+    _PROVIDER_CLS = None
+
 
 def create_window_provider() -> WindowProvider:
-    """Detect the current OS and return the matching WindowProvider.
+    """Return the WindowProvider for the current OS.
 
-    Uses lazy imports so platform-specific modules are only loaded on
-    the OS where they are actually needed.
+    The provider class is picked once when this module is imported;
+    only the module for the running platform is ever loaded.
 
     Returns:
         A concrete WindowProvider for the current platform.
@@ -17,15 +28,9 @@ def create_window_provider() -> WindowProvider:
     Raises:
         OSError: If the current platform is not supported.
     """
-    if sys.platform == "darwin":
-        from flowtrack.platform.macos import MacOSWindowProvider
-        return MacOSWindowProvider()
-
-    if sys.platform == "win32":
-        from flowtrack.platform.windows import WindowsWindowProvider
-        return WindowsWindowProvider()
-
-    raise OSError(
-        f"Unsupported platform: {sys.platform!r}. "
-        "CarrotSummary supports macOS (darwin) and Windows (win32)."
-    )
+    if _PROVIDER_CLS is None:
+        raise OSError(
+            f"Unsupported platform: {sys.platform!r}. "
+            "CarrotSummary supports macOS (darwin) and Windows (win32)."
+        )
+    return _PROVIDER_CLS()
@@ -1,8 +1,14 @@
-"""macOS window provider using AppleScript (osascript) and ioreg."""
+"""macOS window provider using native PyObjC APIs, AppleScript and Quartz/ioreg.
+
+Install the ``macos`` extra (PyObjC) to query the frontmost window and idle
+time in-process; without it the provider shells out to ``osascript`` and
+``ioreg``.
+"""
 
 import logging
 import re
 import subprocess
+import threading
 from typing import Optional
 
 from flowtrack.core.models import WindowInfo
@@ -13,16 +19,118 @@ logger = logging.getLogger(__name__)
 # Default idle threshold in seconds (5 minutes).
 _DEFAULT_IDLE_THRESHOLD = 300
 
+# Seconds an ioreg idle query may take, reading included, before it is killed.
+_IOREG_TIMEOUT = 5
+
+# Returns "<app name>\n<window title>" in one osascript spawn.  The title
+# falls back from the window name to its AXTitle attribute (Electron and
+# Chrome windows often only expose the latter); it is empty if neither works.
+_FRONT_WINDOW_SCRIPT = (
+    'tell application "System Events"\n'
+    '  set fp to first application process whose frontmost is true\n'
+    '  set appName to name of fp\n'
+    '  set winTitle to ""\n'
+    '  try\n'
+    '    set winTitle to name of front window of fp\n'
+    '  end try\n'
+    '  if winTitle is missing value or winTitle is "" then\n'
+    '    try\n'
+    '      set winTitle to value of attribute "AXTitle" of first window of fp\n'
+    '    end try\n'
+    '  end if\n'
+    '  if winTitle is missing value then set winTitle to ""\n'
+    'end tell\n'
+    'return appName & linefeed & winTitle'
+)
+
+
+# Asks the named app itself for its front window's name.
+_ASK_APP_TITLE_SCRIPT = (
+    'tell application "{app_name}"\n'
+    '  if (count of windows) > 0 then\n'
+    '    return name of front window\n'
+    '  end if\n'
+    'end tell'
+)
+
+
+# Matches the HID idle time (nanoseconds) in raw ``ioreg`` output lines.
+_HID_IDLE_RE = re.compile(rb'"HIDIdleTime"\s*=\s*(\d+)')
+
+# AXError returned when the process lacks the Accessibility permission.
+_AX_ERROR_API_DISABLED = -25211
+
+
+def _load_window_api():
+    """Return a callable giving ``(app_name, window_title)``, or None.
+
+    Uses ``NSWorkspace`` for the frontmost app and the Accessibility API
+    (``AXUIElement``) for its focused window title — in-process calls
+    instead of an ``osascript`` spawn.  The callable returns ``None`` when
+    there is no frontmost app; the title is ``None`` when Accessibility
+    access is denied and ``""`` when the app has no titled window.
+    """
+    try:
+        from AppKit import NSWorkspace
+        import ApplicationServices as AS
+    except ImportError:
+        return None
+
+    workspace = NSWorkspace.sharedWorkspace()
+
+    def _front_window() -> Optional[tuple[str, Optional[str]]]:
+        app = workspace.frontmostApplication()
+        if app is None:
+            return None
+        app_name = app.localizedName() or ""
+        ax_app = AS.AXUIElementCreateApplication(app.processIdentifier())
+        err, window = AS.AXUIElementCopyAttributeValue(
+            ax_app, AS.kAXFocusedWindowAttribute, None
+        )
+        if err == _AX_ERROR_API_DISABLED:
+            return app_name, None
+        if err != 0 or window is None:
+            return app_name, ""
+        err, title = AS.AXUIElementCopyAttributeValue(window, AS.kAXTitleAttribute, None)
+        if err == _AX_ERROR_API_DISABLED:
+            return app_name, None
+        return app_name, (str(title) if err == 0 and title else "")
+
+    return _front_window
+
+
+def _load_idle_api():
+    """Return a zero-argument callable giving seconds since last input, or None.
+
+    Uses Quartz's ``CGEventSourceSecondsSinceLastEventType`` (an in-process
+    call) when PyObjC is installed, so idle checks need no ``ioreg`` fork.
+    """
+    try:
+        import Quartz
+    except ImportError:
+        return None
+
+    def _seconds_since_input() -> float:
+        return Quartz.CGEventSourceSecondsSinceLastEventType(
+            Quartz.kCGEventSourceStateCombinedSessionState,
+            Quartz.kCGAnyInputEventType,
+        )
+
+    return _seconds_since_input
+
 
 class MacOSWindowProvider(WindowProvider):
     """Retrieve active window info and idle state on macOS.
 
-    Uses ``osascript`` to run AppleScript commands for window queries
-    and ``ioreg`` to read the HID idle time.
+    Uses ``NSWorkspace``/``AXUIElement`` for the frontmost app and window
+    title when PyObjC is available, falling back to a single ``osascript``
+    call per query, and Quartz (falling back to ``ioreg``) for the idle time.
     """
 
     def __init__(self, idle_threshold: int = _DEFAULT_IDLE_THRESHOLD) -> None:
         self.idle_threshold = idle_threshold
+        self._window_api = _load_window_api()
+        self._idle_api = _load_idle_api()
 
     # ------------------------------------------------------------------
     # WindowProvider interface
@@ -34,14 +142,35 @@ class MacOSWindowProvider(WindowProvider):
         Returns ``None`` when the information cannot be retrieved (e.g.
         no windows open, permission denied, or subprocess error).
         """
-        app_name = self._get_frontmost_app()
-        if app_name is None:
+        if self._window_api is not None:
+            try:
+                native = self._window_api()
+            except Exception as exc:
+                logger.debug("Native window query failed, using AppleScript: %s", exc)
+            else:
+                if native is None:
+                    return None
+                app_name, window_title = native
+                # A None title means Accessibility access is denied; only
+                # then is the AppleScript path worth its subprocess cost.
+                if app_name and window_title is not None:
+                    return WindowInfo(
+                        app_name=app_name, window_title=window_title or app_name
+                    )
+
+        output = self._run_osascript(_FRONT_WINDOW_SCRIPT)
+        if output is None:
+            return None
+
+        app_name, _, window_title = output.partition("\n")
+        app_name = app_name.strip()
+        window_title = window_title.strip()
+        if not app_name:
             return None
 
-        window_title = self._get_window_title()
-        if window_title is None:
-            # Some apps may not expose a window title; use app name.
-            window_title = app_name
+        if not window_title:
+            # Some apps only answer when asked directly; otherwise use app name.
+            window_title = self._ask_app_for_title(app_name) or app_name
 
         return WindowInfo(app_name=app_name, window_title=window_title)
 
@@ -79,83 +208,83 @@ class MacOSWindowProvider(WindowProvider):
             logger.debug("osascript execution failed: %s", exc)
             return None
 
-    def _get_frontmost_app(self) -> Optional[str]:
-        """Return the name of the frontmost application process."""
-        script = (
-            'tell application "System Events" to get name of first '
-            "application process whose frontmost is true"
-        )
-        return self._run_osascript(script)
-
-    def _get_window_title(self) -> Optional[str]:
-        """Return the title of the front window of the frontmost app.
+    def _ask_app_for_title(self, app_name: str) -> Optional[str]:
+        """Ask the app itself for its front window name.
 
-        Tries multiple AppleScript approaches since some apps (Electron,
-        Chrome) don't expose window names through the standard path.
+        Last-resort fallback for apps that expose no window title through
+        System Events; costs one extra ``osascript`` spawn.
         """
-        # Approach 1: Standard System Events window name
-        script1 = (
-            'tell application "System Events" to get name of front window '
-            "of first application process whose frontmost is true"
-        )
-        title = self._run_osascript(script1)
-        if title:
-            return title
-
-        # Approach 2: Get the AXTitle attribute (works for more apps)
-        script2 = (
-            'tell application "System Events"\n'
-            '  set fp to first application process whose frontmost is true\n'
-            '  tell fp\n'
-            '    set w to first window\n'
-            '    return value of attribute "AXTitle" of w\n'
-            '  end tell\n'
-            'end tell'
-        )
-        title = self._run_osascript(script2)
-        if title:
-            return title
-
-        # Approach 3: Ask the app directly for its front window name
-        app_name = self._get_frontmost_app()
-        if app_name:
-            script3 = (
-                f'tell application "{app_name}"\n'
-                f'  if (count of windows) > 0 then\n'
-                f'    return name of front window\n'
-                f'  end if\n'
-                f'end tell'
-            )
-            title = self._run_osascript(script3)
-            if title:
-                return title
-
-        return None
+        return self._run_osascript(_ASK_APP_TITLE_SCRIPT.format(app_name=app_name))
 
     def _get_idle_seconds(self) -> Optional[float]:
-        """Query ``ioreg`` for the HID idle time and return it in seconds.
+        """Return seconds since the last user input event.
 
-        The HID idle time is reported in nanoseconds.  Returns ``None``
-        when the value cannot be determined.
+        Prefers the in-process Quartz API; otherwise queries ``ioreg`` for
+        the HID idle time, which is reported in nanoseconds.  Returns
+        ``None`` when the value cannot be determined.
         """
+        if self._idle_api is not None:
+            try:
+                return float(self._idle_api())
+            except Exception as exc:
+                logger.debug("Quartz idle query failed, falling back to ioreg: %s", exc)
+
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 ["ioreg", "-c", "IOHIDSystem"],
-                capture_output=True,
-                text=True,
-                timeout=5,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
             )
-            if result.returncode != 0:
-                logger.debug("ioreg returned %d", result.returncode)
-                return None
+        except (FileNotFoundError, OSError) as exc:
+            logger.debug("ioreg execution failed: %s", exc)
+            return None
 
-            match = re.search(r'"HIDIdleTime"\s*=\s*(\d+)', result.stdout)
-            if match is None:
-                logger.debug("HIDIdleTime not found in ioreg output")
-                return None
+        # Bound the read as well as the exit: killing a hung ioreg closes
+        # its end of the pipe, which ends the loop below.
+        timed_out = threading.Event()
 
-            nanoseconds = int(match.group(1))
-            return nanoseconds / 1_000_000_000
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as exc:
-            logger.debug("ioreg execution failed: %s", exc)
+        def _expire() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(_IOREG_TIMEOUT, _expire)
+        timer.daemon = True
+        timer.start()
+        match = None
+        try:
+            # Stop reading as soon as the idle time shows up instead of
+            # buffering and decoding the whole registry dump.
+            for line in proc.stdout:
+                if b"HIDIdleTime" in line:
+                    match = _HID_IDLE_RE.search(line)
+                    if match is not None:
+                        break
+        except OSError as exc:
+            logger.debug("Reading ioreg output failed: %s", exc)
+        finally:
+            timer.cancel()
+
+        proc.stdout.close()
+        if timed_out.is_set():
+            proc.wait()
+            logger.debug("ioreg did not respond in time")
+            return None
+        if match is not None:
+            proc.terminate()
+        try:
+            returncode = proc.wait(timeout=_IOREG_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            logger.debug("ioreg did not exit in time")
             return None
+
+        if match is None:
+            if returncode != 0:
+                logger.debug("ioreg returned %d", returncode)
+            else:
+                logger.debug("HIDIdleTime not found in ioreg output")
+            return None
+
+        nanoseconds = int(match.group(1))
+        return nanoseconds / 1_000_000_000
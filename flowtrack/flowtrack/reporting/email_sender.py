@@ -6,12 +6,11 @@ the document locally for manual retrieval.
 """
 
 import logging
+import mimetypes
 import os
 import smtplib
-from email import encoders
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email.message import EmailMessage
+from typing import Optional
 
 from flowtrack.core.models import SmtpConfig
 
@@ -19,10 +18,28 @@ logger = logging.getLogger(__name__)
 
 
 class EmailSender:
-    """Sends emails with .docx attachments using SMTP."""
+    """Sends emails with .docx attachments using SMTP.
+
+    Used as a context manager, one authenticated SMTP connection is shared
+    by every ``send`` inside the ``with`` block; otherwise each ``send``
+    connects, delivers and disconnects on its own.
+    """
 
     def __init__(self, config: SmtpConfig):
         self.config = config
+        self._server: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "EmailSender":
+        self._server = self._connect()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                logger.debug("SMTP quit failed", exc_info=True)
 
     def send(self, to_address: str, subject: str, body: str, attachment_path: str) -> bool:
         """Send an email with the .docx attachment.
@@ -46,35 +63,45 @@ class EmailSender:
 
     def _build_message(
         self, to_address: str, subject: str, body: str, attachment_path: str
-    ) -> MIMEMultipart:
+    ) -> EmailMessage:
         """Construct the MIME message with text body and .docx attachment."""
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg["From"] = self.config.username
         msg["To"] = to_address
         msg["Subject"] = subject
+        msg.set_content(body)
 
-        msg.attach(MIMEText(body, "plain"))
-
-        part = MIMEBase("application", "octet-stream")
-        with open(attachment_path, "rb") as f:
-            part.set_payload(f.read())
-        encoders.encode_base64(part)
         filename = os.path.basename(attachment_path)
-        part.add_header("Content-Disposition", f"attachment; filename={filename}")
-        msg.attach(part)
+        ctype, _ = mimetypes.guess_type(filename)
+        maintype, _, subtype = (ctype or "application/octet-stream").partition("/")
 
+        # Reports are small; the bytes are read once and base64-encoded once
+        with open(attachment_path, "rb") as f:
+            data = f.read()
+        msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=filename)
         return msg
 
-    def _deliver(self, msg: MIMEMultipart, to_address: str) -> None:
-        """Connect to the SMTP server and send the message."""
-        if self.config.use_tls:
-            server = smtplib.SMTP(self.config.server, self.config.port)
-            server.starttls()
-        else:
-            server = smtplib.SMTP(self.config.server, self.config.port)
-
+    def _connect(self) -> smtplib.SMTP:
+        """Open an SMTP connection, upgrade it to TLS if configured, and log in."""
+        server = smtplib.SMTP(self.config.server, self.config.port)
         try:
+            if self.config.use_tls:
+                server.starttls()
             server.login(self.config.username, self.config.password)
-            server.sendmail(self.config.username, to_address, msg.as_string())
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    def _deliver(self, msg: EmailMessage, to_address: str) -> None:
+        """Send the message over the shared connection, or a one-off one."""
+        if self._server is not None:
+            self._server.send_message(msg, self.config.username, [to_address])
+            return
+
+        server = self._connect()
+        try:
+            server.send_message(msg, self.config.username, [to_address])
         finally:
             server.quit()
+
@@ -1,11 +1,10 @@
 """Summary generation for daily and weekly activity reports."""
 
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
 
 from flowtrack.core.models import (
-    ActivityRecord,
     CategorySummary,
     DailySummary,
     PomodoroSession,
@@ -18,9 +17,10 @@ from flowtrack.persistence.store import ActivityStore
 class SummaryGenerator:
     """Produces daily and weekly summaries from persisted activity data.
 
-    Each activity record represents one poll interval of tracked time.
-    The *poll_interval* parameter (default 5 seconds) controls how much
-    time each record contributes.
+    Each activity record carries its own tracked duration; records written
+    before durations were stored represent one poll interval, controlled by
+    the *poll_interval* parameter (default 5 seconds).  Durations are
+    aggregated by the store in SQL; individual activity rows are never loaded.
     """
 
     def __init__(
@@ -43,53 +43,41 @@ class SummaryGenerator:
         start = datetime(target_date.year, target_date.month, target_date.day)
         end = start + timedelta(days=1)
 
-        activities = self.store.get_activities(start, end)
+        durations = self.store.get_category_durations(start, end, self.poll_interval)
         sessions = self.store.get_sessions(start, end)
 
-        return self._build_daily(target_date, activities, sessions)
+        return self._build_daily(target_date, durations, sessions)
 
     def weekly_summary(self, start_date: date) -> WeeklySummary:
         """Build a 7-day summary starting from *start_date*.
 
-        Generates a daily summary for each day, then aggregates category
-        totals across the entire week.
+        Fetches per-day category durations and sessions for the whole week in
+        one query each.  The same rows feed both the daily breakdowns and the
+        week-wide category totals, so nothing is re-aggregated per day.
         """
+        start = datetime(start_date.year, start_date.month, start_date.day)
+        end = start + timedelta(days=7)
+
+        week_rows = self.store.get_daily_category_durations(start, end, self.poll_interval)
+        week_sessions = self.store.get_sessions(start, end)
+
+        durations_by_day: dict[date, list[tuple[str, str, float]]] = defaultdict(list)
+        for day, cat, sub, secs in week_rows:
+            durations_by_day[day].append((cat, sub, secs))
+
+        sessions_by_day: dict[date, list[PomodoroSession]] = defaultdict(list)
+        for sess in week_sessions:
+            sessions_by_day[sess.start_time.date()].append(sess)
+
         daily_breakdowns: list[DailySummary] = []
         for offset in range(7):
             day = start_date + timedelta(days=offset)
-            daily_breakdowns.append(self.daily_summary(day))
-
-        # Aggregate categories across all days
-        cat_map: dict[str, _CatAccumulator] = {}
-        total_time = timedelta()
-        total_sessions = 0
-
-        for ds in daily_breakdowns:
-            total_time += ds.total_time
-            total_sessions += ds.total_sessions
-            for cs in ds.categories:
-                acc = cat_map.setdefault(
-                    cs.category, _CatAccumulator(cs.category)
-                )
-                acc.total_time += cs.total_time
-                acc.completed_sessions += cs.completed_sessions
-                for sub, dur in cs.sub_categories.items():
-                    acc.sub_categories[sub] = (
-                        acc.sub_categories.get(sub, timedelta()) + dur
-                    )
-
-        categories = sorted(
-            (
-                CategorySummary(
-                    category=acc.category,
-                    sub_categories=dict(acc.sub_categories),
-                    total_time=acc.total_time,
-                    completed_sessions=acc.completed_sessions,
-                )
-                for acc in cat_map.values()
-            ),
-            key=lambda c: c.total_time,
-            reverse=True,
+            daily_breakdowns.append(
+                self._build_daily(day, durations_by_day.get(day, []), sessions_by_day.get(day, []))
+            )
+
+        categories, total_seconds = _summarize_categories(
+            ((cat, sub, secs) for _, cat, sub, secs in week_rows), week_sessions
         )
 
         end_date = start_date + timedelta(days=6)
@@ -98,8 +86,8 @@ class SummaryGenerator:
             end_date=end_date,
             daily_breakdowns=daily_breakdowns,
             categories=categories,
-            total_time=total_time,
-            total_sessions=total_sessions,
+            total_time=timedelta(seconds=total_seconds),
+            total_sessions=sum(c.completed_sessions for c in categories),
         )
 
     # ------------------------------------------------------------------
@@ -109,61 +97,62 @@ class SummaryGenerator:
     def _build_daily(
         self,
         target_date: date,
-        activities: list[ActivityRecord],
+        category_durations: Iterable[tuple[str, str, float]],
         sessions: list[PomodoroSession],
     ) -> DailySummary:
-        """Aggregate activities and sessions into a single-day summary."""
-        interval = timedelta(seconds=self.poll_interval)
-
-        # --- time per (category, sub_category) ---
-        time_map: dict[str, dict[str, timedelta]] = defaultdict(
-            lambda: defaultdict(timedelta)
-        )
-        for act in activities:
-            time_map[act.category][act.sub_category] += interval
-
-        # --- completed sessions per category ---
-        session_counts: dict[str, int] = defaultdict(int)
-        for sess in sessions:
-            if sess.status == SessionStatus.COMPLETED:
-                session_counts[sess.category] += sess.completed_count
-
-        # Merge into CategorySummary list
-        all_cats = set(time_map.keys()) | set(session_counts.keys())
-        summaries: list[CategorySummary] = []
-        for cat in all_cats:
-            sub_cats = dict(time_map.get(cat, {}))
-            total_time = sum(sub_cats.values(), timedelta())
-            summaries.append(
-                CategorySummary(
-                    category=cat,
-                    sub_categories=sub_cats,
-                    total_time=total_time,
-                    completed_sessions=session_counts.get(cat, 0),
-                )
-            )
-
-        # Sort by total_time descending
-        summaries.sort(key=lambda c: c.total_time, reverse=True)
-
-        total_time = sum((c.total_time for c in summaries), timedelta())
-        total_sessions = sum(c.completed_sessions for c in summaries)
+        """Aggregate grouped activity durations and sessions into a single-day summary.
 
+        *category_durations* holds ``(category, sub_category, seconds)``
+        tuples as returned by :meth:`ActivityStore.get_category_durations`.
+        """
+        summaries, total_seconds = _summarize_categories(category_durations, sessions)
         return DailySummary(
             date=target_date,
             categories=summaries,
-            total_time=total_time,
-            total_sessions=total_sessions,
+            total_time=timedelta(seconds=total_seconds),
+            total_sessions=sum(c.completed_sessions for c in summaries),
         )
 
 
-class _CatAccumulator:
-    """Mutable helper for aggregating category data across days."""
+def _summarize_categories(
+    category_durations: Iterable[tuple[str, str, float]],
+    sessions: Iterable[PomodoroSession],
+) -> tuple[list[CategorySummary], float]:
+    """Fold grouped durations and sessions into per-category summaries.
 
-    __slots__ = ("category", "sub_categories", "total_time", "completed_sessions")
+    *category_durations* may repeat a ``(category, sub_category)`` pair
+    (e.g. once per day); its seconds are summed.  Returns the summaries
+    sorted by total time descending, plus the total tracked seconds.
+    Seconds are converted to ``timedelta`` once per entry at the end.
+    """
+    # --- tracked seconds per (category, sub_category) ---
+    cat_seconds: Counter[str] = Counter()
+    sub_seconds: dict[str, Counter[str]] = defaultdict(Counter)
+    for cat, sub, secs in category_durations:
+        cat_seconds[cat] += secs
+        sub_seconds[cat][sub] += secs
+
+    # --- completed sessions per category ---
+    session_counts: dict[str, int] = defaultdict(int)
+    for sess in sessions:
+        if sess.status == SessionStatus.COMPLETED:
+            session_counts[sess.category] += sess.completed_count
+
+    # Merge into CategorySummary list
+    all_cats = set(cat_seconds) | set(session_counts)
+    summaries: list[CategorySummary] = [
+        CategorySummary(
+            category=cat,
+            sub_categories={
+                sub: timedelta(seconds=secs)
+                for sub, secs in sub_seconds.get(cat, {}).items()
+            },
+            total_time=timedelta(seconds=cat_seconds[cat]),
+            completed_sessions=session_counts.get(cat, 0),
+        )
+        for cat in all_cats
+    ]
 
-    def __init__(self, category: str) -> None:
-        self.category = category
-        self.sub_categories: dict[str, timedelta] = {}
-        self.total_time = timedelta()
-        self.completed_sessions = 0
+    # Sort by total_time descending
+    summaries.sort(key=lambda c: c.total_time, reverse=True)
+    return summaries, cat_seconds.total()
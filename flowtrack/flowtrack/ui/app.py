@@ -5,6 +5,7 @@ tracking, viewing summaries, opening settings, and quitting. The Tracker
 runs in a daemon background thread so the tray icon remains responsive.
 """
 
+import copy
 import logging
 import os
 import sys
@@ -61,6 +62,8 @@ class CarrotSummaryApp:
         self._store: Optional[ActivityStore] = None
         self._summary_generator: Optional[SummaryGenerator] = None
         self._pomodoro_manager: Optional[PomodoroManager] = None
+        # Rule sections the running tracker was last built from
+        self._applied_rule_sections: dict[str, Any] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -94,6 +97,8 @@ class CarrotSummaryApp:
             return
 
         try:
+            if self.tracker is not None:
+                self.tracker.flush()  # include writes still queued
             summary = self._summary_generator.daily_summary(date.today())
             text = TextFormatter.format_daily(summary)
             self._show_popup("Daily Summary", text)
@@ -107,6 +112,8 @@ class CarrotSummaryApp:
             return
 
         try:
+            if self.tracker is not None:
+                self.tracker.flush()  # include writes still queued
             start_date = date.today() - timedelta(days=date.today().weekday())
             summary = self._summary_generator.weekly_summary(start_date)
             text = TextFormatter.format_weekly(summary)
@@ -222,6 +229,10 @@ class CarrotSummaryApp:
             for r in raw_ctx
         ]
         context_analyzer = ContextAnalyzer(ctx_rules)
+        self._applied_rule_sections = {
+            "classification_rules": copy.deepcopy(raw_rules),
+            "context_rules": copy.deepcopy(raw_ctx),
+        }
 
         # Pomodoro Manager
         debounce = config.get("debounce_threshold_seconds", 30)
@@ -357,11 +368,15 @@ class CarrotSummaryApp:
     # ------------------------------------------------------------------
 
     def _apply_config_changes(self) -> None:
-        """Apply updated config to running components without restart."""
+        """Apply updated config to running components without restart.
+
+        Rule sections are only recompiled when they actually changed, so
+        saving an unrelated setting keeps the classifier and analyzer caches.
+        """
         config = self.config
 
         # Update classifier rules
-        if self.tracker is not None:
+        if self.tracker is not None and self._rule_section_changed("classification_rules"):
             raw_rules = config.get("classification_rules", [])
             self.tracker.classifier.rules = [
                 ClassificationRule(
@@ -372,7 +387,8 @@ class CarrotSummaryApp:
                 for r in raw_rules
             ]
 
-            # Update context analyzer rules
+        # Update context analyzer rules
+        if self.tracker is not None and self._rule_section_changed("context_rules"):
             raw_ctx = config.get("context_rules", [])
             self.tracker.context_analyzer.rules = [
                 ContextRule(
@@ -397,6 +413,14 @@ class CarrotSummaryApp:
                 pending["category"], pending["sub_category"], datetime.now()
             )
 
+    def _rule_section_changed(self, key: str) -> bool:
+        """Return True (and remember the new value) if config[*key*] changed."""
+        current = self.config.get(key, [])
+        if self._applied_rule_sections.get(key) == current:
+            return False
+        self._applied_rule_sections[key] = copy.deepcopy(current)
+        return True
+
     # ------------------------------------------------------------------
     # UI helpers
     # ------------------------------------------------------------------
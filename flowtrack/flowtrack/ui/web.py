@@ -92,6 +92,7 @@ def create_flask_app() -> Flask:
         from flowtrack.reporting.formatter import TextFormatter
         date_str = request.args.get("date")
         target = date.fromisoformat(date_str) if date_str else date.today()
+        _flush_tracker()
         s = _app_ref._summary_generator.daily_summary(target)
         cats = _build_category_response(s.categories, TextFormatter)
         return jsonify({
@@ -113,6 +114,7 @@ def create_flask_app() -> Flask:
             return jsonify({"error": "start and end required"}), 400
         start_d = date.fromisoformat(start_str)
         end_d = date.fromisoformat(end_str)
+        _flush_tracker()
         days = []
         d = start_d
         while d <= end_d:
@@ -144,6 +146,7 @@ def create_flask_app() -> Flask:
         month = int(request.args.get("month", date.today().month))
         from calendar import monthrange
         _, num_days = monthrange(year, month)
+        _flush_tracker()
         day_totals = {}
         for day_num in range(1, num_days + 1):
             d = date(year, month, day_num)
@@ -151,11 +154,14 @@ def create_flask_app() -> Flask:
                 break
             start_dt = datetime(year, month, day_num)
             end_dt = start_dt + timedelta(days=1)
-            count = len(_app_ref._store.get_activities(start_dt, end_dt))
-            if count > 0:
-                from flowtrack.reporting.formatter import TextFormatter
-                poll = _app_ref.config.get("poll_interval_seconds", 5)
-                minutes = (count * poll) // 60
+            poll = _app_ref.config.get("poll_interval_seconds", 5)
+            seconds = sum(
+                secs for _cat, _sub, secs in
+                _app_ref._store.get_category_durations(start_dt, end_dt, poll)
+            )
+            if seconds > 0:
+                count = int(seconds // poll)
+                minutes = int(seconds // 60)
                 day_totals[str(d)] = {"count": count, "minutes": minutes}
         return jsonify({"year": year, "month": month, "days": day_totals})
 
@@ -248,6 +254,7 @@ def create_flask_app() -> Flask:
             _app_ref._store.clear_auto_todos()  # Only auto-generated buckets/tasks, not manual Focus ones
             if _app_ref.tracker:
                 _app_ref.tracker._seen_contexts.clear()
+                _app_ref.tracker.forget_last_activity()
         return jsonify({"ok": True})
 
     @app.route("/api/todos/merge", methods=["POST"])
@@ -390,7 +397,7 @@ def create_flask_app() -> Flask:
         return jsonify({
             "enabled": _app_ref.tracker.debug_mode,
             "ml_enabled": _app_ref.tracker.ml_enabled,
-            "log": _app_ref.tracker._debug_log[-50:],  # last 50 entries
+            "log": list(_app_ref.tracker._debug_log)[-50:],  # last 50 entries
         })
 
     @app.route("/api/debug", methods=["POST"])
@@ -486,8 +493,9 @@ def create_flask_app() -> Flask:
         poll = _app_ref.config.get("poll_interval_seconds", 5)
 
         # Get all todos and all activities for the day
+        _flush_tracker()
         todos = _app_ref._store.get_todos(include_done=True)
-        all_activities = _app_ref._store.get_activities(start_dt, end_dt)
+        all_activities = _app_ref._store.iter_activities(start_dt, end_dt)
 
         # Build parent (high-level) and child (low-level) maps
         parents = [t for t in todos if not t.get("parent_id")]
@@ -515,7 +523,7 @@ def create_flask_app() -> Flask:
             parent_total_sec = 0
             for child in children:
                 acts = task_activities.get(child["id"], [])
-                child_total_sec = len(acts) * poll
+                child_total_sec = _total_seconds(acts, poll)
                 parent_total_sec += child_total_sec
                 # Aggregate activities by app+summary
                 agg = _aggregate_activities(acts, poll)
@@ -536,7 +544,7 @@ def create_flask_app() -> Flask:
             })
 
         # Unassigned activities
-        unassigned_total = len(unassigned) * poll
+        unassigned_total = _total_seconds(unassigned, poll)
         unassigned_agg = _aggregate_activities(unassigned, poll)
 
         return jsonify({
@@ -568,6 +576,20 @@ def start_dashboard(app_ref, port: int = 5555) -> threading.Thread:
 
 
 
+def _flush_tracker():
+    """Commit held and queued activity writes so readers see current time."""
+    if _app_ref.tracker is not None:
+        _app_ref.tracker.flush()
+
+
+def _total_seconds(activities, poll_interval):
+    """Sum tracked seconds; rows without a stored duration count as one poll."""
+    return sum(
+        a.duration_seconds if a.duration_seconds is not None else poll_interval
+        for a in activities
+    )
+
+
 def _aggregate_activities(activities, poll_interval):
     """Aggregate a list of ActivityRecord objects by app_name + activity_summary.
 
@@ -588,18 +610,22 @@ def _aggregate_activities(activities, poll_interval):
     for act in activities:
         raw_summary = act.activity_summary or act.sub_category
         norm_key = (_normalize(act.app_name), _normalize(raw_summary))
+        seconds = act.duration_seconds if act.duration_seconds is not None else poll_interval
+        # A row covers [timestamp, timestamp + duration): extended rows
+        # can span far past their start
+        end_ts = act.timestamp + timedelta(seconds=seconds)
         if norm_key not in agg:
             agg[norm_key] = {"app_name": act.app_name, "summary": raw_summary,
-                             "category": act.category, "count": 0,
-                             "first_ts": act.timestamp, "last_ts": act.timestamp}
-        agg[norm_key]["count"] += 1
+                             "category": act.category, "seconds": 0,
+                             "first_ts": act.timestamp, "last_ts": end_ts}
+        agg[norm_key]["seconds"] += seconds
         if act.timestamp < agg[norm_key]["first_ts"]:
             agg[norm_key]["first_ts"] = act.timestamp
-        if act.timestamp > agg[norm_key]["last_ts"]:
-            agg[norm_key]["last_ts"] = act.timestamp
+        if end_ts > agg[norm_key]["last_ts"]:
+            agg[norm_key]["last_ts"] = end_ts
     result = []
-    for _key, data in sorted(agg.items(), key=lambda x: x[1]["count"], reverse=True):
-        sec = data["count"] * poll_interval
+    for _key, data in sorted(agg.items(), key=lambda x: x[1]["seconds"], reverse=True):
+        sec = data["seconds"]
         result.append({
             "app_name": data["app_name"],
             "summary": data["summary"],
@@ -281,6 +281,22 @@ class TestConfigReload:
         if app._store:
             app._store.close()
 
+    @patch("flowtrack.ui.app.create_window_provider")
+    def test_apply_keeps_rules_when_sections_unchanged(self, mock_factory, app):
+        """Saving unrelated settings does not recompile rules or drop caches."""
+        mock_factory.return_value = MagicMock()
+        app._init_components()
+        classifier_rules = app.tracker.classifier.rules
+        context_rules = app.tracker.context_analyzer.rules
+
+        app.config["debounce_threshold_seconds"] = 45
+        app._apply_config_changes()
+
+        assert app.tracker.classifier.rules is classifier_rules
+        assert app.tracker.context_analyzer.rules is context_rules
+        if app._store:
+            app._store.close()
+
     def test_apply_updates_debounce(self, app):
         """_apply_config_changes updates the pomodoro debounce threshold."""
         app._init_components()
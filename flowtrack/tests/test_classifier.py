@@ -139,6 +139,70 @@ def test_classify_app_or_title_either_matches():
     assert c.classify("SomeEditor", "main.py") == "Development"
 
 
+def test_classify_mixed_inline_flags_in_one_rule():
+    """Patterns with and without leading inline flags combine correctly."""
+    rules = [
+        ClassificationRule(
+            app_patterns=[],
+            title_patterns=[r"(?i)\binbox\b", r"Compose", r"(?i)reply"],
+            category="Email",
+        ),
+    ]
+    c = Classifier(rules)
+    assert c.classify("App", "INBOX (3)") == "Email"
+    assert c.classify("App", "Compose") == "Email"
+    assert c.classify("App", "compose") == "Other"
+    assert c.classify("App", "RE: Reply") == "Email"
+
+
+def test_reassigning_rules_recompiles_patterns():
+    c = Classifier(_make_rules())
+    assert c.classify("Slack", "general") == "Other"
+    c.rules = [
+        ClassificationRule(app_patterns=["Slack"], title_patterns=[], category="Chat"),
+    ]
+    assert c.classify("Slack", "general") == "Chat"
+    assert c.classify("Microsoft Word", "Report.docx") == "Other"
+
+
+def test_literal_app_match_still_respects_earlier_rules():
+    rules = [
+        ClassificationRule(app_patterns=[], title_patterns=[r"(?i)\binbox\b"], category="Email"),
+        ClassificationRule(app_patterns=["Slack"], title_patterns=[], category="Chat"),
+        ClassificationRule(app_patterns=["Slack"], title_patterns=[], category="Later"),
+    ]
+    c = Classifier(rules)
+    assert c._literal_app_index == {"Slack": 1}
+    assert c.classify("Slack", "general") == "Chat"
+    assert c.classify("Slack", "Inbox") == "Email"
+
+
+def test_regex_app_patterns_are_not_indexed():
+    rules = [
+        ClassificationRule(app_patterns=["Chrom.*", "Code"], title_patterns=[], category="Dev"),
+    ]
+    c = Classifier(rules)
+    assert c._literal_app_index == {"Code": 0}
+    assert c.classify("Chromium", "x") == "Dev"
+    assert c.classify("Xcode", "x") == "Other"
+
+
+def test_classify_memoizes_repeat_lookups():
+    c = Classifier(_make_rules())
+    assert c.classify("Chrome", "page") == "Research & Browsing"
+    assert c.classify("Chrome", "page") == "Research & Browsing"
+    info = c._classify_cached.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+def test_cache_clear_discards_results():
+    c = Classifier(_make_rules())
+    c.classify("Chrome", "page")
+    c.cache_clear()
+    assert c._classify_cached.cache_info().currsize == 0
+
+
 # ------------------------------------------------------------------
 # load_rules / save_rules — JSON round-trip
 # ------------------------------------------------------------------
@@ -1,8 +1,10 @@
 """Unit tests for the configuration loader."""
 
 import json
+import os
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 
 from flowtrack.core.config import (
     get_data_directory,
@@ -17,6 +19,16 @@ from flowtrack.core.config import (
 # get_data_directory
 # ------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _clear_path_caches():
+    """Platform paths are memoized; recompute them for each test."""
+    get_data_directory.cache_clear()
+    get_default_config_path.cache_clear()
+    yield
+    get_data_directory.cache_clear()
+    get_default_config_path.cache_clear()
+
+
 def test_get_data_directory_returns_path():
     result = get_data_directory()
     assert isinstance(result, Path)
@@ -43,10 +55,35 @@ def test_get_data_directory_windows_no_appdata(monkeypatch):
     assert result == Path.home() / "AppData" / "Roaming" / "CarrotSummary"
 
 
-def test_get_data_directory_linux(monkeypatch):
+def test_get_data_directory_is_cached(monkeypatch):
+    first = get_data_directory()
+    monkeypatch.setattr("flowtrack.core.config.sys.platform", "win32")
+    assert get_data_directory() is first
+
+
+def test_get_data_directory_linux(monkeypatch, tmp_path):
+    monkeypatch.setattr("flowtrack.core.config.sys.platform", "linux")
+    monkeypatch.setattr("flowtrack.core.config.Path.home", lambda: tmp_path)
+    monkeypatch.delenv("XDG_DATA_HOME", raising=False)
+    result = get_data_directory()
+    assert result == tmp_path / ".local" / "share" / "CarrotSummary"
+
+
+def test_get_data_directory_linux_xdg(monkeypatch, tmp_path):
+    monkeypatch.setattr("flowtrack.core.config.sys.platform", "linux")
+    monkeypatch.setattr("flowtrack.core.config.Path.home", lambda: tmp_path)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+    result = get_data_directory()
+    assert result == tmp_path / "xdg" / "CarrotSummary"
+
+
+def test_get_data_directory_linux_keeps_legacy_dir(monkeypatch, tmp_path):
     monkeypatch.setattr("flowtrack.core.config.sys.platform", "linux")
+    monkeypatch.setattr("flowtrack.core.config.Path.home", lambda: tmp_path)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+    (tmp_path / ".carrotsummary").mkdir()
     result = get_data_directory()
-    assert result == Path.home() / ".carrotsummary"
+    assert result == tmp_path / ".carrotsummary"
 
 
 # ------------------------------------------------------------------
@@ -93,6 +130,15 @@ def test_save_and_load_round_trip(tmp_path):
     assert loaded == original
 
 
+def test_round_trip_without_orjson(tmp_path, monkeypatch):
+    monkeypatch.setattr("flowtrack.core.config.orjson", None)
+    cfg_path = tmp_path / "config.json"
+    original = {"user_name": "Zoë", "nested": {"values": [1, 2]}}
+    save_config(original, cfg_path)
+    assert cfg_path.read_text(encoding="utf-8").endswith("}\n")
+    assert load_config(cfg_path) == original
+
+
 def test_save_creates_parent_directories(tmp_path):
     cfg_path = tmp_path / "nested" / "deep" / "config.json"
     save_config({"key": "value"}, cfg_path)
@@ -166,3 +212,59 @@ def test_load_preserves_custom_values(tmp_path):
     loaded = load_config(cfg_path)
     assert loaded["poll_interval_seconds"] == 10
     assert loaded["custom_key"] == "hello"
+
+
+# ------------------------------------------------------------------
+# load_config — caching
+# ------------------------------------------------------------------
+
+def test_load_reuses_parsed_config(tmp_path):
+    cfg_path = tmp_path / "config.json"
+    save_config({"version": 1}, cfg_path)
+    first = load_config(cfg_path)
+    with patch("flowtrack.core.config._loads") as mock_load:
+        second = load_config(cfg_path)
+    mock_load.assert_not_called()
+    assert second == first
+
+
+def test_unsaved_edits_do_not_leak_into_later_loads(tmp_path):
+    cfg_path = tmp_path / "config.json"
+    save_config({"version": 1, "nested": {"items": [1]}}, cfg_path)
+    first = load_config(cfg_path)
+    first["_pending_manual_task"] = "scratch"
+    first["nested"]["items"].append(2)
+
+    second = load_config(cfg_path)
+    assert "_pending_manual_task" not in second
+    assert second["nested"]["items"] == [1]
+    assert second is not first
+
+
+def test_load_rereads_after_external_edit(tmp_path):
+    cfg_path = tmp_path / "config.json"
+    save_config({"version": 1}, cfg_path)
+    load_config(cfg_path)
+    cfg_path.write_text('{"version": 2}', encoding="utf-8")
+    os.utime(cfg_path, ns=(0, cfg_path.stat().st_mtime_ns + 1_000_000))
+    assert load_config(cfg_path)["version"] == 2
+
+
+# ------------------------------------------------------------------
+# save_config — atomic, skipped when unchanged
+# ------------------------------------------------------------------
+
+def test_save_leaves_no_temp_file(tmp_path):
+    cfg_path = tmp_path / "config.json"
+    save_config({"version": 1}, cfg_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+
+def test_save_skips_write_when_unchanged(tmp_path):
+    cfg_path = tmp_path / "config.json"
+    save_config({"version": 1}, cfg_path)
+    with patch("flowtrack.core.config.os.replace") as mock_replace:
+        save_config({"version": 1}, cfg_path)
+        mock_replace.assert_not_called()
+        save_config({"version": 2}, cfg_path)
+        mock_replace.assert_called_once()
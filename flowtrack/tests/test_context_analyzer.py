@@ -1,9 +1,17 @@
 """Unit tests for the ContextAnalyzer."""
 
+import dataclasses
+from unittest.mock import patch
+
 import pytest
 
 from flowtrack.core.models import ContextResult, ContextRule
-from flowtrack.core.context_analyzer import ContextAnalyzer
+from flowtrack.core.context_analyzer import (
+    _SMART_ANY_BY_CATEGORY,
+    _SMART_BY_CATEGORY,
+    ContextAnalyzer,
+    _clean_title,
+)
 
 
 # ------------------------------------------------------------------
@@ -103,6 +111,16 @@ def test_fallback_with_empty_strings():
     assert result.context_label == "Other"
 
 
+def test_blank_title_skips_title_parsing():
+    analyzer = ContextAnalyzer(_make_rules())
+    with patch("flowtrack.core.context_analyzer._smart_parse") as mock_parse, \
+            patch("flowtrack.core.context_analyzer._match_summary") as mock_summary:
+        result = analyzer.analyze("Finder", "   ", "Document Editing")
+    mock_parse.assert_not_called()
+    mock_summary.assert_not_called()
+    assert result == ContextResult("Document Editing", "Document Editing", "Document Editing", "Finder")
+
+
 # ------------------------------------------------------------------
 # analyze — only rules for the matching category are considered
 # ------------------------------------------------------------------
@@ -189,6 +207,18 @@ def test_no_named_groups_label_is_sub_category():
     assert result.context_label == "Email Inbox"
 
 
+@pytest.mark.parametrize("pattern, title, expected", [
+    (r"(?P<ticket>[A-Z]+-\d+)", "ABC-12 fix login", "Ticket: ABC-12"),
+    (r"(?P<ticket>[A-Z]+-\d+)(?P<extra>!)?", "ABC-12 fix login", "Ticket: ABC-12"),
+    (r"(?P<ticket>XYZ-\d+)?review", "review ABC-12", "Ticket"),
+    (r"([A-Z]+-\d+)", "ABC-12 fix login", "Ticket"),
+])
+def test_label_from_single_named_group(pattern, title, expected):
+    rules = [ContextRule(category="PM", title_patterns=[pattern], sub_category="Ticket")]
+    analyzer = ContextAnalyzer(rules)
+    assert analyzer.analyze("Jira", title, "PM").context_label == expected
+
+
 # ------------------------------------------------------------------
 # analyze — case insensitivity via regex flags
 # ------------------------------------------------------------------
@@ -221,6 +251,17 @@ def test_invalid_regex_skipped():
     assert result.sub_category == "Python Dev"
 
 
+def test_invalid_regex_logged_once_at_construction(caplog):
+    rules = [ContextRule(category="Dev", title_patterns=["[invalid"], sub_category="Bad Rule")]
+    with caplog.at_level("WARNING"):
+        analyzer = ContextAnalyzer(rules)
+    assert "[invalid" in caplog.text
+    caplog.clear()
+    with caplog.at_level("WARNING"):
+        analyzer.analyze("VSCode", "python project", "Dev")
+    assert caplog.text == ""
+
+
 # ------------------------------------------------------------------
 # analyze — multiple title patterns in a single rule
 # ------------------------------------------------------------------
@@ -387,3 +428,69 @@ class TestActivitySummary:
         long_title = "A" * 200 + " - Google Chrome"
         result = self.analyzer.analyze("Chrome", long_title, "Research & Browsing")
         assert len(result.activity_summary) <= 103  # 100 + "..."
+
+
+# ------------------------------------------------------------------
+# _clean_title
+# ------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        ("Quarterly Plan - Google Docs", "Quarterly Plan"),
+        ("main.py — VS Code", "main.py"),
+        ("Roadmap - Notion - Arc", "Roadmap"),
+        ("banner.psd - adobe photoshop", "banner.psd"),
+        ("Codes of Conduct", "Codes of Conduct"),
+    ],
+)
+def test_clean_title_strips_app_suffixes(title, expected):
+    assert _clean_title(title) == expected
+
+
+# ------------------------------------------------------------------
+# analyze — memoization
+# ------------------------------------------------------------------
+
+def test_analyze_memoizes_repeat_lookups():
+    analyzer = ContextAnalyzer(_make_rules())
+    first = analyzer.analyze("Word", "Smith Contract.docx", "Document Editing")
+    second = analyzer.analyze("Word", "Smith Contract.docx", "Document Editing")
+    assert first is second
+    assert analyzer._analyze_cached.cache_info().hits == 1
+
+
+def test_reassigning_rules_discards_memoized_results():
+    analyzer = ContextAnalyzer([])
+    before = analyzer.analyze("Word", "Smith Contract.docx", "Document Editing")
+    analyzer.rules = _make_rules()
+    after = analyzer.analyze("Word", "Smith Contract.docx", "Document Editing")
+    assert after.sub_category == "Contract Draft"
+    assert before.sub_category != after.sub_category
+
+
+def test_memoized_results_are_immutable():
+    analyzer = ContextAnalyzer(_make_rules())
+    result = analyzer.analyze("Word", "Smith Contract.docx", "Document Editing")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.activity_summary = "changed"
+    assert hash(result) == hash(analyzer.analyze("Word", "Smith Contract.docx", "Document Editing"))
+
+
+def test_smart_label_keeps_braces_from_title():
+    analyzer = ContextAnalyzer([])
+    result = analyzer.analyze("Google Docs", "Fix {config} loader - Google Docs", "Document Editing")
+    assert result.sub_category == "Writing: Fix {config} loader"
+    assert result.activity_summary == "edited Fix {config} loader"
+
+
+@pytest.mark.parametrize("title", [
+    "", "Inbox", "RE: Budget - bob@example.com - Outlook", "Standup - Zoom",
+    "Roadmap - Google Docs", "notes.md", "Q3.xlsx", "deck.PPTX",
+    "main.py - flowtrack", "Python docs - Google Chrome", "general - Slack",
+    "PROJ-1 login bug - Jira", "Logo - Figma", "just some window",
+])
+def test_fused_smart_gate_agrees_with_individual_patterns(title):
+    for category, entries in _SMART_BY_CATEGORY.items():
+        any_match = any(p.search(title) for _, patterns in entries for p in patterns)
+        assert bool(_SMART_ANY_BY_CATEGORY[category].search(title)) == any_match
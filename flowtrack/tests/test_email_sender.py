@@ -1,5 +1,7 @@
 """Tests for the EmailSender class."""
 
+import email
+import email.policy
 import os
 import smtplib
 from unittest.mock import MagicMock, patch
@@ -82,17 +84,17 @@ class TestEmailSenderSuccess:
         mock_server.login.assert_called_once_with("user@example.com", "secret")
 
     @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
-    def test_smtp_sendmail_called_with_correct_addresses(self, mock_smtp_cls, smtp_config, docx_file):
+    def test_smtp_send_message_called_with_correct_addresses(self, mock_smtp_cls, smtp_config, docx_file):
         mock_server = MagicMock()
         mock_smtp_cls.return_value = mock_server
 
         sender = EmailSender(smtp_config)
         sender.send("recipient@example.com", "Subject", "Body", docx_file)
 
-        mock_server.sendmail.assert_called_once()
-        args = mock_server.sendmail.call_args[0]
-        assert args[0] == "user@example.com"
-        assert args[1] == "recipient@example.com"
+        mock_server.send_message.assert_called_once()
+        args = mock_server.send_message.call_args[0]
+        assert args[1] == "user@example.com"
+        assert args[2] == ["recipient@example.com"]
 
     @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
     def test_smtp_quit_called(self, mock_smtp_cls, smtp_config, docx_file):
@@ -112,9 +114,9 @@ class TestEmailSenderSuccess:
         sender = EmailSender(smtp_config)
         sender.send("recipient@example.com", "Weekly Report", "Here is your report.", docx_file)
 
-        raw_msg = mock_server.sendmail.call_args[0][2]
-        assert "Weekly Report" in raw_msg
-        assert "Here is your report." in raw_msg
+        msg = mock_server.send_message.call_args[0][0]
+        assert msg["Subject"] == "Weekly Report"
+        assert msg.get_body().get_content().strip() == "Here is your report."
 
     @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
     def test_message_contains_attachment_filename(self, mock_smtp_cls, smtp_config, docx_file):
@@ -124,8 +126,47 @@ class TestEmailSenderSuccess:
         sender = EmailSender(smtp_config)
         sender.send("recipient@example.com", "Subject", "Body", docx_file)
 
-        raw_msg = mock_server.sendmail.call_args[0][2]
-        assert "report.docx" in raw_msg
+        msg = mock_server.send_message.call_args[0][0]
+        attachments = list(msg.iter_attachments())
+        assert len(attachments) == 1
+        assert attachments[0].get_filename() == "report.docx"
+
+    @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
+    def test_encoded_wire_payload_round_trips(self, mock_smtp_cls, smtp_config, tmp_path):
+        """The flattened message, as SMTP sends it, decodes back to the file."""
+        content = os.urandom(10_000)
+        path = tmp_path / "report.docx"
+        path.write_bytes(content)
+        mock_server = MagicMock()
+        mock_smtp_cls.return_value = mock_server
+
+        sender = EmailSender(smtp_config)
+        sender.send("recipient@example.com", "Subject", "Body", str(path))
+
+        wire = mock_server.send_message.call_args[0][0].as_bytes()
+        parsed = email.message_from_bytes(wire, policy=email.policy.default)
+        attachment = next(parsed.iter_attachments())
+        assert attachment["Content-Transfer-Encoding"] == "base64"
+        assert attachment.get_filename() == "report.docx"
+        assert attachment.get_content() == content
+
+    @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
+    def test_attachment_round_trips(self, mock_smtp_cls, smtp_config, tmp_path):
+        content = os.urandom(100_000)
+        path = tmp_path / "big.docx"
+        path.write_bytes(content)
+        mock_server = MagicMock()
+        mock_smtp_cls.return_value = mock_server
+
+        sender = EmailSender(smtp_config)
+        sender.send("recipient@example.com", "Subject", "Body", str(path))
+
+        msg = mock_server.send_message.call_args[0][0]
+        attachment = next(msg.iter_attachments())
+        assert attachment.get_content_type() == (
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )
+        assert attachment.get_payload(decode=True) == content
 
     @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
     def test_smtp_connects_to_configured_server_and_port(self, mock_smtp_cls, smtp_config, docx_file):
@@ -162,7 +203,7 @@ class TestEmailSenderFailure:
     def test_send_failure_returns_false(self, mock_smtp_cls, smtp_config, docx_file):
         mock_server = MagicMock()
         mock_smtp_cls.return_value = mock_server
-        mock_server.sendmail.side_effect = smtplib.SMTPException("Send failed")
+        mock_server.send_message.side_effect = smtplib.SMTPException("Send failed")
 
         sender = EmailSender(smtp_config)
         result = sender.send("recipient@example.com", "Subject", "Body", docx_file)
@@ -197,12 +238,52 @@ class TestEmailSenderFailure:
         assert result is False
 
     @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
-    def test_quit_called_even_on_sendmail_failure(self, mock_smtp_cls, smtp_config, docx_file):
+    def test_quit_called_even_on_send_failure(self, mock_smtp_cls, smtp_config, docx_file):
         mock_server = MagicMock()
         mock_smtp_cls.return_value = mock_server
-        mock_server.sendmail.side_effect = smtplib.SMTPException("Send failed")
+        mock_server.send_message.side_effect = smtplib.SMTPException("Send failed")
 
         sender = EmailSender(smtp_config)
         sender.send("recipient@example.com", "Subject", "Body", docx_file)
 
         mock_server.quit.assert_called_once()
+
+
+class TestEmailSenderConnectionReuse:
+    """Tests for sharing one SMTP connection across sends."""
+
+    @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
+    def test_context_manager_reuses_connection(self, mock_smtp_cls, smtp_config, docx_file):
+        mock_server = MagicMock()
+        mock_smtp_cls.return_value = mock_server
+
+        with EmailSender(smtp_config) as sender:
+            assert sender.send("a@example.com", "Subject", "Body", docx_file) is True
+            assert sender.send("b@example.com", "Subject", "Body", docx_file) is True
+            mock_server.quit.assert_not_called()
+
+        mock_smtp_cls.assert_called_once_with("smtp.example.com", 587)
+        mock_server.starttls.assert_called_once()
+        mock_server.login.assert_called_once()
+        assert mock_server.send_message.call_count == 2
+        mock_server.quit.assert_called_once()
+
+    @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
+    def test_send_after_exit_connects_again(self, mock_smtp_cls, smtp_config, docx_file):
+        with EmailSender(smtp_config) as sender:
+            pass
+        sender.send("a@example.com", "Subject", "Body", docx_file)
+
+        assert mock_smtp_cls.call_count == 2
+
+    @patch("flowtrack.reporting.email_sender.smtplib.SMTP")
+    def test_failed_login_closes_connection(self, mock_smtp_cls, smtp_config):
+        mock_server = MagicMock()
+        mock_smtp_cls.return_value = mock_server
+        mock_server.login.side_effect = smtplib.SMTPAuthenticationError(535, b"Auth failed")
+
+        with pytest.raises(smtplib.SMTPAuthenticationError):
+            with EmailSender(smtp_config):
+                pass
+
+        mock_server.close.assert_called_once()
@@ -1,9 +1,14 @@
 """Unit tests for MacOSWindowProvider.
 
 All subprocess calls are mocked — these tests never invoke osascript or ioreg.
+The native PyObjC window and Quartz idle APIs are disabled unless a test
+installs a fake one.
 """
 
+import io
 import subprocess
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -16,6 +21,22 @@ from flowtrack.platform.macos import MacOSWindowProvider
 # Helpers
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _no_pyobjc():
+    """Force the subprocess paths so tests behave the same on every OS."""
+    with patch("flowtrack.platform.macos._load_window_api", return_value=None), \
+            patch("flowtrack.platform.macos._load_idle_api", return_value=None):
+        yield
+
+
+def _popen(stdout: bytes, returncode: int = 0):
+    """Build a fake ``subprocess.Popen`` streaming *stdout*."""
+    proc = MagicMock()
+    proc.stdout = io.BytesIO(stdout)
+    proc.wait.return_value = returncode
+    return proc
+
+
 def _completed(stdout: str = "", stderr: str = "", returncode: int = 0):
     """Build a fake ``subprocess.CompletedProcess``."""
     return subprocess.CompletedProcess(
@@ -33,16 +54,15 @@ class TestGetActiveWindow:
     @patch("flowtrack.platform.macos.subprocess.run")
     def test_returns_window_info_on_success(self, mock_run):
         """Happy path: both app name and window title are returned."""
-        mock_run.side_effect = [
-            _completed(stdout="Safari\n"),       # frontmost app
-            _completed(stdout="Apple - Start\n"),  # window title
-        ]
+        mock_run.return_value = _completed(stdout="Safari\nApple - Start\n")
         provider = MacOSWindowProvider()
         info = provider.get_active_window()
 
         assert info is not None
         assert info.app_name == "Safari"
         assert info.window_title == "Apple - Start"
+        # App name and title come from a single osascript spawn
+        mock_run.assert_called_once()
 
     @patch("flowtrack.platform.macos.subprocess.run")
     def test_returns_none_when_app_name_unavailable(self, mock_run):
@@ -56,11 +76,8 @@ class TestGetActiveWindow:
     def test_falls_back_to_app_name_when_title_unavailable(self, mock_run):
         """If all window title approaches fail, use app name as title."""
         mock_run.side_effect = [
-            _completed(stdout="Finder\n"),       # _get_frontmost_app
-            _completed(returncode=1, stderr="no window"),  # approach 1: System Events window name
-            _completed(returncode=1, stderr="no AXTitle"),  # approach 2: AXTitle
-            _completed(stdout="Finder\n"),       # approach 3: _get_frontmost_app (for app name)
-            _completed(returncode=1, stderr="no window"),  # approach 3: ask app directly
+            _completed(stdout="Finder\n\n"),    # app name, empty title
+            _completed(returncode=1, stderr="no window"),  # ask app directly
         ]
         provider = MacOSWindowProvider()
         info = provider.get_active_window()
@@ -69,6 +86,17 @@ class TestGetActiveWindow:
         assert info.app_name == "Finder"
         assert info.window_title == "Finder"
 
+    @patch("flowtrack.platform.macos.subprocess.run")
+    def test_asks_app_directly_when_system_events_has_no_title(self, mock_run):
+        mock_run.side_effect = [
+            _completed(stdout="Notes\n\n"),
+            _completed(stdout="Groceries\n"),
+        ]
+        provider = MacOSWindowProvider()
+        info = provider.get_active_window()
+
+        assert info == WindowInfo(app_name="Notes", window_title="Groceries")
+
     @patch("flowtrack.platform.macos.subprocess.run")
     def test_returns_none_when_app_name_empty(self, mock_run):
         """Empty stdout from osascript should be treated as unavailable."""
@@ -109,77 +137,197 @@ class TestGetActiveWindow:
 class TestIsUserIdle:
     """Tests for MacOSWindowProvider.is_user_idle()."""
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_idle_when_above_threshold(self, mock_run):
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_idle_when_above_threshold(self, mock_popen):
         """User is idle when HIDIdleTime exceeds the threshold."""
         # 400 seconds in nanoseconds
-        ioreg_output = '  |   "HIDIdleTime" = 400000000000\n'
-        mock_run.return_value = _completed(stdout=ioreg_output)
+        ioreg_output = b'  |   "HIDIdleTime" = 400000000000\n'
+        mock_popen.return_value = _popen(ioreg_output)
 
         provider = MacOSWindowProvider(idle_threshold=300)
         assert provider.is_user_idle() is True
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_not_idle_when_below_threshold(self, mock_run):
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_not_idle_when_below_threshold(self, mock_popen):
         """User is not idle when HIDIdleTime is below the threshold."""
         # 10 seconds in nanoseconds
-        ioreg_output = '  |   "HIDIdleTime" = 10000000000\n'
-        mock_run.return_value = _completed(stdout=ioreg_output)
+        ioreg_output = b'  |   "HIDIdleTime" = 10000000000\n'
+        mock_popen.return_value = _popen(ioreg_output)
 
         provider = MacOSWindowProvider(idle_threshold=300)
         assert provider.is_user_idle() is False
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_idle_at_exact_threshold(self, mock_run):
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_idle_at_exact_threshold(self, mock_popen):
         """Exactly at the threshold counts as idle (>=)."""
         # 300 seconds in nanoseconds
-        ioreg_output = '  |   "HIDIdleTime" = 300000000000\n'
-        mock_run.return_value = _completed(stdout=ioreg_output)
+        ioreg_output = b'  |   "HIDIdleTime" = 300000000000\n'
+        mock_popen.return_value = _popen(ioreg_output)
 
         provider = MacOSWindowProvider(idle_threshold=300)
         assert provider.is_user_idle() is True
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_not_idle_when_ioreg_fails(self, mock_run):
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_not_idle_when_ioreg_fails(self, mock_popen):
         """If ioreg fails, assume user is active (return False)."""
-        mock_run.return_value = _completed(returncode=1)
+        mock_popen.return_value = _popen(b"", returncode=1)
 
         provider = MacOSWindowProvider()
         assert provider.is_user_idle() is False
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_not_idle_when_hid_not_found(self, mock_run):
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_not_idle_when_hid_not_found(self, mock_popen):
         """If HIDIdleTime is missing from output, return False."""
-        mock_run.return_value = _completed(stdout="some other ioreg output\n")
+        mock_popen.return_value = _popen(b"some other ioreg output\n")
 
         provider = MacOSWindowProvider()
         assert provider.is_user_idle() is False
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_not_idle_on_timeout(self, mock_run):
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_not_idle_on_timeout(self, mock_popen):
         """Subprocess timeout should not crash — return False."""
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="ioreg", timeout=5)
+        proc = _popen(b"")
+        proc.wait.side_effect = [subprocess.TimeoutExpired(cmd="ioreg", timeout=5), 0]
+        mock_popen.return_value = proc
 
         provider = MacOSWindowProvider()
         assert provider.is_user_idle() is False
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_not_idle_on_file_not_found(self, mock_run):
+    @patch("flowtrack.platform.macos._IOREG_TIMEOUT", 0.05)
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_hung_ioreg_output_is_killed(self, mock_popen):
+        """A read that never returns is cut off by killing ioreg."""
+        killed = threading.Event()
+
+        class _HungStdout:
+            def __iter__(self):
+                killed.wait(10)  # blocks like a pipe until the writer dies
+                return iter(())
+
+            def close(self):
+                pass
+
+        proc = _popen(b"")
+        proc.stdout = _HungStdout()
+        proc.kill.side_effect = killed.set
+        mock_popen.return_value = proc
+
+        provider = MacOSWindowProvider()
+        started = time.monotonic()
+        assert provider.is_user_idle() is False
+        assert time.monotonic() - started < 5
+        proc.kill.assert_called_once()
+
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_not_idle_on_file_not_found(self, mock_popen):
         """Missing ioreg binary should not crash — return False."""
-        mock_run.side_effect = FileNotFoundError("ioreg not found")
+        mock_popen.side_effect = FileNotFoundError("ioreg not found")
 
         provider = MacOSWindowProvider()
         assert provider.is_user_idle() is False
 
-    @patch("flowtrack.platform.macos.subprocess.run")
-    def test_custom_idle_threshold(self, mock_run):
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_custom_idle_threshold(self, mock_popen):
         """Custom threshold should be respected."""
         # 60 seconds in nanoseconds
-        ioreg_output = '  |   "HIDIdleTime" = 60000000000\n'
-        mock_run.return_value = _completed(stdout=ioreg_output)
+        ioreg_output = b'  |   "HIDIdleTime" = 60000000000\n'
+        mock_popen.return_value = _popen(ioreg_output)
 
         provider = MacOSWindowProvider(idle_threshold=30)
         assert provider.is_user_idle() is True
 
+        mock_popen.return_value = _popen(ioreg_output)
         provider2 = MacOSWindowProvider(idle_threshold=120)
         assert provider2.is_user_idle() is False
+
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_stops_reading_after_idle_time_found(self, mock_popen):
+        """ioreg is terminated once HIDIdleTime has been parsed."""
+        lines_read = []
+
+        def _lines():
+            lines_read.append(b'  |   "HIDIdleTime" = 400000000000\n')
+            yield lines_read[-1]
+            for _ in range(1000):
+                lines_read.append(b"  | trailing line\n")
+                yield lines_read[-1]
+
+        proc = _popen(b"")
+        proc.stdout = MagicMock()
+        proc.stdout.__iter__.return_value = _lines()
+        mock_popen.return_value = proc
+
+        provider = MacOSWindowProvider(idle_threshold=300)
+        assert provider.is_user_idle() is True
+        proc.terminate.assert_called_once()
+        assert len(lines_read) == 1
+
+
+class TestNativeWindowApi:
+    """Window queries through NSWorkspace/AXUIElement."""
+
+    def _provider(self, window_api):
+        with patch("flowtrack.platform.macos._load_window_api", return_value=window_api):
+            return MacOSWindowProvider()
+
+    @patch("flowtrack.platform.macos.subprocess.run")
+    def test_uses_native_api_without_spawning(self, mock_run):
+        provider = self._provider(lambda: ("Safari", "Apple - Start"))
+        info = provider.get_active_window()
+
+        assert info == WindowInfo(app_name="Safari", window_title="Apple - Start")
+        mock_run.assert_not_called()
+
+    @patch("flowtrack.platform.macos.subprocess.run")
+    def test_untitled_window_uses_app_name(self, mock_run):
+        provider = self._provider(lambda: ("Finder", ""))
+
+        assert provider.get_active_window() == WindowInfo("Finder", "Finder")
+        mock_run.assert_not_called()
+
+    @patch("flowtrack.platform.macos.subprocess.run")
+    def test_no_frontmost_app_returns_none(self, mock_run):
+        provider = self._provider(lambda: None)
+
+        assert provider.get_active_window() is None
+        mock_run.assert_not_called()
+
+    @patch("flowtrack.platform.macos.subprocess.run")
+    def test_falls_back_to_applescript_when_accessibility_denied(self, mock_run):
+        mock_run.return_value = _completed(stdout="Safari\nApple - Start\n")
+        provider = self._provider(lambda: ("Safari", None))
+
+        assert provider.get_active_window() == WindowInfo("Safari", "Apple - Start")
+        mock_run.assert_called_once()
+
+    @patch("flowtrack.platform.macos.subprocess.run")
+    def test_falls_back_to_applescript_on_error(self, mock_run):
+        def _broken():
+            raise RuntimeError("AX failure")
+
+        mock_run.return_value = _completed(stdout="Mail\nInbox\n")
+        provider = self._provider(_broken)
+
+        assert provider.get_active_window() == WindowInfo("Mail", "Inbox")
+
+
+class TestQuartzIdle:
+    """Idle detection through the in-process Quartz API."""
+
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_uses_quartz_without_spawning_ioreg(self, mock_run):
+        with patch("flowtrack.platform.macos._load_idle_api", return_value=lambda: 400.0):
+            provider = MacOSWindowProvider(idle_threshold=300)
+        assert provider.is_user_idle() is True
+        mock_run.assert_not_called()
+
+    @patch("flowtrack.platform.macos.subprocess.Popen")
+    def test_falls_back_to_ioreg_when_quartz_fails(self, mock_run):
+        def _broken():
+            raise RuntimeError("no session")
+
+        mock_run.return_value = _popen(b'  |   "HIDIdleTime" = 10000000000\n')
+        with patch("flowtrack.platform.macos._load_idle_api", return_value=_broken):
+            provider = MacOSWindowProvider(idle_threshold=300)
+        assert provider.is_user_idle() is False
+        mock_run.assert_called_once()
@@ -0,0 +1,672 @@
+"""Unit tests for the AI news fetcher."""
+
+import io
+import time
+import urllib.error
+import xml.etree.ElementTree
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from flowtrack.core import news_fetcher
+from flowtrack.core.news_fetcher import (
+    _ATOM_ENTRY,
+    _BUSINESS_FEEDS,
+    _CACHE_TTL,
+    _CACHE_TTL_MAX,
+    _CACHE_TTL_MIN,
+    _DATE_FORMATS,
+    _RECENT_WINDOW_S,
+    _TECHNICAL_FEEDS,
+    _business_relevance,
+    _clean_html,
+    _extract_takeaway,
+    _fast_parse_date,
+    _fetch_source,
+    _iter_feed_entries,
+    _make_headline,
+    _next_ttl,
+    _normalize_title,
+    _parse_date,
+    _parse_feed,
+    _search_urls,
+    _technical_relevance,
+    _timestamp,
+    _top_unique,
+    fetch_ai_news,
+)
+
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+RSS_FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+  <item>
+    <title>OpenAI ships a new reasoning model</title>
+    <link>https://example.com/a</link>
+    <description>&lt;p&gt;The model is faster.&lt;/p&gt;</description>
+    <pubDate>Tue, 10 Jun 2025 14:30:00 +0000</pubDate>
+  </item>
+  <item>
+    <title>Open source LLM tops benchmark</title>
+    <link>https://example.com/b</link>
+    <pubDate>Wed, 11 Jun 2025 08:00:00 GMT</pubDate>
+  </item>
+</channel></rss>
+"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Blog</title>
+  <entry>
+    <title>Fine-tuning small models on a laptop</title>
+    <link href="https://example.com/post"/>
+    <summary>A walkthrough of the training loop.</summary>
+    <updated>2025-06-12T09:15:00Z</updated>
+  </entry>
+</feed>
+"""
+
+
+class _FakeResponse(io.BytesIO):
+    """Minimal stand-in for the object returned by ``urlopen``."""
+
+    def __init__(self, body: bytes, headers: dict | None = None):
+        super().__init__(body)
+        self.headers = headers or {}
+
+
+def _headlines(titles: list[str]) -> list[dict]:
+    return [{"headline": h} for h in titles]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(monkeypatch):
+    """Give every test empty module-level caches."""
+    monkeypatch.setattr(news_fetcher, "_cache", {})
+    monkeypatch.setattr(news_fetcher, "_feed_meta", {})
+
+
+# ------------------------------------------------------------------
+# Adaptive TTL
+# ------------------------------------------------------------------
+
+class TestNextTtl:
+    """Tests for _next_ttl()."""
+
+    def test_unchanged_headlines_double_ttl(self):
+        items = _headlines(["a", "b", "c"])
+        assert _next_ttl(3600, items, items) == 7200
+
+    def test_growth_is_capped(self):
+        items = _headlines(["a"])
+        assert _next_ttl(_CACHE_TTL_MAX, items, items) == _CACHE_TTL_MAX
+
+    def test_mostly_new_headlines_halve_ttl(self):
+        assert _next_ttl(3600, _headlines(["a", "b"]), _headlines(["c", "d"])) == 1800
+
+    def test_shrinking_is_floored(self):
+        assert _next_ttl(_CACHE_TTL_MIN, _headlines(["a"]), _headlines(["b"])) == _CACHE_TTL_MIN
+
+    def test_some_new_headlines_keep_ttl(self):
+        previous = _headlines(["a", "b", "c", "d"])
+        current = _headlines(["a", "b", "c", "e"])  # 25% new
+        assert _next_ttl(3600, previous, current) == 3600
+
+
+class TestFetchCaching:
+    """Tests for how fetch_ai_news() caches refreshes."""
+
+    def test_failed_refresh_keeps_items_and_retries_soon(self):
+        items = [{"headline": "Something happened"}]
+        news_fetcher._cache["business"] = (time.time() - 2 * _CACHE_TTL, items, _CACHE_TTL)
+
+        with patch.object(news_fetcher, "_fetch_source", return_value=[]):
+            assert fetch_ai_news("business") == items
+            _, cached_items, ttl = news_fetcher._cache["business"]
+            assert cached_items == items
+            assert ttl == _CACHE_TTL_MIN
+
+            # A second failure does not back off any further
+            news_fetcher._cache["business"] = (time.time() - 2 * ttl, items, ttl)
+            fetch_ai_news("business")
+            assert news_fetcher._cache["business"][2] == _CACHE_TTL_MIN
+
+    def test_first_failed_refresh_is_not_cached_for_long(self):
+        with patch.object(news_fetcher, "_fetch_source", return_value=[]):
+            assert fetch_ai_news("technical") == []
+        assert news_fetcher._cache["technical"][2] == _CACHE_TTL_MIN
+
+
+# ------------------------------------------------------------------
+# Date parsing
+# ------------------------------------------------------------------
+
+class TestDateParsing:
+    """The regex fast path must agree with the strptime formats."""
+
+    @pytest.mark.parametrize(
+        "value, fmt",
+        [
+            ("Tue, 10 Jun 2025 14:30:00 +0000", "%a, %d %b %Y %H:%M:%S %z"),
+            ("Tue, 10 Jun 2025 14:30:00 -0700", "%a, %d %b %Y %H:%M:%S %z"),
+            ("Wed, 11 Jun 2025 08:00:00 GMT", "%a, %d %b %Y %H:%M:%S %Z"),
+            ("2025-06-12T09:15:00+02:00", "%Y-%m-%dT%H:%M:%S%z"),
+            ("2025-06-12T09:15:00Z", "%Y-%m-%dT%H:%M:%SZ"),
+            ("2025-06-12T09:15:00.123456+00:00", "%Y-%m-%dT%H:%M:%S.%f%z"),
+            ("2025-06-12T09:15:00.5+00:00", "%Y-%m-%dT%H:%M:%S.%f%z"),
+            ("2025-06-12 09:15:00", "%Y-%m-%d %H:%M:%S"),
+            ("2025-06-12", "%Y-%m-%d"),
+        ],
+    )
+    def test_fast_path_matches_strptime(self, value, fmt):
+        assert fmt in _DATE_FORMATS
+        expected = datetime.strptime(value, fmt).replace(tzinfo=None)
+        assert _fast_parse_date(value) == expected
+        assert _parse_date(value) == expected
+
+    def test_out_of_range_field_is_rejected(self):
+        assert _fast_parse_date("2025-13-01") is None
+        assert _parse_date("2025-13-01") is None
+
+    def test_unknown_shape_falls_through(self):
+        assert _fast_parse_date("June 12, 2025") is None
+        assert _parse_date("June 12, 2025") is None
+        assert _parse_date("") is None
+
+
+class TestDateFastPathEdges:
+    """Shapes the RFC 822 fast path accepts beyond the listed formats."""
+
+    def test_single_digit_day(self):
+        value = "Tue, 3 Jun 2025 08:00:00 +0000"
+        expected = datetime.strptime(value, "%a, %d %b %Y %H:%M:%S %z").replace(tzinfo=None)
+        assert _fast_parse_date(value) == expected
+
+    def test_without_weekday(self):
+        assert _fast_parse_date("10 Jun 2025 14:30:00 +0000") == datetime(2025, 6, 10, 14, 30)
+
+    def test_named_zone_is_dropped_like_utc_offsets(self):
+        assert _parse_date("Tue, 10 Jun 2025 14:30:00 EST") == datetime(2025, 6, 10, 14, 30)
+        assert _parse_date("Tue, 10 Jun 2025 14:30:00 -0500") == datetime(2025, 6, 10, 14, 30)
+
+    def test_unknown_month_is_rejected(self):
+        assert _fast_parse_date("Tue, 10 Jux 2025 14:30:00 +0000") is None
+        assert _parse_date("Tue, 10 Jux 2025 14:30:00 +0000") is None
+
+
+# ------------------------------------------------------------------
+# Feed parsing
+# ------------------------------------------------------------------
+
+class TestParseFeed:
+    """Tests for _parse_feed()."""
+
+    def test_parses_rss_items(self):
+        with patch("urllib.request.urlopen", return_value=_FakeResponse(RSS_FEED)):
+            items = _parse_feed("https://example.com/rss", "Example")
+
+        assert [i["title"] for i in items] == [
+            "OpenAI ships a new reasoning model",
+            "Open source LLM tops benchmark",
+        ]
+        first = items[0]
+        assert first["link"] == "https://example.com/a"
+        assert first["description"] == "The model is faster."
+        assert first["published_dt"] == datetime(2025, 6, 10, 14, 30)
+        assert first["published_ts"] == datetime(2025, 6, 10, 14, 30).timestamp()
+        assert first["source"] == "Example"
+        assert items[1]["description"] == ""
+
+    def test_parses_atom_entries(self):
+        with patch("urllib.request.urlopen", return_value=_FakeResponse(ATOM_FEED)):
+            items = _parse_feed("https://example.com/atom", "Blog")
+
+        assert len(items) == 1
+        entry = items[0]
+        assert entry["title"] == "Fine-tuning small models on a laptop"
+        assert entry["link"] == "https://example.com/post"
+        assert entry["description"] == "A walkthrough of the training loop."
+        assert entry["published_dt"] == datetime(2025, 6, 12, 9, 15)
+
+    def test_not_modified_reuses_previous_items(self):
+        url = "https://example.com/rss"
+        first = _FakeResponse(RSS_FEED, {"ETag": '"v1"', "Last-Modified": "Tue, 10 Jun 2025 15:00:00 GMT"})
+        not_modified = urllib.error.HTTPError(url, 304, "Not Modified", {}, None)
+
+        with patch("urllib.request.urlopen", side_effect=[first, not_modified]) as urlopen:
+            fresh = _parse_feed(url, "Example")
+            fresh[0]["title"] = "mutated by the caller"
+            reused = _parse_feed(url, "Example")
+
+        request = urlopen.call_args[0][0]
+        assert request.get_header("If-none-match") == '"v1"'
+        assert request.get_header("If-modified-since") == "Tue, 10 Jun 2025 15:00:00 GMT"
+        assert [i["title"] for i in reused] == [
+            "OpenAI ships a new reasoning model",
+            "Open source LLM tops benchmark",
+        ]
+
+    def test_not_modified_without_cached_items_raises(self):
+        url = "https://example.com/rss"
+        not_modified = urllib.error.HTTPError(url, 304, "Not Modified", {}, None)
+        with patch("urllib.request.urlopen", side_effect=not_modified):
+            with pytest.raises(urllib.error.HTTPError):
+                _parse_feed(url, "Example")
+
+
+# ------------------------------------------------------------------
+# Parser backend
+# ------------------------------------------------------------------
+
+ENTITY_FEED = b"""<?xml version="1.0"?>
+<!DOCTYPE rss [<!ENTITY injected "expanded entity text">]>
+<rss version="2.0"><channel>
+  <item><title>Feed with &injected; in the title</title></item>
+</channel></rss>
+"""
+
+
+def _parse_bytes(feed: bytes) -> list[dict]:
+    with patch("urllib.request.urlopen", return_value=_FakeResponse(feed)):
+        return _parse_feed("https://example.com/feed", "Example")
+
+
+@pytest.fixture
+def stdlib_parser(monkeypatch):
+    monkeypatch.setattr(news_fetcher, "ElementTree", xml.etree.ElementTree)
+    monkeypatch.setattr(news_fetcher, "_HAVE_LXML", False)
+
+
+@pytest.fixture
+def lxml_parser(monkeypatch):
+    etree = pytest.importorskip("lxml.etree")
+    monkeypatch.setattr(news_fetcher, "ElementTree", etree)
+    monkeypatch.setattr(news_fetcher, "_HAVE_LXML", True)
+
+
+class TestParserBackend:
+    """Feeds parse the same with lxml and with the stdlib fallback."""
+
+    def test_stdlib_fallback_parses_rss_and_atom(self, stdlib_parser):
+        assert [i["title"] for i in _parse_bytes(RSS_FEED)] == [
+            "OpenAI ships a new reasoning model",
+            "Open source LLM tops benchmark",
+        ]
+        assert [i["title"] for i in _parse_bytes(ATOM_FEED)] == [
+            "Fine-tuning small models on a laptop",
+        ]
+
+    def test_lxml_matches_stdlib(self, monkeypatch):
+        monkeypatch.setattr(news_fetcher, "ElementTree", xml.etree.ElementTree)
+        monkeypatch.setattr(news_fetcher, "_HAVE_LXML", False)
+        expected = _parse_bytes(RSS_FEED) + _parse_bytes(ATOM_FEED)
+
+        etree = pytest.importorskip("lxml.etree")
+        monkeypatch.setattr(news_fetcher, "ElementTree", etree)
+        monkeypatch.setattr(news_fetcher, "_HAVE_LXML", True)
+        assert _parse_bytes(RSS_FEED) + _parse_bytes(ATOM_FEED) == expected
+
+    def test_lxml_does_not_expand_entities(self, lxml_parser):
+        items = _parse_bytes(ENTITY_FEED)
+        assert len(items) == 1
+        assert "expanded entity text" not in items[0]["title"]
+
+
+# ------------------------------------------------------------------
+# Incremental parsing
+# ------------------------------------------------------------------
+
+def _long_feed(count: int) -> bytes:
+    items = "".join(
+        f"<item><title>Story {n} about language models</title>"
+        f"<link>https://example.com/{n}</link></item>"
+        for n in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+class TestIterFeedEntries:
+    """Tests for _iter_feed_entries() and the streaming loop in _parse_feed()."""
+
+    def test_yields_only_items_and_entries(self):
+        assert [e.tag for e in _iter_feed_entries(io.BytesIO(RSS_FEED))] == ["item", "item"]
+        assert [e.tag for e in _iter_feed_entries(io.BytesIO(ATOM_FEED))] == [_ATOM_ENTRY]
+
+    def test_every_entry_is_released_after_conversion(self):
+        with patch("urllib.request.urlopen", return_value=_FakeResponse(_long_feed(50))), \
+                patch.object(news_fetcher, "_release", wraps=news_fetcher._release) as release:
+            items = _parse_feed("https://example.com/rss", "Example")
+
+        assert release.call_count == 50
+        assert [i["link"] for i in items] == [f"https://example.com/{n}" for n in range(50)]
+
+    def test_truncated_feed_yields_no_items(self):
+        truncated = _FakeResponse(RSS_FEED[: len(RSS_FEED) // 2])
+        with patch("urllib.request.urlopen", return_value=truncated):
+            assert _fetch_source("Example", "https://example.com/rss", False) == []
+
+
+# ------------------------------------------------------------------
+# Text cleanup
+# ------------------------------------------------------------------
+
+class TestTextCleanup:
+    """Tests for the helpers built on the precompiled patterns."""
+
+    def test_normalize_title_folds_case_and_whitespace(self):
+        assert _normalize_title("  OpenAI\tShips   A  Model \n") == "openai ships a model"
+
+    def test_takeaway_keeps_first_three_long_sentences(self):
+        desc = (
+            "First sentence is long enough. Tiny. Second sentence is also long! "
+            "Third sentence is long too? Fourth sentence is dropped here."
+        )
+        assert _extract_takeaway(desc) == (
+            "First sentence is long enough. Second sentence is also long! "
+            "Third sentence is long too?"
+        )
+
+    def test_long_headline_loses_filler_phrases(self):
+        title = (
+            "The company said it would open source its largest model next month "
+            "in a move that could reshape the industry"
+        )
+        assert _make_headline(title, "") == (
+            "it would open source its largest model next month could reshape the industry"
+        )
+
+
+# ------------------------------------------------------------------
+# Relevance notes
+# ------------------------------------------------------------------
+
+class TestRelevance:
+    """The first matching keyword bucket picks the relevance note."""
+
+    @pytest.mark.parametrize(
+        "title, note",
+        [
+            ("Chip maker posts record REVENUE", "Directly impacts enterprise AI adoption"),
+            ("Senate debates AI policy", "May affect AI governance"),
+            ("Automation startup ships agents", "Could change how teams work"),
+            ("Lab will launch its assistant", "New capability"),
+            # "company" (bucket 1) beats "launch" (bucket 4)
+            ("Company to launch assistant", "Directly impacts enterprise AI adoption"),
+            ("Quiet week for chips", "Relevant to staying informed"),
+        ],
+    )
+    def test_business_buckets(self, title, note):
+        assert _business_relevance(title, "").startswith(note)
+
+    @pytest.mark.parametrize(
+        "title, desc, note",
+        [
+            ("Weights land on GitHub", "", "Open source project"),
+            ("Faster inference", "", "Performance improvement"),
+            ("Quiet week", "A new LLM was trained", "Advances in model architecture"),
+            ("New Python SDK", "", "New developer tooling"),
+            ("Quiet week", "", "Technical development worth tracking"),
+        ],
+    )
+    def test_technical_buckets(self, title, desc, note):
+        assert _technical_relevance(title, desc).startswith(note)
+
+
+# ------------------------------------------------------------------
+# Source fetching
+# ------------------------------------------------------------------
+
+class TestFetchSources:
+    """Tests for the per-source fetch run on the thread pool."""
+
+    @pytest.mark.parametrize(
+        "news_type, feeds",
+        [("business", _BUSINESS_FEEDS), ("technical", _TECHNICAL_FEEDS)],
+    )
+    def test_every_source_is_fetched_once(self, news_type, feeds):
+        with patch.object(news_fetcher, "_fetch_source", return_value=[]) as fetch:
+            fetch_ai_news(news_type)
+
+        fetched = sorted(c.args for c in fetch.call_args_list)
+        expected = [("Google News", url, True) for url in _search_urls(news_type)]
+        expected += [(name, url, False) for name, url in feeds]
+        assert fetched == sorted(expected)
+
+    def test_failing_source_yields_no_items(self):
+        error = urllib.error.URLError("offline")
+        with patch.object(news_fetcher, "_parse_feed", side_effect=error):
+            assert _fetch_source("Example", "https://example.com/rss", False) == []
+            assert _fetch_source("Google News", "https://example.com/search", True) == []
+
+    def test_search_items_are_tagged(self):
+        with patch.object(news_fetcher, "_parse_feed", side_effect=lambda *a: [{"title": "a"}]):
+            assert _fetch_source("Google News", "https://example.com/search", True) == [
+                {"title": "a", "from_search": True}
+            ]
+            assert _fetch_source("Example", "https://example.com/rss", False) == [{"title": "a"}]
+
+
+# ------------------------------------------------------------------
+# De-duplication
+# ------------------------------------------------------------------
+
+def _raw_item(title: str, *, normalized: bool = True, **extra) -> dict:
+    item = {"title": title, "description": "", "source": "Example", "link": ""}
+    if normalized:
+        item["title_norm"] = _normalize_title(title)
+    item.update(extra)
+    return item
+
+
+class TestTopUnique:
+    """Tests for _top_unique()."""
+
+    def test_case_and_whitespace_variants_are_dropped(self):
+        items = [
+            _raw_item("OpenAI ships a new model", link="first"),
+            _raw_item("openai  ships a NEW model", link="second"),
+            _raw_item("Another headline entirely"),
+        ]
+        result = _top_unique(items, "business", 10)
+        assert [r["headline"] for r in result] == [
+            "OpenAI ships a new model",
+            "Another headline entirely",
+        ]
+        assert result[0]["link"] == "first"
+
+    def test_short_titles_are_skipped(self):
+        items = [_raw_item("AI news"), _raw_item("Long enough title")]
+        assert [r["headline"] for r in _top_unique(items, "business", 10)] == ["Long enough title"]
+
+    def test_items_without_title_norm_are_normalized(self):
+        items = [
+            _raw_item("Model release notes", normalized=False),
+            _raw_item("MODEL release  notes"),
+        ]
+        assert len(_top_unique(items, "technical", 10)) == 1
+
+    def test_stops_at_max_items(self):
+        items = [_raw_item(f"Unique headline number {n}") for n in range(5)]
+        result = _top_unique(items, "business", 3)
+        assert [r["headline"] for r in result] == [
+            "Unique headline number 0",
+            "Unique headline number 1",
+            "Unique headline number 2",
+        ]
+
+
+# ------------------------------------------------------------------
+# Selection
+# ------------------------------------------------------------------
+
+def _fetched(*items: dict):
+    """Patch the source fetch so one source returns *items*."""
+    batches = [list(items)]
+    return patch.object(
+        news_fetcher, "_fetch_source",
+        side_effect=lambda *source: batches.pop() if batches else [],
+    )
+
+
+class TestSelection:
+    """fetch_ai_news() keeps the newest unique items."""
+
+    def test_newest_first_with_undated_search_items_last(self):
+        now = time.time()
+        items = [
+            _raw_item("Undated search result", from_search=True),
+            _raw_item("Older dated headline", published_ts=now - 3600),
+            _raw_item("Newest dated headline", published_ts=now - 60),
+        ]
+        with _fetched(*items):
+            result = fetch_ai_news("business")
+        assert [r["headline"] for r in result] == [
+            "Newest dated headline",
+            "Older dated headline",
+            "Undated search result",
+        ]
+
+    def test_duplicate_candidates_fall_back_to_full_sort(self):
+        now = time.time()
+        # max_items=2 looks at the newest 8 first; all of them share a title
+        dupes = [_raw_item("Same story everywhere", published_ts=now - n) for n in range(8)]
+        older = [_raw_item(f"Older unique story {n}", published_ts=now - 600 - n) for n in range(2)]
+        with _fetched(*older, *dupes):
+            result = fetch_ai_news("technical", max_items=2)
+        assert [r["headline"] for r in result] == [
+            "Same story everywhere",
+            "Older unique story 0",
+        ]
+
+
+# ------------------------------------------------------------------
+# HTML stripping
+# ------------------------------------------------------------------
+
+class TestCleanHtml:
+    """Tests for _clean_html()."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("  Plain headline  ", "Plain headline"),
+            ("", ""),
+            ("<p>The <b>model</b> is faster.</p>", "The model is faster."),
+            ('<a href="https://example.com">link</a> text ', "link text"),
+            ("a < b and c > d", "a  d"),
+            ("a < b", "a < b"),
+        ],
+    )
+    def test_strips_tags(self, text, expected):
+        assert _clean_html(text) == expected
+
+
+# ------------------------------------------------------------------
+# Recency filter
+# ------------------------------------------------------------------
+
+class TestRecency:
+    """Items are filtered on POSIX publication time."""
+
+    def test_timestamp(self):
+        dt = datetime(2025, 6, 10, 14, 30)
+        assert _timestamp(dt) == dt.timestamp()
+        assert _timestamp(None) is None
+        assert _timestamp(datetime(1, 1, 1)) is None
+
+    def test_only_recent_or_undated_search_items_are_kept(self):
+        now = time.time()
+        items = [
+            _raw_item("Fresh dated headline", published_ts=now - 3600),
+            _raw_item("Stale dated headline", published_ts=now - _RECENT_WINDOW_S - 60),
+            _raw_item("Undated feed headline"),
+            _raw_item("Undated search headline", from_search=True),
+        ]
+        with _fetched(*items):
+            result = fetch_ai_news("business")
+        assert [r["headline"] for r in result] == [
+            "Fresh dated headline",
+            "Undated search headline",
+        ]
+
+
+# ------------------------------------------------------------------
+# Headline affixes
+# ------------------------------------------------------------------
+
+class TestHeadlineAffixes:
+    """Source suffixes and AI labels are stripped in one pass."""
+
+    @pytest.mark.parametrize(
+        "title, expected",
+        [
+            ("OpenAI ships a new model - TechCrunch", "OpenAI ships a new model"),
+            ("OpenAI ships a new model | the verge", "OpenAI ships a new model"),
+            ("AI: Chips keep getting faster", "Chips keep getting faster"),
+            ("Artificial Intelligence — Chips keep getting faster", "Chips keep getting faster"),
+            ("AI: Chips keep getting faster - Reuters", "Chips keep getting faster"),
+            ("Agents: pros - cons", "Agents: pros - cons"),
+            ("Nvidia - the next decade", "Nvidia - the next decade"),
+        ],
+    )
+    def test_affixes_are_stripped(self, title, expected):
+        assert _make_headline(title, "") == expected
+
+
+# ------------------------------------------------------------------
+# Trivial inputs
+# ------------------------------------------------------------------
+
+class TestTrivialInputs:
+    """Empty and short inputs skip the regex work."""
+
+    def test_empty_title(self):
+        assert _make_headline("", "anything") == "AI News Update"
+
+    def test_short_plain_title_skips_affix_pattern(self):
+        with patch.object(news_fetcher, "_RE_HEADLINE_AFFIXES") as affixes:
+            assert _make_headline("  Chips keep getting faster  ", "") == "Chips keep getting faster"
+        affixes.sub.assert_not_called()
+
+    def test_short_title_with_separator_still_checked(self):
+        assert _make_headline("Chips keep getting faster - Wired", "") == "Chips keep getting faster"
+
+    def test_empty_description(self):
+        assert _extract_takeaway("", "The title") == "The title"
+        assert _extract_takeaway("") == "Details available at the source link."
+
+    def test_short_description_is_not_split(self):
+        with patch.object(news_fetcher, "_RE_SENTENCE_SPLIT") as split:
+            assert _extract_takeaway("Short. Text.") == "Short. Text."
+        split.split.assert_not_called()
+
+
+# ------------------------------------------------------------------
+# Atom fallbacks
+# ------------------------------------------------------------------
+
+ATOM_FALLBACK_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title>Release notes for the new SDK</title>
+    <link href="https://example.com/sdk"/>
+    <content type="html">&lt;p&gt;Adds streaming.&lt;/p&gt;</content>
+    <published>2025-06-13T07:00:00Z</published>
+  </entry>
+</feed>
+"""
+
+
+class TestAtomFallbacks:
+    """Atom entries fall back to <content> and <published>."""
+
+    def test_content_and_published_are_used(self):
+        [entry] = _parse_bytes(ATOM_FALLBACK_FEED)
+        assert entry["link"] == "https://example.com/sdk"
+        assert entry["description"] == "Adds streaming."
+        assert entry["published"] == "2025-06-13T07:00:00Z"
+        assert entry["published_dt"] == datetime(2025, 6, 13, 7, 0)
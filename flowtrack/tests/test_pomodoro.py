@@ -387,3 +387,15 @@ class TestActiveTaskId:
     def test_active_task_id_default_is_none(self):
         pm = PomodoroManager()
         assert pm.active_task_id is None
+
+    def test_observe_sets_task_and_returns_active_session(self):
+        pm = PomodoroManager()
+        session = pm.observe("Dev", "main.py", T0, active_task_id=3)
+        assert session is pm.active_session
+        assert session.active_task_id == 3
+
+    def test_observe_ticks_the_timer(self):
+        pm = PomodoroManager()
+        pm.observe("Dev", "main.py", T0)
+        session = pm.observe("Dev", "main.py", _ts(60))
+        assert session.elapsed == timedelta(seconds=60)
@@ -0,0 +1,198 @@
+"""Unit tests for ScreenAnalyzer.
+
+Quartz and Vision are never imported here: capture and OCR are patched
+out, so only the routing and summarizing logic runs.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from flowtrack.core.screen_analyzer import ScreenAnalyzer
+
+
+SCREEN_TEXT = "some visible screen text for the summarizers"
+
+
+# ------------------------------------------------------------------
+# _summarize routing
+# ------------------------------------------------------------------
+
+class TestSummarizeDispatch:
+    """App names are routed to the matching summarizer."""
+
+    @pytest.mark.parametrize(
+        "app_name, method",
+        [
+            ("Visual Studio Code", "_summarize_ide"),
+            ("PyCharm", "_summarize_ide"),
+            ("Xcode", "_summarize_ide"),
+            ("Google Chrome", "_summarize_browser"),
+            ("Firefox", "_summarize_browser"),
+            ("Safari", "_summarize_browser"),
+            ("Microsoft Outlook", "_summarize_email"),
+            ("Mail", "_summarize_email"),
+            ("zoom.us", "_summarize_meeting"),
+            ("Microsoft Teams", "_summarize_meeting"),
+            ("Microsoft Word", "_summarize_document"),
+            ("Notion", "_summarize_document"),
+        ],
+    )
+    def test_routes_app_to_summarizer(self, app_name, method):
+        analyzer = ScreenAnalyzer()
+        with patch.object(ScreenAnalyzer, method, return_value="routed") as summarizer:
+            assert analyzer._summarize(app_name, "Title", SCREEN_TEXT) == "routed"
+        summarizer.assert_called_once_with(SCREEN_TEXT, "Title")
+
+    @pytest.mark.parametrize("app_name", ["Terminal", "iTerm2", "Slack", "Finder", "", None])
+    def test_unknown_apps_get_no_summary(self, app_name):
+        """Terminals, chat clients and other apps have no summarizer."""
+        analyzer = ScreenAnalyzer()
+        assert analyzer._summarize(app_name, "Title", SCREEN_TEXT) is None
+
+    def test_first_matching_bucket_wins(self):
+        """An IDE name is not re-routed by later, looser buckets."""
+        analyzer = ScreenAnalyzer()
+        with patch.object(ScreenAnalyzer, "_summarize_ide", return_value="ide"), \
+                patch.object(ScreenAnalyzer, "_summarize_document") as document:
+            assert analyzer._summarize("Code - Docs", "Title", SCREEN_TEXT) == "ide"
+        document.assert_not_called()
+
+    def test_short_text_is_not_summarized(self):
+        analyzer = ScreenAnalyzer()
+        assert analyzer._summarize("Visual Studio Code", "Title", "tiny") is None
+
+    def test_ide_summary_from_screen_text(self):
+        analyzer = ScreenAnalyzer()
+        text = "main.py\nerror: bad operand\nerror: build failed"
+        assert analyzer._summarize("PyCharm", "main.py", text) == "debugging (2 errors visible)"
+
+    def test_email_summary_from_screen_text(self):
+        analyzer = ScreenAnalyzer()
+        assert analyzer._summarize("Mail", "Inbox", "New Message to the team") == "composing email"
+
+
+# ------------------------------------------------------------------
+# _downscale
+# ------------------------------------------------------------------
+
+def _fake_quartz(width: int, height: int):
+    """Build a stand-in Quartz module reporting a *width* x *height* image."""
+    quartz = MagicMock()
+    quartz.CGImageGetWidth.return_value = width
+    quartz.CGImageGetHeight.return_value = height
+    quartz.CGBitmapContextCreateImage.return_value = "scaled-image"
+    return quartz
+
+
+class TestDownscale:
+    """Screenshots are capped at ocr_max_width before OCR."""
+
+    def test_wide_image_is_capped_keeping_aspect_ratio(self):
+        quartz = _fake_quartz(3200, 1800)
+        analyzer = ScreenAnalyzer(ocr_max_width=1600)
+        with patch.dict("sys.modules", {"Quartz": quartz}):
+            assert analyzer._downscale("full-image") == "scaled-image"
+
+        args = quartz.CGBitmapContextCreate.call_args[0]
+        assert args[1:3] == (1600, 900)
+        quartz.CGRectMake.assert_called_once_with(0, 0, 1600, 900)
+        context = quartz.CGBitmapContextCreate.return_value
+        quartz.CGContextDrawImage.assert_called_once_with(
+            context, quartz.CGRectMake.return_value, "full-image"
+        )
+
+    def test_odd_ratio_rounds_height(self):
+        quartz = _fake_quartz(2561, 1441)
+        analyzer = ScreenAnalyzer(ocr_max_width=1600)
+        with patch.dict("sys.modules", {"Quartz": quartz}):
+            analyzer._downscale("full-image")
+        assert quartz.CGBitmapContextCreate.call_args[0][1:3] == (1600, 900)
+
+    @pytest.mark.parametrize("width", [1600, 1280])
+    def test_image_at_or_below_cap_is_returned_unchanged(self, width):
+        quartz = _fake_quartz(width, 800)
+        analyzer = ScreenAnalyzer(ocr_max_width=1600)
+        with patch.dict("sys.modules", {"Quartz": quartz}):
+            assert analyzer._downscale("full-image") == "full-image"
+        quartz.CGBitmapContextCreate.assert_not_called()
+
+    def test_zero_cap_disables_scaling(self):
+        quartz = _fake_quartz(5000, 3000)
+        analyzer = ScreenAnalyzer(ocr_max_width=0)
+        with patch.dict("sys.modules", {"Quartz": quartz}):
+            assert analyzer._downscale("full-image") == "full-image"
+        quartz.CGBitmapContextCreate.assert_not_called()
+
+    def test_failed_context_falls_back_to_original(self):
+        quartz = _fake_quartz(3200, 1800)
+        quartz.CGBitmapContextCreate.return_value = None
+        analyzer = ScreenAnalyzer(ocr_max_width=1600)
+        with patch.dict("sys.modules", {"Quartz": quartz}):
+            assert analyzer._downscale("full-image") == "full-image"
+
+
+# ------------------------------------------------------------------
+# analyze_screen result cache
+# ------------------------------------------------------------------
+
+@pytest.fixture
+def ready_analyzer():
+    """An enabled analyzer whose capture/OCR step is a mock."""
+    analyzer = ScreenAnalyzer(analysis_ttl=10.0)
+    analyzer.enabled = True
+    analyzer._capture_available = True
+    analyzer._vision_available = True
+    with patch.object(analyzer, "_analyze", side_effect=lambda app, title: f"{app}:{title}") as analyze:
+        yield analyzer, analyze
+
+
+class TestAnalysisCache:
+    """Repeat analyses of one window within analysis_ttl reuse the result."""
+
+    def test_hit_within_ttl_skips_capture(self, ready_analyzer):
+        analyzer, analyze = ready_analyzer
+        with patch("flowtrack.core.screen_analyzer.time.monotonic", side_effect=[100.0, 109.0]):
+            assert analyzer.analyze_screen("Code", "a.py") == "Code:a.py"
+            assert analyzer.analyze_screen("Code", "a.py") == "Code:a.py"
+        analyze.assert_called_once()
+
+    def test_expired_entry_is_recomputed(self, ready_analyzer):
+        analyzer, analyze = ready_analyzer
+        with patch("flowtrack.core.screen_analyzer.time.monotonic", side_effect=[100.0, 110.0]):
+            analyzer.analyze_screen("Code", "a.py")
+            analyzer.analyze_screen("Code", "a.py")
+        assert analyze.call_count == 2
+        assert list(analyzer._analysis_cache) == [("Code", "a.py")]
+
+    def test_other_windows_are_cached_separately(self, ready_analyzer):
+        analyzer, analyze = ready_analyzer
+        with patch("flowtrack.core.screen_analyzer.time.monotonic", return_value=100.0):
+            analyzer.analyze_screen("Code", "a.py")
+            assert analyzer.analyze_screen("Code", "b.py") == "Code:b.py"
+        assert analyze.call_count == 2
+
+    def test_store_evicts_expired_entries(self, ready_analyzer):
+        analyzer, _ = ready_analyzer
+        with patch("flowtrack.core.screen_analyzer.time.monotonic", side_effect=[100.0, 105.0, 112.0]):
+            analyzer.analyze_screen("Code", "a.py")
+            analyzer.analyze_screen("Code", "b.py")
+            analyzer.analyze_screen("Code", "c.py")
+        # a.py (stored at 100) has expired by 112; b.py (105) has not
+        assert list(analyzer._analysis_cache) == [("Code", "b.py"), ("Code", "c.py")]
+
+    def test_cache_size_is_capped(self, ready_analyzer):
+        analyzer, _ = ready_analyzer
+        with patch("flowtrack.core.screen_analyzer._ANALYSIS_CACHE_SIZE", 3), \
+                patch("flowtrack.core.screen_analyzer.time.monotonic", return_value=100.0):
+            for n in range(5):
+                analyzer.analyze_screen("Code", f"{n}.py")
+        assert list(analyzer._analysis_cache) == [("Code", "2.py"), ("Code", "3.py"), ("Code", "4.py")]
+
+    def test_zero_ttl_never_caches(self, ready_analyzer):
+        analyzer, analyze = ready_analyzer
+        analyzer.analysis_ttl = 0
+        analyzer.analyze_screen("Code", "a.py")
+        analyzer.analyze_screen("Code", "a.py")
+        assert analyze.call_count == 2
+        assert not analyzer._analysis_cache
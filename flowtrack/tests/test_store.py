@@ -1,10 +1,13 @@
 """Unit tests for ActivityStore."""
 
+import sqlite3
+import threading
+
 import pytest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from flowtrack.core.models import ActivityRecord, PomodoroSession, SessionStatus
-from flowtrack.persistence.store import ActivityStore
+from flowtrack.persistence.store import ActivityStore, normalize_todo_title
 
 
 @pytest.fixture
@@ -43,8 +46,53 @@ def test_init_db_creates_indexes(store: ActivityStore):
     }
     assert "idx_activity_timestamp" in indexes
     assert "idx_session_start" in indexes
-    assert "idx_activity_task" in indexes
+    assert "idx_activity_task_time" in indexes
+    assert "idx_activity_task" not in indexes
+    assert "idx_activity_task_cover" not in indexes
     assert "idx_focus_parent" in indexes
+    assert "idx_focus_active" in indexes
+    assert "idx_focus_auto" in indexes
+
+
+def test_task_summary_query_seeks_task_time_index(store: ActivityStore):
+    conn = store._get_conn()
+    plan = " ".join(
+        r[3]
+        for r in conn.execute(
+            "EXPLAIN QUERY PLAN "
+            "SELECT app_name, activity_summary, category, sub_category, COUNT(*), "
+            "SUM(COALESCE(duration_seconds, 5)), MIN(timestamp), MAX(timestamp) "
+            "FROM activity_logs WHERE active_task_id = ? AND timestamp >= ? AND timestamp < ? "
+            "GROUP BY app_name, activity_summary",
+            (1, "2025-01-01", "2025-01-02"),
+        )
+    )
+    assert "idx_activity_task_time (active_task_id=? AND timestamp>? AND timestamp<?)" in plan
+
+
+def test_extend_activity_touches_no_index(store: ActivityStore):
+    """The hot coalescing UPDATE must not have to rewrite index entries."""
+    indexed = {
+        r[2]
+        for (name,) in store._get_conn().execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='activity_logs'"
+        ).fetchall()
+        for r in store._get_conn().execute(f"PRAGMA index_info({name})")
+    }
+    assert "duration_seconds" not in indexed
+
+
+def test_open_todos_query_uses_partial_index_without_sorting(store: ActivityStore):
+    conn = store._get_conn()
+    plan = " ".join(
+        r[3]
+        for r in conn.execute(
+            "EXPLAIN QUERY PLAN "
+            "SELECT * FROM focus_tasks WHERE done = 0 ORDER BY sort_order, id DESC"
+        )
+    )
+    assert "idx_focus_active" in plan
+    assert "TEMP B-TREE" not in plan
 
 
 def test_init_db_idempotent(store: ActivityStore):
@@ -52,6 +100,64 @@ def test_init_db_idempotent(store: ActivityStore):
     store.init_db()
 
 
+def test_each_thread_gets_its_own_file_connection(tmp_path):
+    s = ActivityStore(str(tmp_path / "test.db"))
+    s.init_db()
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(s._get_conn()))
+    worker.start()
+    worker.join()
+    try:
+        assert seen[0] is not s._get_conn()
+        assert s._get_conn() is s._get_conn()
+    finally:
+        s.close()
+
+
+def test_open_transaction_is_not_committed_by_another_thread(tmp_path):
+    s = ActivityStore(str(tmp_path / "test.db"))
+    s.init_db()
+    try:
+        with pytest.raises(RuntimeError):
+            with s.transaction():
+                s.save_activity(_make_activity())
+                # A UI-style read followed by a commit on another thread
+                worker = threading.Thread(
+                    target=lambda: (s.get_todos(), s._get_conn().commit())
+                )
+                worker.start()
+                worker.join()
+                raise RuntimeError("abort the batch")
+        assert s.get_activities(datetime(2000, 1, 1), datetime(2100, 1, 1)) == []
+    finally:
+        s.close()
+
+
+def test_in_memory_store_shares_one_connection_across_threads(store: ActivityStore):
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(store._get_conn()))
+    worker.start()
+    worker.join()
+    assert seen[0] is store._get_conn()
+
+
+def test_file_database_uses_wal(tmp_path):
+    s = ActivityStore(str(tmp_path / "test.db"))
+    s.init_db()
+    try:
+        conn = s._get_conn()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    finally:
+        s.close()
+
+
+def test_memory_database_skips_wal(store: ActivityStore):
+    conn = store._get_conn()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+
+
 # ------------------------------------------------------------------
 # Activity record round-trip
 # ------------------------------------------------------------------
@@ -123,6 +229,72 @@ def test_get_activities_empty_range(store: ActivityStore):
     assert results == []
 
 
+def test_iter_activities_streams_records_in_order(store: ActivityStore):
+    t1 = datetime(2025, 1, 15, 8, 0, 0)
+    t2 = datetime(2025, 1, 15, 12, 0, 0)
+    store.save_activity(_make_activity(timestamp=t2))
+    store.save_activity(_make_activity(timestamp=t1))
+
+    it = store.iter_activities(datetime(2025, 1, 15), datetime(2025, 1, 16))
+    assert not isinstance(it, list)
+    assert [r.timestamp for r in it] == [t1, t2]
+
+
+def test_iter_activities_stops_early(store: ActivityStore):
+    for hour in range(8, 12):
+        store.save_activity(_make_activity(timestamp=datetime(2025, 1, 15, hour)))
+    it = store.iter_activities(datetime(2025, 1, 15), datetime(2025, 1, 16))
+    assert next(it).timestamp == datetime(2025, 1, 15, 8)
+    del it
+    # The abandoned cursor must not hold up later writes
+    store.save_activity(_make_activity(timestamp=datetime(2025, 1, 15, 13)))
+    assert len(store.get_activities(datetime(2025, 1, 15), datetime(2025, 1, 16))) == 5
+
+
+def test_get_category_durations_groups_in_range(store: ActivityStore):
+    for hour, sub in [(9, "A"), (10, "A"), (11, "B")]:
+        store.save_activity(_make_activity(
+            timestamp=datetime(2025, 1, 15, hour), category="Dev", sub_category=sub,
+        ))
+    store.save_activity(_make_activity(
+        timestamp=datetime(2025, 1, 16, 9), category="Dev", sub_category="A",
+    ))
+    durations = store.get_category_durations(datetime(2025, 1, 15), datetime(2025, 1, 16), 5)
+    assert sorted(durations) == [("Dev", "A", 10), ("Dev", "B", 5)]
+
+
+def test_get_category_durations_uses_stored_duration(store: ActivityStore):
+    store.save_activity(_make_activity(category="Dev", sub_category="A", duration_seconds=120))
+    store.save_activity(_make_activity(category="Dev", sub_category="A"))  # legacy row
+    durations = store.get_category_durations(datetime(2025, 1, 15), datetime(2025, 1, 16), 5)
+    assert durations == [("Dev", "A", 125)]
+
+
+def test_get_daily_category_durations_groups_by_day(store: ActivityStore):
+    store.save_activity(_make_activity(timestamp=datetime(2025, 1, 15, 23, 59), category="Dev", sub_category="A"))
+    store.save_activity(_make_activity(timestamp=datetime(2025, 1, 16, 0, 0), category="Dev", sub_category="A"))
+    store.save_activity(_make_activity(timestamp=datetime(2025, 1, 16, 8, 0), category="Dev", sub_category="A"))
+    durations = store.get_daily_category_durations(datetime(2025, 1, 15), datetime(2025, 1, 17), 5)
+    assert sorted(durations) == [
+        (date(2025, 1, 15), "Dev", "A", 5),
+        (date(2025, 1, 16), "Dev", "A", 10),
+    ]
+
+
+def test_extend_activity_adds_duration(store: ActivityStore):
+    rid = store.save_activity(_make_activity(duration_seconds=5))
+    store.extend_activity(rid, 5)
+    store.extend_activity(rid, 5)
+    assert store.get_activity_by_id(rid).duration_seconds == 15
+
+
+def test_extend_activity_reports_missing_row(store: ActivityStore):
+    rid = store.save_activity(_make_activity(duration_seconds=5))
+    assert store.extend_activity(rid, 5) == 1
+    store.clear_all_activities()
+    assert store.extend_activity(rid, 5) == 0
+
+
 # ------------------------------------------------------------------
 # Pomodoro session round-trip
 # ------------------------------------------------------------------
@@ -225,6 +397,37 @@ def test_session_zero_elapsed(store: ActivityStore):
     assert loaded.elapsed == timedelta(0)
 
 
+# ------------------------------------------------------------------
+# transaction()
+# ------------------------------------------------------------------
+
+def test_transaction_commits_activity_and_session_together(store: ActivityStore):
+    with store.transaction():
+        rid = store.save_activity(_make_activity())
+        store.save_session(_make_session())
+    assert store.get_activity_by_id(rid) is not None
+    assert store.get_session_by_id("pomo-001") is not None
+
+
+def test_transaction_rolls_back_all_writes_on_error(store: ActivityStore):
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            rid = store.save_activity(_make_activity())
+            store.save_session(_make_session())
+            raise RuntimeError("session write failed")
+    assert store.get_activity_by_id(rid) is None
+    assert store.get_session_by_id("pomo-001") is None
+
+
+def test_nested_transaction_joins_outer(store: ActivityStore):
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            with store.transaction():
+                rid = store.save_activity(_make_activity())
+            raise RuntimeError("outer failed")
+    assert store.get_activity_by_id(rid) is None
+
+
 # ------------------------------------------------------------------
 # active_task_id and activity_summary round-trips
 # ------------------------------------------------------------------
@@ -356,6 +559,65 @@ class TestAddTodo:
         datetime.fromisoformat(task["created_at"])
 
 
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        ("Quarterly Plan", "quarterly plan"),
+        ("  Writing:  Quarterly Plan ", "quarterly plan"),
+        ("Work on: Quarterly Plan", "quarterly plan"),
+        ("Work on: Coding: parser", "parser"),
+        ("Coding: Work on: parser", "work on: parser"),
+    ],
+)
+def test_normalize_todo_title(title, expected):
+    assert normalize_todo_title(title) == expected
+
+
+class TestTodoLookups:
+    """Tests for todo_exists_normalized() and find_category_bucket()."""
+
+    def test_exists_matches_normalized_title(self, store: ActivityStore):
+        store.add_todo("Writing: Quarterly Plan", "Writing")
+        assert store.todo_exists_normalized("quarterly plan")
+        assert not store.todo_exists_normalized("annual plan")
+
+    def test_exists_includes_done_todos(self, store: ActivityStore):
+        task_id = store.add_todo("Finished thing")
+        store.toggle_todo(task_id)
+        assert store.todo_exists_normalized("finished thing")
+
+    def test_backfills_existing_todos(self, tmp_path):
+        path = str(tmp_path / "legacy.db")
+        s = ActivityStore(path)
+        s.init_db()
+        conn = s._get_conn()
+        conn.execute(
+            "INSERT INTO focus_tasks (title, created_at) VALUES (?, ?)",
+            ("Work on: Legacy Task", datetime.now().isoformat()),
+        )
+        conn.commit()
+        s.close()
+
+        s = ActivityStore(path)
+        s.init_db()
+        assert s.todo_exists_normalized("legacy task")
+        s.close()
+
+    def test_find_bucket_is_case_insensitive(self, store: ActivityStore):
+        bucket = store.add_todo("Dev bucket", "Development")
+        assert store.find_category_bucket("development") == bucket
+
+    def test_find_bucket_ignores_subtasks(self, store: ActivityStore):
+        parent = store.add_todo("Other bucket", "Writing")
+        store.add_todo("Child", "Development", parent_id=parent)
+        assert store.find_category_bucket("Development") is None
+
+    def test_find_bucket_prefers_newest(self, store: ActivityStore):
+        store.add_todo("Old", "Development")
+        newer = store.add_todo("New", "Development")
+        assert store.find_category_bucket("Development") == newer
+
+
 class TestGetTodos:
     """Tests for get_todos()."""
 
@@ -364,6 +626,15 @@ class TestGetTodos:
         assert store.get_todos() == []
         assert store.get_todos(include_done=True) == []
 
+    def test_keys_match_table_columns(self, store: ActivityStore):
+        """Every focus_tasks column comes back under its own name."""
+        store.add_todo("Task", "Development")
+        columns = [r[1] for r in store._get_conn().execute("PRAGMA table_info(focus_tasks)")]
+        (todo,) = store.get_todos()
+        assert sorted(todo) == sorted(columns)
+        assert todo["title"] == "Task"
+        assert todo["category"] == "Development"
+
     def test_excludes_done_by_default(self, store: ActivityStore):
         """get_todos() without include_done skips done tasks."""
         id1 = store.add_todo("Active")
@@ -537,6 +808,21 @@ class TestMergeBuckets:
             if t["id"] in (existing, new_child):
                 assert t["parent_id"] == target
 
+    def test_merge_is_atomic(self, store: ActivityStore):
+        """If deleting the source fails, the children are not moved either."""
+        source = store.add_todo("Source")
+        target = store.add_todo("Target")
+        child = store.add_todo("Child", parent_id=source)
+        store._get_conn().execute(
+            "CREATE TRIGGER block_delete BEFORE DELETE ON focus_tasks "
+            "BEGIN SELECT RAISE(ABORT, 'blocked'); END"
+        )
+        with pytest.raises(sqlite3.IntegrityError):
+            store.merge_buckets(source, target)
+        todos = {t["id"]: t for t in store.get_todos(include_done=True)}
+        assert source in todos
+        assert todos[child]["parent_id"] == source
+
 
 class TestClearTodos:
     """Tests for clear_all_todos() and clear_auto_todos()."""
@@ -728,7 +1014,24 @@ class TestGetActivitySummaryByTask:
             task, datetime(2025, 1, 15), datetime(2025, 1, 16),
         )
         assert results[0]["first_seen"] == datetime(2025, 1, 15, 9, 0).isoformat()
-        assert results[0]["last_seen"] == datetime(2025, 1, 15, 15, 0).isoformat()
+        # End of the last row's tracked time (one default 5s poll)
+        assert results[0]["last_seen"] == datetime(2025, 1, 15, 15, 0, 5).isoformat()
+
+    def test_extended_row_reports_end_and_poll_count(self, store: ActivityStore):
+        """An extended row ends after its duration and counts its polls."""
+        parent = store.add_todo("Work")
+        task = store.add_todo("item", parent_id=parent)
+        rid = store.save_activity(_make_activity(
+            timestamp=datetime(2025, 1, 15, 9, 0), duration_seconds=5,
+            app_name="Chrome", activity_summary="browsing", active_task_id=task,
+        ))
+        store.extend_activity(rid, 7195)  # two hours in one row
+        results = store.get_activity_summary_by_task(
+            task, datetime(2025, 1, 15), datetime(2025, 1, 16),
+        )
+        assert results[0]["first_seen"] == datetime(2025, 1, 15, 9, 0).isoformat()
+        assert results[0]["last_seen"] == datetime(2025, 1, 15, 11, 0).isoformat()
+        assert results[0]["count"] == 1440  # 7200s / 5s polls
 
     def test_includes_category_fields(self, store: ActivityStore):
         parent = store.add_todo("Work")
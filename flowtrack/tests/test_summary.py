@@ -355,6 +355,19 @@ class TestWeeklySummary:
         assert ws.categories[0].total_time == timedelta(seconds=25)
         assert ws.total_time == timedelta(seconds=25)
 
+    def test_sub_categories_summed_across_days(self):
+        store = _make_store()
+        store.save_activity(_activity(datetime(2025, 6, 9, 10, 0), "Dev", "Editing"))
+        store.save_activity(_activity(datetime(2025, 6, 12, 10, 0), "Dev", "Editing"))
+        store.save_activity(_activity(datetime(2025, 6, 12, 11, 0), "Dev", "Review"))
+        gen = SummaryGenerator(store, poll_interval=5)
+        ws = gen.weekly_summary(WEEK_START)
+
+        assert ws.categories[0].sub_categories == {
+            "Editing": timedelta(seconds=10),
+            "Review": timedelta(seconds=5),
+        }
+
     def test_weekly_total_time_equals_sum_of_daily(self):
         store = _make_store()
         day1 = datetime(2025, 6, 9, 10, 0, 0)
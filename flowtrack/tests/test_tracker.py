@@ -1,6 +1,9 @@
 """Unit tests for the Tracker orchestrator."""
 
+import functools
 import logging
+import queue
+from dataclasses import replace
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
@@ -58,6 +61,8 @@ def _make_tracker(
     pomodoro.on_activity.return_value = on_activity_events or []
     pomodoro.tick.return_value = tick_events or []
     pomodoro.active_session = active_session
+    # Run the real observe() so it drives the mocked on_activity/tick
+    pomodoro.observe.side_effect = functools.partial(PomodoroManager.observe, pomodoro)
 
     store = MagicMock(spec=ActivityStore)
     store.save_activity.return_value = 1
@@ -287,6 +292,356 @@ class TestPollOnce:
 
 
 
+class TestPersistence:
+    """Tests for the per-poll persistence transaction."""
+
+    def test_activity_and_session_saved_in_one_transaction(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        session = PomodoroSession(
+            id="sess-1", category="Development", sub_category="Development",
+            start_time=datetime(2025, 1, 1, 9, 0), elapsed=timedelta(0),
+            status=SessionStatus.ACTIVE, completed_count=0,
+        )
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win, active_session=session
+        )
+
+        tracker.poll_once(datetime(2025, 1, 1, 9, 5))
+
+        store.transaction.assert_called_once()
+        store.save_activity.assert_called_once()
+        store.save_session.assert_called_once_with(session)
+
+    def test_batch_saves_newest_snapshot_of_each_session_once(self):
+        session = PomodoroSession(
+            id="sess-1", category="Development", sub_category="Development",
+            start_time=datetime(2025, 1, 1, 9, 0), elapsed=timedelta(0),
+            status=SessionStatus.ACTIVE, completed_count=0,
+        )
+        later = replace(session, elapsed=timedelta(seconds=10))
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker()
+
+        tracker._write_batch([
+            functools.partial(tracker._write_session, session),
+            functools.partial(tracker._write_session, later),
+        ])
+
+        store.transaction.assert_called_once()
+        store.save_session.assert_called_once_with(later)
+
+    def test_persistence_failure_is_logged_not_raised(self, caplog):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win
+        )
+        store.save_activity.side_effect = OSError("disk full")
+
+        with caplog.at_level(logging.ERROR):
+            tracker.poll_once(datetime(2025, 1, 1, 9, 5))
+
+        assert "Failed to persist activity" in caplog.text
+
+
+class TestRecordCoalescing:
+    """Identical consecutive polls extend one row instead of inserting."""
+
+    def test_identical_polls_extend_previous_row(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win, poll_interval=5
+        )
+        store.save_activity.return_value = 42
+
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 0))
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 5))
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 10))
+
+        store.save_activity.assert_called_once()
+        assert store.save_activity.call_args[0][0].duration_seconds == 5
+        assert store.extend_activity.call_count == 2
+        store.extend_activity.assert_called_with(42, 5)
+
+    def test_changed_window_inserts_new_row(self):
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            get_window_side_effect=[
+                WindowInfo(app_name="App", window_title="One"),
+                WindowInfo(app_name="App", window_title="Two"),
+            ],
+        )
+
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 0))
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 5))
+
+        assert store.save_activity.call_count == 2
+        store.extend_activity.assert_not_called()
+
+    def test_new_day_inserts_new_row(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win
+        )
+
+        tracker.poll_once(datetime(2025, 1, 1, 23, 59, 58))
+        tracker.poll_once(datetime(2025, 1, 2, 0, 0, 3))
+
+        assert store.save_activity.call_count == 2
+        store.extend_activity.assert_not_called()
+
+    def test_tick_loop_extends_current_window_row(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win, poll_interval=0
+        )
+        store.save_activity.return_value = 42
+        tracker.on_window_change(win, datetime.now())
+
+        ticks = []
+
+        def fake_tick(now):
+            ticks.append(now)
+            if len(ticks) == 2:
+                tracker.stop()
+            return []
+
+        pomodoro.tick.side_effect = fake_tick
+        tracker._run_tick_loop()
+
+        store.save_activity.assert_called_once()
+        assert store.extend_activity.call_count == 2
+
+    def test_failed_write_does_not_extend_missing_row(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win
+        )
+        store.save_activity.side_effect = [OSError("disk full"), 7]
+
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 0))
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 5))
+
+        assert store.save_activity.call_count == 2
+        store.extend_activity.assert_not_called()
+
+    def test_deleted_row_is_reinserted_instead_of_lost(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, _ = _make_tracker(
+            window_info=win, poll_interval=5
+        )
+        store = ActivityStore(":memory:")
+        store.init_db()
+        tracker.store = store
+        day = (datetime(2025, 1, 1), datetime(2025, 1, 2))
+        try:
+            for second in (0, 5, 10):
+                tracker.poll_once(datetime(2025, 1, 1, 9, 0, second))
+            store.clear_all_activities()  # the cached row id is now stale
+            for second in (15, 20):
+                tracker.poll_once(datetime(2025, 1, 1, 9, 0, second))
+
+            (row,) = store.get_activities(*day)
+            assert row.duration_seconds == 10
+        finally:
+            store.close()
+
+    def test_forget_last_activity_starts_new_row_without_held_time(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win, poll_interval=5
+        )
+        store.save_activity.return_value = 42
+
+        tracker._start_writer()
+        try:
+            tracker.poll_once(datetime(2025, 1, 1, 9, 0, 0))
+            tracker.poll_once(datetime(2025, 1, 1, 9, 0, 5))  # held
+            tracker.forget_last_activity()
+            tracker.poll_once(datetime(2025, 1, 1, 9, 0, 10))
+            tracker.flush()
+        finally:
+            tracker._stop_writer()
+
+        assert store.save_activity.call_count == 2
+        store.extend_activity.assert_not_called()
+
+
+class TestMlScreenAnalysis:
+    """The tracker's screen analyzer reuses results per window."""
+
+    def test_same_window_is_analyzed_once_per_ml_interval(self):
+        from flowtrack.core.screen_analyzer import ScreenAnalyzer
+
+        def available(analyzer):
+            analyzer._capture_available = True
+            analyzer._vision_available = True
+
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(window_info=win)
+        with patch.object(ScreenAnalyzer, "_check_availability", available):
+            tracker.ml_enabled = True
+        screen = tracker._screen_analyzer
+        assert screen.analysis_ttl == 30.0
+
+        with patch.object(screen, "_analyze", return_value="writing code") as analyze, \
+                patch("flowtrack.core.screen_analyzer.time.monotonic",
+                      side_effect=[0.0, 10.0, 29.0, 30.0]):
+            for second in (0, 10, 29, 30):
+                tracker.poll_once(datetime(2025, 1, 1, 9, 0, second))
+
+        assert analyze.call_count == 2  # at 0s, then again once 30s have passed
+
+
+class TestBackgroundWriter:
+    """While running, writes go through the writer thread."""
+
+    def test_run_commits_queued_writes_before_returning(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win, poll_interval=0
+        )
+
+        def fake_classify(app_name, window_title):
+            tracker.stop()
+            return "Development"
+
+        classifier.classify.side_effect = fake_classify
+        tracker.run()
+
+        store.save_activity.assert_called_once()
+        assert tracker._writer_thread is None
+
+    def test_poll_does_not_wait_for_slow_store(self):
+        import threading
+
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win
+        )
+        release = threading.Event()
+        store.save_activity.side_effect = lambda record: release.wait(5) and 1
+
+        tracker._start_writer()
+        try:
+            tracker.poll_once(datetime(2025, 1, 1, 9, 0, 0))
+            assert not release.is_set()  # poll returned while the write blocks
+        finally:
+            release.set()
+            tracker.flush()
+            tracker._stop_writer()
+
+        store.save_activity.assert_called_once()
+
+    def test_repeat_polls_are_held_until_flush(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win, poll_interval=5
+        )
+        store.save_activity.return_value = 42
+
+        tracker._start_writer()
+        try:
+            tracker.poll_once(datetime(2025, 1, 1, 9, 0, 0))
+            tracker.poll_once(datetime(2025, 1, 1, 9, 0, 5))
+            tracker.poll_once(datetime(2025, 1, 1, 9, 0, 10))
+            tracker._write_queue.join()
+            store.extend_activity.assert_not_called()
+
+            tracker.flush()
+        finally:
+            tracker._stop_writer()
+
+        store.save_activity.assert_called_once()
+        store.extend_activity.assert_called_once_with(42, 10)
+
+    def test_held_seconds_written_after_min_interval(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win, poll_interval=5
+        )
+        tracker.min_persist_interval_seconds = 10
+        store.save_activity.return_value = 42
+
+        tracker._start_writer()
+        try:
+            for second in (0, 5, 10):
+                tracker.poll_once(datetime(2025, 1, 1, 9, 0, second))
+            tracker._write_queue.join()
+        finally:
+            tracker._stop_writer()
+
+        store.extend_activity.assert_called_once_with(42, 10)
+
+    def test_full_queue_drops_write(self, caplog):
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker()
+        tracker._writer_thread = MagicMock()  # queue is never drained
+        job = MagicMock()
+
+        tracker._write_queue = queue.Queue(maxsize=1)
+
+        tracker._submit(job)
+        with caplog.at_level(logging.WARNING):
+            tracker._submit(job)
+
+        assert "queue full" in caplog.text
+        job.assert_not_called()
+
+    def test_idle_gap_starts_new_row(self):
+        win = WindowInfo(app_name="App", window_title="Title")
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
+            window_info=win
+        )
+
+        tracker.poll_once(datetime(2025, 1, 1, 9, 0, 0))
+        tracker._idle_epoch += 1
+        tracker.poll_once(datetime(2025, 1, 1, 9, 10, 0))
+
+        assert store.save_activity.call_count == 2
+        store.extend_activity.assert_not_called()
+
+
+class TestAutoTodo:
+    """Tests for Tracker._maybe_create_todo()."""
+
+    def test_creates_todo_for_new_context(self):
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker()
+        store.todo_exists_normalized.return_value = False
+        store.find_category_bucket.return_value = 3
+
+        tracker._maybe_create_todo("Writing", "Quarterly plan")
+
+        store.add_todo.assert_called_once_with(
+            "Quarterly plan", "Writing", auto=True, parent_id=3
+        )
+
+    def test_repeated_context_returns_before_any_lookup(self):
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker()
+        store.todo_exists_normalized.return_value = True
+
+        tracker._maybe_create_todo("Writing", "Quarterly plan")
+        tracker._maybe_create_todo("Writing", "Quarterly plan")
+
+        store.todo_exists_normalized.assert_called_once()
+
+    def test_seen_contexts_are_bounded(self):
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker()
+        store.todo_exists_normalized.return_value = True
+
+        with patch("flowtrack.core.tracker._SEEN_CONTEXTS_MAX", 3):
+            for i in range(5):
+                tracker._maybe_create_todo("Writing", f"Document {i}")
+
+        assert list(tracker._seen_contexts) == [
+            "Writing::Document 2", "Writing::Document 3", "Writing::Document 4",
+        ]
+
+    def test_skips_app_names(self):
+        tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker()
+
+        tracker._maybe_create_todo("Browsing", "Google Chrome")
+
+        store.todo_exists_normalized.assert_not_called()
+        store.add_todo.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # run / stop tests
 # ---------------------------------------------------------------------------
@@ -301,18 +656,46 @@ class TestRunLoop:
 
         call_count = 0
 
-        def fake_sleep(seconds):
+        def fake_idle():
             nonlocal call_count
             call_count += 1
             if call_count >= 3:
                 tracker.stop()
+            return False
 
-        with patch("flowtrack.core.tracker.time.sleep", side_effect=fake_sleep):
-            tracker.run()
+        provider.is_user_idle.side_effect = fake_idle
+        tracker.run()
 
-        assert not tracker._running
+        assert tracker._stop_event.is_set()
         assert call_count >= 3
 
+    def test_stop_interrupts_wait(self):
+        """stop() wakes the loop immediately instead of after poll_interval."""
+        import threading
+
+        tracker, *_ = _make_tracker(is_idle=True, poll_interval=60)
+        thread = threading.Thread(target=tracker.run, daemon=True)
+        thread.start()
+        tracker.stop()
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+
+    def test_wait_for_next_tick_advances_from_previous_deadline(self):
+        """Deadlines advance by poll_interval regardless of loop-body time."""
+        tracker, *_ = _make_tracker(poll_interval=5)
+        tracker._stop_event.set()  # make wait() return immediately
+
+        with patch("flowtrack.core.tracker.time.monotonic", return_value=102.0):
+            assert tracker._wait_for_next_tick(100.0) == 105.0
+
+    def test_wait_for_next_tick_reanchors_when_far_behind(self):
+        """After falling a whole interval behind, the schedule restarts from now."""
+        tracker, *_ = _make_tracker(poll_interval=5)
+        tracker._stop_event.set()
+
+        with patch("flowtrack.core.tracker.time.monotonic", return_value=200.0):
+            assert tracker._wait_for_next_tick(100.0) == 200.0
+
     def test_idle_skips_poll(self):
         """When user is idle, poll_once is not called (Req 1.4)."""
         tracker, provider, classifier, analyzer, pomodoro, store = _make_tracker(
@@ -321,14 +704,15 @@ class TestRunLoop:
 
         call_count = 0
 
-        def fake_sleep(seconds):
+        def fake_idle():
             nonlocal call_count
             call_count += 1
             if call_count >= 2:
                 tracker.stop()
+            return True
 
-        with patch("flowtrack.core.tracker.time.sleep", side_effect=fake_sleep):
-            tracker.run()
+        provider.is_user_idle.side_effect = fake_idle
+        tracker.run()
 
         # Classifier should never be called because idle skips the poll
         classifier.classify.assert_not_called()
@@ -341,17 +725,14 @@ class TestRunLoop:
         )
         provider.is_user_idle.side_effect = RuntimeError("idle check failed")
 
-        call_count = 0
+        def fake_classify(app_name, window_title):
+            tracker.stop()
+            return "Development"
 
-        def fake_sleep(seconds):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 1:
-                tracker.stop()
+        classifier.classify.side_effect = fake_classify
 
         with caplog.at_level(logging.ERROR):
-            with patch("flowtrack.core.tracker.time.sleep", side_effect=fake_sleep):
-                tracker.run()
+            tracker.run()
 
         assert "Failed to check idle state" in caplog.text
         # poll_once should still have been called
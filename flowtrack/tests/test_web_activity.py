@@ -79,6 +79,18 @@ class TestActivityByTaskEndpoint:
         assert data["unassigned"]["entries"][0]["app_name"] == "Chrome"
         assert data["unassigned"]["entries"][0]["summary"] == "browsing"
 
+    def test_flushes_tracker_before_reading(self, client, store, app_ref):
+        """Time still held or queued by the tracker is included."""
+        ts = datetime(2025, 1, 15, 10, 0, 0)
+        app_ref.tracker.flush.side_effect = lambda: _make_activity(
+            store, ts, "Chrome", "Google", "Research", summary="browsing"
+        )
+
+        resp = client.get("/api/activity/by-task?date=2025-01-15")
+        data = resp.get_json()
+        app_ref.tracker.flush.assert_called_once()
+        assert data["unassigned"]["total_seconds"] == 5
+
     def test_activities_organized_by_task_hierarchy(self, client, store):
         """Activities are grouped under High_Level → Low_Level → entries."""
         # Create task hierarchy
@@ -145,7 +157,7 @@ class TestActivityByTaskEndpoint:
         assert "timestamp_start" in entry
         assert "timestamp_end" in entry
         assert entry["timestamp_start"] == ts1.isoformat()
-        assert entry["timestamp_end"] == ts2.isoformat()
+        assert entry["timestamp_end"] == (ts2 + timedelta(seconds=5)).isoformat()
 
     def test_aggregation_groups_by_app_and_summary(self, client, store):
         """Different app+summary combos produce separate entries."""
@@ -205,7 +217,16 @@ class TestAggregateActivities:
         assert len(result) == 1
         assert result[0]["time_seconds"] == 20
         assert result[0]["timestamp_start"] == ts.isoformat()
-        assert result[0]["timestamp_end"] == (ts + timedelta(seconds=15)).isoformat()
+        assert result[0]["timestamp_end"] == (ts + timedelta(seconds=20)).isoformat()
+
+    def test_timestamp_end_covers_extended_row(self):
+        """A row extended for an hour ends an hour after it started."""
+        ts = datetime(2025, 1, 15, 10, 0)
+        act = ActivityRecord(id=1, timestamp=ts, app_name="VSCode", window_title="file.py",
+                             category="Dev", sub_category="", session_id=None,
+                             activity_summary="coding", duration_seconds=3600)
+        result = _aggregate_activities([act], 5)
+        assert result[0]["timestamp_end"] == (ts + timedelta(hours=1)).isoformat()
 
     def test_sorted_by_time_descending(self):
         ts = datetime(2025, 1, 15, 10, 0)
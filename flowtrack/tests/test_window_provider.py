@@ -1,12 +1,13 @@
 """Unit tests for WindowProvider base class and factory."""
 
+import importlib
 import sys
 from unittest.mock import patch, MagicMock
 
 import pytest
 
 from flowtrack.platform.base import WindowProvider
-from flowtrack.platform.factory import create_window_provider
+from flowtrack.platform import factory
 
 
 class TestWindowProviderABC:
@@ -32,39 +33,60 @@ class TestWindowProviderABC:
         assert provider.is_user_idle() is False
 
 
+def _reload_factory(platform: str, modules: dict | None = None):
+    """Re-import the factory as if running on *platform*."""
+    with patch.object(sys, "platform", platform), \
+         patch.dict("sys.modules", modules or {}):
+        return importlib.reload(factory)
+
+
 class TestCreateWindowProvider:
     """Tests for the create_window_provider factory function."""
 
-    @patch.object(sys, "platform", "linux")
+    @pytest.fixture(autouse=True)
+    def _restore_factory(self):
+        yield
+        importlib.reload(factory)
+
     def test_unsupported_platform_raises_os_error(self):
+        module = _reload_factory("linux")
         with pytest.raises(OSError, match="Unsupported platform.*linux"):
-            create_window_provider()
+            module.create_window_provider()
 
-    @patch.object(sys, "platform", "freebsd")
     def test_another_unsupported_platform_raises(self):
-        with pytest.raises(OSError, match="Unsupported platform.*freebsd"):
-            create_window_provider()
+        module = _reload_factory("freebsd")
+        with patch.object(sys, "platform", "freebsd"):
+            with pytest.raises(OSError, match="Unsupported platform.*freebsd"):
+                module.create_window_provider()
 
     def test_darwin_branch_imports_macos_module(self):
-        """Verify the darwin branch attempts to import MacOSWindowProvider."""
+        """Verify the darwin branch binds MacOSWindowProvider at import."""
         mock_cls = MagicMock(spec=WindowProvider)
         mock_module = MagicMock()
         mock_module.MacOSWindowProvider = mock_cls
 
-        with patch.object(sys, "platform", "darwin"), \
-             patch.dict("sys.modules", {"flowtrack.platform.macos": mock_module}):
-            provider = create_window_provider()
-            mock_cls.assert_called_once()
-            assert provider is mock_cls.return_value
+        module = _reload_factory("darwin", {"flowtrack.platform.macos": mock_module})
+        provider = module.create_window_provider()
+        mock_cls.assert_called_once()
+        assert provider is mock_cls.return_value
 
     def test_win32_branch_imports_windows_module(self):
-        """Verify the win32 branch attempts to import WindowsWindowProvider."""
+        """Verify the win32 branch binds WindowsWindowProvider at import."""
         mock_cls = MagicMock(spec=WindowProvider)
         mock_module = MagicMock()
         mock_module.WindowsWindowProvider = mock_cls
 
-        with patch.object(sys, "platform", "win32"), \
-             patch.dict("sys.modules", {"flowtrack.platform.windows": mock_module}):
-            provider = create_window_provider()
-            mock_cls.assert_called_once()
-            assert provider is mock_cls.return_value
+        module = _reload_factory("win32", {"flowtrack.platform.windows": mock_module})
+        provider = module.create_window_provider()
+        mock_cls.assert_called_once()
+        assert provider is mock_cls.return_value
+
+    def test_other_platform_module_is_not_imported(self):
+        mock_module = MagicMock()
+        mock_module.MacOSWindowProvider = MagicMock(spec=WindowProvider)
+
+        with patch.object(sys, "platform", "darwin"), \
+             patch.dict("sys.modules", {"flowtrack.platform.macos": mock_module}):
+            sys.modules.pop("flowtrack.platform.windows", None)
+            importlib.reload(factory)
+            assert "flowtrack.platform.windows" not in sys.modules